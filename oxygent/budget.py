@@ -0,0 +1,73 @@
+"""budget.py Per-request budgets on time, tokens and tool calls.
+
+NOTE: A budget is passed as ``{"budget": {"max_seconds": 60, "max_tokens":
+50000, "max_tool_calls": 20}}`` in the payload of ``MAS.chat_with_agent``
+(any limit may be omitted) and kept in ``shared_data``, which the whole call
+tree of a request shares, so the usage of sub-agents counts against the
+same limits. Tokens are read from the ``_llm_usage`` counters of BaseLLM.
+"""
+
+import time
+from typing import Optional
+
+BUDGET_KEY = "budget"
+
+
+class Budget:
+    """View over the budget of a request stored in ``shared_data``.
+
+    Examples
+    --------
+    >>> budget = Budget.from_request(oxy_request)
+    >>> if budget and budget.get_exceeded_reason():
+    ...     ...  # wrap up with what has been gathered so far
+    """
+
+    def __init__(self, shared_data: dict):
+        self.shared_data = shared_data
+        self.data: dict = shared_data[BUDGET_KEY]
+        self.data.setdefault("start_time", time.time())
+        self.data.setdefault("tool_calls", 0)
+
+    @classmethod
+    def from_request(cls, oxy_request) -> Optional["Budget"]:
+        """Return the budget of the request, or None if it has none."""
+        if not isinstance(oxy_request.shared_data.get(BUDGET_KEY), dict):
+            return None
+        return cls(oxy_request.shared_data)
+
+    @property
+    def tokens(self) -> int:
+        return self.shared_data.get("_llm_usage", {}).get("total_tokens", 0)
+
+    @property
+    def tool_calls(self) -> int:
+        return self.data["tool_calls"]
+
+    def add_tool_calls(self, count: int = 1):
+        self.data["tool_calls"] += count
+
+    def get_remaining_tool_calls(self) -> Optional[int]:
+        """Tool calls left before ``max_tool_calls``, None without a limit."""
+        if self.data.get("max_tool_calls") is None:
+            return None
+        return max(0, self.data["max_tool_calls"] - self.tool_calls)
+
+    def get_remaining_seconds(self) -> Optional[float]:
+        """Seconds left before ``max_seconds``, None without a time limit."""
+        if self.data.get("max_seconds") is None:
+            return None
+        return self.data["start_time"] + self.data["max_seconds"] - time.time()
+
+    def get_exceeded_reason(self) -> Optional[str]:
+        """Describe the first exhausted limit, or None if all have headroom."""
+        remaining_seconds = self.get_remaining_seconds()
+        if remaining_seconds is not None and remaining_seconds <= 0:
+            return f"time budget of {self.data['max_seconds']}s exhausted"
+        max_tokens = self.data.get("max_tokens")
+        if max_tokens is not None and self.tokens >= max_tokens:
+            return f"token budget of {max_tokens} exhausted"
+        max_tool_calls = self.data.get("max_tool_calls")
+        if max_tool_calls is not None and self.tool_calls >= max_tool_calls:
+            return f"tool call budget of {max_tool_calls} exhausted"
+        return None
@@ -0,0 +1,109 @@
+"""cancellation.py Structured cancellation scopes per trace.
+
+NOTE: Every trace owns one CancelScope holding the root task of the request and
+all tasks spawned on its behalf (parallel tool calls, hedged LLM requests...).
+Cancelling the scope, on client disconnect or ``OxyRequest.break_task``,
+cancels every descendant coroutine at once. The coroutines then unwind through
+``Oxy.execute`` which records CANCELED nodes, and through ``async with``
+blocks which close HTTP streams and MCP sessions.
+"""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Coroutine, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CancelScope:
+    """Set of tasks that are cancelled together.
+
+    Attributes:
+        trace_id (str): The trace the scope belongs to.
+        cancel_reason (str | None): Why the scope was cancelled, if it was.
+    """
+
+    def __init__(self, trace_id: str = ""):
+        self.trace_id = trace_id
+        self.cancel_reason: Optional[str] = None
+        self.tasks: set[asyncio.Task] = set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    def add_task(self, task: asyncio.Task) -> asyncio.Task:
+        if self.is_cancelled:
+            task.cancel()
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Schedule *coro* as a task owned by this scope."""
+        return self.add_task(asyncio.create_task(coro))
+
+    def cancel(self, reason: str = "cancelled") -> int:
+        """Cancel all running tasks of the scope and return how many."""
+        if self.cancel_reason is None:
+            self.cancel_reason = reason
+        count = 0
+        for task in list(self.tasks):
+            if not task.done():
+                task.cancel()
+                count += 1
+        if count:
+            logger.info(
+                f"Cancelled {count} tasks: {reason}",
+                extra={"trace_id": self.trace_id},
+            )
+        return count
+
+    async def gather(self, *coros: Coroutine, return_exceptions: bool = False):
+        """Like ``asyncio.gather`` but aborting the siblings on failure.
+
+        When one of the coroutines raises, or the caller is cancelled, every
+        other coroutine is cancelled and awaited before the error propagates,
+        so no child keeps running detached from its parent.
+        """
+        tasks = [self.spawn(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def as_completed(
+        self, *coros: Coroutine, timeout: Optional[float] = None
+    ) -> AsyncIterator[tuple]:
+        """Yield ``(index, result)`` of the coroutines in completion order.
+
+        Iteration ends when all coroutines are done or *timeout* seconds have
+        passed. The coroutines still running then, or when the consumer stops
+        early or raises, are cancelled and awaited. Close the iterator with
+        ``contextlib.aclosing`` when breaking out of it.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        tasks = {self.spawn(coro): i for i, coro in enumerate(coros)}
+        try:
+            while tasks:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    break
+                done, _ = await asyncio.wait(
+                    tasks, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in sorted(done, key=tasks.get):
+                    yield tasks.pop(task), task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                logger.info(
+                    f"Cancelled {len(tasks)} unfinished tasks",
+                    extra={"trace_id": self.trace_id},
+                )
+                await asyncio.gather(*tasks, return_exceptions=True)
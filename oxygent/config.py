@@ -1,5 +1,6 @@
 """Configments of the mas."""
 
+import copy
 import json
 import logging
 import os
@@ -108,6 +109,15 @@ class Config:
         "tool": {
             "mcp_is_keep_alive": True,
             "is_concurrent_init": True,
+            "cache_max_size": 1024,
+        },
+        "scheduler": {
+            "is_enabled": False,
+            "max_concurrency": 64,
+            "max_queue_size": 256,
+            "priority_classes": ["interactive", "batch"],
+            "default_priority": "interactive",
+            "tenant_weights": {},
         },
     }
 
@@ -127,6 +137,14 @@ class Config:
             cfg = replace_env_var(all_cfg[env])
             deep_update(cls._config, cfg)
 
+    @classmethod
+    def get_config(cls):
+        return copy.deepcopy(cls._config)
+
+    @classmethod
+    def set_config(cls, config):
+        cls._config = copy.deepcopy(config)
+
     @classmethod
     def set_module_config(cls, module, key, value=None):
         if module not in cls._config:
@@ -623,3 +641,71 @@ class Config:
     @classmethod
     def get_tool_is_concurrent_init(cls):
         return cls.get_module_config("tool", "is_concurrent_init")
+
+    @classmethod
+    def set_tool_cache_max_size(cls, cache_max_size):
+        cls.set_module_config("tool", "cache_max_size", cache_max_size)
+
+    @classmethod
+    def get_tool_cache_max_size(cls):
+        return cls.get_module_config("tool", "cache_max_size")
+
+    """ scheduler """
+
+    @classmethod
+    def set_scheduler_config(cls, scheduler_config):
+        cls.set_module_config("scheduler", scheduler_config)
+
+    @classmethod
+    def get_scheduler_config(cls):
+        return cls.get_module_config("scheduler")
+
+    @classmethod
+    def set_scheduler_is_enabled(cls, is_enabled=True):
+        cls.set_module_config("scheduler", "is_enabled", is_enabled)
+
+    @classmethod
+    def get_scheduler_is_enabled(cls):
+        return cls.get_module_config("scheduler", "is_enabled", False)
+
+    @classmethod
+    def set_scheduler_max_concurrency(cls, max_concurrency):
+        cls.set_module_config("scheduler", "max_concurrency", max_concurrency)
+
+    @classmethod
+    def get_scheduler_max_concurrency(cls):
+        return cls.get_module_config("scheduler", "max_concurrency", 64)
+
+    @classmethod
+    def set_scheduler_max_queue_size(cls, max_queue_size):
+        cls.set_module_config("scheduler", "max_queue_size", max_queue_size)
+
+    @classmethod
+    def get_scheduler_max_queue_size(cls):
+        return cls.get_module_config("scheduler", "max_queue_size", 256)
+
+    @classmethod
+    def set_scheduler_priority_classes(cls, priority_classes):
+        cls.set_module_config("scheduler", "priority_classes", priority_classes)
+
+    @classmethod
+    def get_scheduler_priority_classes(cls):
+        return cls.get_module_config(
+            "scheduler", "priority_classes", ["interactive", "batch"]
+        )
+
+    @classmethod
+    def set_scheduler_default_priority(cls, default_priority):
+        cls.set_module_config("scheduler", "default_priority", default_priority)
+
+    @classmethod
+    def get_scheduler_default_priority(cls):
+        return cls.get_module_config("scheduler", "default_priority", "interactive")
+
+    @classmethod
+    def set_scheduler_tenant_weights(cls, tenant_weights):
+        cls.set_module_config("scheduler", "tenant_weights", tenant_weights)
+
+    @classmethod
+    def get_scheduler_tenant_weights(cls):
+        return cls.get_module_config("scheduler", "tenant_weights", {})
@@ -1,5 +1,15 @@
-from .jes_es import JesEs
-from .local_es import LocalEs
+from ...utils.lazy_utils import lazy_attrs
+
+# Backends load on first access, so the elasticsearch client is only
+# imported when Elasticsearch is configured
+__getattr__, __dir__ = lazy_attrs(
+    __name__,
+    {
+        "BaseEs": ".base_es",
+        "JesEs": ".jes_es",
+        "LocalEs": ".local_es",
+    },
+)
 
 __all__ = [
     "JesEs",
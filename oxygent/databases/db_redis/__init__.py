@@ -1,12 +1,20 @@
 import sys
 
-if sys.version_info < (3, 11):
-    from .jimdb_ap_redis import JimdbApRedis
-else:
+from ...utils.lazy_utils import lazy_attrs
+
+if sys.version_info >= (3, 11):
     JimdbApRedis = None
 
-from .base_redis import BaseRedis
-from .local_redis import LocalRedis
+# Backends load on first access, so aioredis is only imported when Redis is
+# configured
+__getattr__, __dir__ = lazy_attrs(
+    __name__,
+    {
+        "JimdbApRedis": ".jimdb_ap_redis",
+        "BaseRedis": ".base_redis",
+        "LocalRedis": ".local_redis",
+    },
+)
 
 __all__ = [
     "JimdbApRedis",
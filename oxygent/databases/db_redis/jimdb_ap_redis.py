@@ -16,6 +16,7 @@ from aioredis import Redis
 from aioredis.exceptions import ConnectionError, TimeoutError
 
 from ...config import Config
+from .base_redis import BaseRedis
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +52,7 @@ def retry_decorator(func):
     return wrapper
 
 
+@BaseRedis.register
 class JimdbApRedis:
     """JimDB Redis client implementation with enhanced features.
 
@@ -202,6 +204,25 @@ class JimdbApRedis:
             return await self.redis_pool.expire(key, ex)
         return True
 
+    @retry_decorator
+    async def incrby(self, key: str, amount: int = 1, ex: int = None):
+        """Atomically increment the integer stored at a key.
+
+        Args:
+            key: The counter key
+            amount: Increment, may be negative
+            ex: Optional expiration time in seconds
+
+        Returns:
+            int: The value of the counter after the increment
+        """
+        async with self.redis_pool.pipeline(transaction=True) as pipe:
+            pipe.incrby(key, amount)
+            if ex is not None:
+                pipe.expire(key, ex)
+            result = await pipe.execute()
+        return result[0]
+
     # @retry_decorator
     async def lpush(
         self,
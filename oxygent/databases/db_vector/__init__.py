@@ -1,5 +1,13 @@
-from .base_vector_db import BaseVectorDB
-from .vearch_db import VearchDB
+from ...utils.lazy_utils import lazy_attrs
+
+# VearchDB pulls in numpy and pandas, so it loads on first access
+__getattr__, __dir__ = lazy_attrs(
+    __name__,
+    {
+        "BaseVectorDB": ".base_vector_db",
+        "VearchDB": ".vearch_db",
+    },
+)
 
 __all__ = [
     "BaseVectorDB",
@@ -0,0 +1,357 @@
+"""limiters.py Adaptive concurrency limits and retry backoff for Oxy.
+
+NOTE: This module contains the following parts:
+    - AdaptiveLimiter: an AIMD limiter that grows the in-flight capacity of an
+      Oxy while latency stays close to its baseline and shrinks it on latency
+      spikes or overload errors (429/503, timeouts)
+    - get_retry_after / is_overload_error: helpers that inspect exceptions
+      raised by httpx and the OpenAI client
+    - get_backoff_delay: exponential backoff with full jitter that honors a
+      server supplied ``Retry-After`` up to the maximum delay
+    - RateLimiter: requests-per-minute and tokens-per-minute budgets that
+      queue callers until capacity frees up, kept in process or shared
+      through Redis counters across processes
+"""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from .scheduler import FairQueue
+
+logger = logging.getLogger(__name__)
+
+OVERLOAD_STATUS_CODES = {429, 502, 503, 504}
+
+
+def _get_status_code(exc: BaseException) -> Optional[int]:
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        response = getattr(exc, "response", None)
+        status_code = getattr(response, "status_code", None)
+    return status_code if isinstance(status_code, int) else None
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """Whether *exc* signals that the callee is saturated."""
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError)):
+        return True
+    if "Timeout" in type(exc).__name__:  # httpx / openai timeout classes
+        return True
+    return _get_status_code(exc) in OVERLOAD_STATUS_CODES
+
+
+def get_retry_after(exc: BaseException) -> Optional[float]:
+    """Return the ``Retry-After`` delay in seconds carried by *exc*, if any."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def get_backoff_delay(
+    attempt: int,
+    base_delay: float,
+    max_delay: float,
+    backoff_factor: float = 2.0,
+    exc: Optional[BaseException] = None,
+) -> float:
+    """Delay before retry number *attempt* (starting at 1).
+
+    A ``Retry-After`` sent by the server wins, capped at *max_delay*;
+    otherwise the delay is drawn uniformly from
+    ``[0, min(max_delay, base_delay * backoff_factor ** (attempt - 1))]``
+    so that concurrent callers do not retry in lockstep.
+    """
+    if exc is not None:
+        retry_after = get_retry_after(exc)
+        if retry_after is not None:
+            return min(retry_after, max_delay)
+    ceiling = min(max_delay, base_delay * backoff_factor ** max(attempt - 1, 0))
+    return random.uniform(0, ceiling)
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease concurrency limiter.
+
+    The limit grows by roughly one slot per window of successful calls whose
+    smoothed latency stays within ``latency_tolerance`` times the baseline,
+    and is multiplied by ``decrease_factor`` on overload errors or latency
+    spikes, at most once per observed latency period.
+
+    Attributes:
+        limit (float): Current concurrency limit.
+        min_limit (int): Lower bound of the limit.
+        max_limit (int): Upper bound of the limit.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.latency_ewma: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._queue = FairQueue(self.current)
+
+    @property
+    def current(self) -> int:
+        return int(self.limit)
+
+    def _set_limit(self, limit: float):
+        self.limit = min(max(limit, self.min_limit), self.max_limit)
+        self._queue.set_capacity(self.current)
+
+    def _decrease(self):
+        now = time.time()
+        if now - self._last_decrease < (self.latency_ewma or 0.0):
+            return
+        self._last_decrease = now
+        self._set_limit(self.limit * self.decrease_factor)
+
+    def on_success(self, latency: float):
+        if self.latency_ewma is None:
+            self.latency_ewma = self.baseline_latency = latency
+        else:
+            self.latency_ewma += self.smoothing * (latency - self.latency_ewma)
+            # Track the best latency, slowly forgetting it so that a permanent
+            # shift of the provider does not pin the limit at its minimum.
+            self.baseline_latency = min(
+                self.latency_ewma,
+                self.baseline_latency
+                + 0.01 * (self.latency_ewma - self.baseline_latency),
+            )
+        if self.latency_ewma > self.latency_tolerance * self.baseline_latency:
+            self._decrease()
+        else:
+            self._set_limit(self.limit + 1.0 / self.limit)
+
+    def on_error(self, exc: BaseException):
+        if is_overload_error(exc):
+            self._decrease()
+
+    @asynccontextmanager
+    async def slot(self):
+        async with self._queue.slot():
+            yield
+
+    def get_stats(self) -> dict:
+        return {
+            "limit": self.current,
+            "latency_ewma": self.latency_ewma,
+            "baseline_latency": self.baseline_latency,
+            **self._queue.get_stats(),
+        }
+
+
+class TokenBucket:
+    """In-process bucket refilled continuously at ``per_minute / 60`` per second.
+
+    A single acquisition larger than the bucket is allowed once the bucket is
+    full, leaving it in debt, so oversized prompts are delayed but never
+    rejected.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.capacity / 60
+        )
+        self._updated = now
+
+    def get_wait_time(self, amount: float) -> float:
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) * 60 / self.capacity
+
+    def consume(self, amount: float):
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class RateLimiter:
+    """RPM / TPM budget shared by every LLM drawing on the same quota.
+
+    Callers wait in FIFO order until both budgets can accommodate them. When a
+    Redis client supporting ``incrby`` is given, the budgets are kept in
+    per-minute window counters so that multiple processes coordinate;
+    otherwise continuously refilled in-process token buckets are used.
+
+    Attributes:
+        key (str): Identifier of the shared quota.
+        rpm (int | None): Requests per minute, ``None`` for unlimited.
+        tpm (int | None): Tokens per minute, ``None`` for unlimited.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        redis_client=None,
+        prefix: str = "oxygent",
+    ):
+        self.key = key
+        self.rpm = rpm
+        self.tpm = tpm
+        self.bind(redis_client, prefix)
+        self._lock = asyncio.Lock()
+        self._request_bucket = TokenBucket(rpm) if rpm else None
+        self._token_bucket = TokenBucket(tpm) if tpm else None
+        self.waiting = 0
+        self.total_requests = 0
+        self.total_tokens = 0
+
+    def bind(self, redis_client=None, prefix: str = "oxygent"):
+        """Share the budgets through *redis_client*, in-process without it."""
+        self.redis_client = redis_client if hasattr(redis_client, "incrby") else None
+        self.prefix = prefix
+
+    def _get_window_keys(self) -> tuple:
+        window = int(time.time() // 60)
+        base = f"{self.prefix}:rate_limit:{self.key}:{window}"
+        return f"{base}:requests", f"{base}:tokens"
+
+    async def _try_acquire_shared(self, tokens: int) -> float:
+        request_key, token_key = self._get_window_keys()
+        wait_time = 60 - time.time() % 60 + random.uniform(0, 0.5)
+        if self.rpm:
+            count = await self.redis_client.incrby(request_key, 1, ex=120)
+            if count > self.rpm:
+                await self.redis_client.incrby(request_key, -1, ex=120)
+                return wait_time
+        if self.tpm:
+            count = await self.redis_client.incrby(token_key, tokens, ex=120)
+            # An oversized request may use an otherwise empty window
+            if count > self.tpm and count != tokens:
+                await self.redis_client.incrby(token_key, -tokens, ex=120)
+                if self.rpm:
+                    await self.redis_client.incrby(request_key, -1, ex=120)
+                return wait_time
+        return 0.0
+
+    def _try_acquire_local(self, tokens: int) -> float:
+        wait_time = 0.0
+        if self._request_bucket:
+            wait_time = max(wait_time, self._request_bucket.get_wait_time(1))
+        if self._token_bucket:
+            wait_time = max(wait_time, self._token_bucket.get_wait_time(tokens))
+        if wait_time == 0.0:
+            if self._request_bucket:
+                self._request_bucket.consume(1)
+            if self._token_bucket:
+                self._token_bucket.consume(tokens)
+        return wait_time
+
+    async def acquire(self, tokens: int = 0):
+        """Wait until one request of about *tokens* tokens fits the budgets."""
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    if self.redis_client:
+                        wait_time = await self._try_acquire_shared(tokens)
+                    else:
+                        wait_time = self._try_acquire_local(tokens)
+                    if wait_time == 0.0:
+                        break
+                    logger.debug(
+                        f"Rate limit {self.key} reached, waiting {wait_time:.2f}s"
+                    )
+                    await asyncio.sleep(wait_time)
+        finally:
+            self.waiting -= 1
+        self.total_requests += 1
+        self.total_tokens += tokens
+
+    async def adjust(self, delta: int):
+        """Correct the token budget once the real usage is known."""
+        if not self.tpm or not delta:
+            return
+        self.total_tokens += delta
+        if self.redis_client:
+            _, token_key = self._get_window_keys()
+            await self.redis_client.incrby(token_key, delta, ex=120)
+        else:
+            self._token_bucket.consume(delta)
+
+    def get_stats(self) -> dict:
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "waiting": self.waiting,
+            "total_requests": self.total_requests,
+            "total_tokens": self.total_tokens,
+            "is_shared": self.redis_client is not None,
+        }
+
+
+_rate_limiters: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(
+    key: str,
+    rpm: Optional[int] = None,
+    tpm: Optional[int] = None,
+    redis_client=None,
+    prefix: str = "oxygent",
+) -> RateLimiter:
+    """Return the process-wide limiter of a quota, creating it if needed.
+
+    A cached limiter is rebound when called with another Redis client or
+    prefix, e.g. by a MAS created after the previous one was closed.
+    """
+    rate_limiter = _rate_limiters.get(key)
+    if rate_limiter is None or (rate_limiter.rpm, rate_limiter.tpm) != (rpm, tpm):
+        rate_limiter = RateLimiter(key, rpm, tpm, redis_client, prefix)
+        _rate_limiters[key] = rate_limiter
+    elif (
+        rate_limiter.redis_client
+        is not (redis_client if hasattr(redis_client, "incrby") else None)
+        or rate_limiter.prefix != prefix
+    ):
+        rate_limiter.bind(redis_client, prefix)
+    return rate_limiter
+
+
+def get_rate_limiter_stats() -> dict:
+    return {key: limiter.get_stats() for key, limiter in _rate_limiters.items()}
@@ -20,18 +20,22 @@ NOTE: This module contains the following parts:
 import asyncio
 import json
 import os
+import time
 import traceback
 from collections import OrderedDict
-from typing import Callable, Optional
+from typing import Callable, Optional, Union
 
 import msgpack
-from elasticsearch import AsyncElasticsearch
 from pydantic import BaseModel, ConfigDict, Field
 
+from .budget import BUDGET_KEY
+from .cancellation import CancelScope
 from .config import Config
-from .databases.db_es import JesEs, LocalEs
-from .databases.db_redis import JimdbApRedis, LocalRedis
-from .databases.db_vector import VearchDB
+from .databases import db_es, db_redis, db_vector
+from .databases.db_es.base_es import BaseEs
+from .databases.db_redis.base_redis import BaseRedis
+from .databases.db_redis.local_redis import LocalRedis
+from .databases.db_vector.base_vector_db import BaseVectorDB
 from .db_factory import DBFactory
 from .log_setup import setup_logging
 from .oxy import Oxy
@@ -41,8 +45,12 @@ from .oxy.base_flow import BaseFlow
 from .oxy.base_tool import BaseTool
 from .oxy.llms.base_llm import BaseLLM
 from .oxy.mcp_tools.base_mcp_client import BaseMCPClient
-from .routes import router
-from .schemas import OxyRequest, OxyResponse, SSEMessage, WebResponse
+from .limiters import get_rate_limiter_stats
+from .mas_snapshot import MASSnapshot, get_oxy_space_key
+from .scheduler import MASScheduler, OverloadError
+from .schemas import OxyRequest, OxyResponse, OxyState, SSEMessage, WebResponse
+from .task_registry import TaskRegistry
+from .tool_cache import get_tool_result_cache
 from .utils.common_utils import (
     generate_uuid,
     get_format_time,
@@ -51,6 +59,12 @@ from .utils.common_utils import (
     print_tree,
     to_json,
 )
+from .utils.dataset_utils import (
+    ResultWriter,
+    get_percentiles,
+    iter_dataset,
+    read_completed_ids,
+)
 
 logger = None
 
@@ -76,12 +90,17 @@ class MAS(BaseModel):
 
     agent_organization: dict = Field(default_factory=list)
 
-    vearch_client: Optional[VearchDB] = Field(None)
-    es_client: Optional[AsyncElasticsearch] = Field(None)
-    redis_client: Optional[JimdbApRedis] = Field(None)
+    vearch_client: Optional[BaseVectorDB] = Field(None)
+    es_client: Optional[BaseEs] = Field(None)
+    redis_client: Optional[Union[BaseRedis, LocalRedis]] = Field(None)
+
+    scheduler: Optional[MASScheduler] = Field(
+        None, description="Admission control and fair scheduling policy"
+    )
 
     lock: bool = Field(False)
     active_tasks: dict = Field(default_factory=dict)
+    cancel_scopes: dict[str, CancelScope] = Field(default_factory=dict)
     background_tasks: set = Field(default_factory=set)
     event_dict: dict = Field(default_factory=dict)
 
@@ -103,6 +122,21 @@ class MAS(BaseModel):
 
     stream_dict: dict[str, list] = Field(default_factory=dict)
 
+    llm_usage: dict[str, dict] = Field(
+        default_factory=dict, description="Token usage accumulated per LLM"
+    )
+
+    is_multi_worker: bool = Field(
+        False, description="Whether other worker processes serve the same app"
+    )
+    task_registry: Optional[TaskRegistry] = Field(
+        None, description="Owners of the running traces across workers"
+    )
+
+    is_snapshot: bool = Field(
+        False, description="Restore what init discovered from the last snapshot"
+    )
+
     def __init__(self, **kwargs):
         """Construct a new :class:`MAS`.
 
@@ -131,6 +165,8 @@ class MAS(BaseModel):
         logger.info("=" * 64)
         logger.info("🪂 OxyGent MAS Application Exit")
         logger.info("=" * 64)
+        if self.task_registry:
+            await self.task_registry.stop()
         await self.es_client.close()
         await self.redis_client.close()
         await self.cleanup_servers()
@@ -195,27 +231,93 @@ class MAS(BaseModel):
         - Initializing the database connections (Elasticsearch, Redis)
         - Setting up the agent organization structure
         - Initialize the vector search if configured
+
+        With ``is_snapshot``, a snapshot taken by an earlier init of the same
+        oxy space is restored instead of rediscovering MCP tools, remote
+        organizations, Elasticsearch indexes and the Vearch tool table. It is
+        refreshed once the MCP servers connected in the background have
+        listed their current tools.
         """
         self.show_banner()
         self.show_mas_info()
+        snapshot_key, snapshot = "", None
+        if self.is_snapshot:
+            snapshot_key = get_oxy_space_key(self.oxy_space)
+            snapshot = MASSnapshot.load(self.get_snapshot_path(), snapshot_key)
         # Register default oxy_space
         self.add_oxy_list(self.oxy_space)
+        if snapshot:
+            self.restore_snapshot(snapshot)
+        if self.scheduler is None and Config.get_scheduler_is_enabled():
+            self.scheduler = MASScheduler.from_config()
         if Config.get_vearch_config():
             from .core_tools.retrieve_tools import fh as retrieve_fh
 
             self.add_oxy(retrieve_fh)
         # Initialize datebase asynchronously
-        await self.init_db()
+        await self.init_db(is_create_index=not (snapshot and Config.get_es_config()))
+        if self.is_multi_worker:
+            self.init_task_registry()
         # Initialize all oxy instances
         await self.init_all_oxy()
         # Initialize the master agent name
         self.init_master_agent_name()
         # Initialize the Redis client
         if Config.get_vearch_config():
-            await self.create_vearch_table()
+            await self.create_vearch_table(snapshot)
         # Build the agent organization structure
         self.init_agent_organization()
         self.show_org()
+        if snapshot:
+            refresh_task = asyncio.create_task(self.refresh_snapshot(snapshot_key))
+            refresh_task.add_done_callback(self.background_tasks.discard)
+            self.background_tasks.add(refresh_task)
+        elif self.is_snapshot:
+            MASSnapshot.from_mas(self, snapshot_key).save(self.get_snapshot_path())
+
+    def get_snapshot_path(self) -> str:
+        return os.path.join(
+            Config.get_cache_save_dir(),
+            "mas_snapshots",
+            f"{Config.get_app_name()}_{self.name or 'mas'}.json",
+        )
+
+    def restore_snapshot(self, snapshot: MASSnapshot):
+        """Hand the discovered tools and organizations back to their oxys."""
+        logger.info(f"Restoring the MAS snapshot {snapshot.key}.")
+        for oxy_name, oxy in self.oxy_name_to_oxy.items():
+            if isinstance(oxy, BaseMCPClient) and oxy_name in snapshot.mcp_tools:
+                oxy.restore_tools(snapshot.mcp_tools[oxy_name])
+            elif isinstance(oxy, RemoteAgent) and oxy_name in snapshot.remote_orgs:
+                oxy.org = oxy.org or snapshot.remote_orgs[oxy_name]
+
+    async def refresh_snapshot(self, snapshot_key: str):
+        """Save the snapshot again once every MCP server is connected.
+
+        After a restore the servers connect in the background and list their
+        tools, which may have changed since the snapshot was taken.
+        """
+        await asyncio.gather(
+            *[
+                oxy.wait_connected()
+                for oxy in self.oxy_name_to_oxy.values()
+                if isinstance(oxy, BaseMCPClient)
+            ],
+            return_exceptions=True,
+        )
+        MASSnapshot.from_mas(self, snapshot_key).save(self.get_snapshot_path())
+
+    def init_task_registry(self):
+        """Share the owners of running traces with the other workers."""
+        if not TaskRegistry.is_supported(self.redis_client):
+            logger.warning(
+                "Workers cannot cancel each other's traces without a shared Redis."
+            )
+            return
+        self.task_registry = TaskRegistry(
+            self.redis_client, f"{self.message_prefix}:{self.name}"
+        )
+        self.task_registry.start(self.cancel_trace)
 
     async def cleanup_servers(self) -> None:
         """Gracefully shut down remote servers/clients.
@@ -236,12 +338,16 @@ class MAS(BaseModel):
             except Exception as e:
                 logger.warning(f"Warning during final cleanup: {e}")
 
-    async def init_db(self):
+    async def init_db(self, is_create_index: bool = True):
         """Es --- (table_name: key)
 
         {app_name}_trace: trace_id: record trace of each call
         {app_name}_node: node_id: record log of each node
         {app_name}_history: history_id: record history of read and write operations
+
+        Args:
+            is_create_index: Whether the indexes are created, skipped when a
+                snapshot shows they exist already.
         """
 
         # es
@@ -251,9 +357,27 @@ class MAS(BaseModel):
             hosts = jes_config["hosts"]
             user = jes_config["user"]
             password = jes_config["password"]
-            self.es_client = db_factory.get_instance(JesEs, hosts, user, password)
+            self.es_client = db_factory.get_instance(db_es.JesEs, hosts, user, password)
+        else:
+            self.es_client = db_factory.get_instance(db_es.LocalEs)
+        if is_create_index:
+            await self.create_es_indexes()
+
+        # init redis client
+        redis_config = Config.get_redis_config()
+        if redis_config:
+            host = redis_config["host"]
+            port = redis_config["port"]
+            password = redis_config["password"]
+            db = redis_config.get("db", 0)
+            self.redis_client = db_redis.JimdbApRedis(
+                host=host, port=port, password=password, db=db
+            )
         else:
-            self.es_client = db_factory.get_instance(LocalEs)
+            self.redis_client = db_redis.LocalRedis()
+
+    async def create_es_indexes(self):
+        """Create the trace, message, node and history indexes if missing."""
         # trace table
         await self.es_client.create_index(
             Config.get_app_name() + "_trace",
@@ -360,19 +484,6 @@ class MAS(BaseModel):
             },
         )
 
-        # init redis client
-        redis_config = Config.get_redis_config()
-        if redis_config:
-            host = redis_config["host"]
-            port = redis_config["port"]
-            password = redis_config["password"]
-            db = redis_config.get("db", 0)
-            self.redis_client = JimdbApRedis(
-                host=host, port=port, password=password, db=db
-            )
-        else:
-            self.redis_client = LocalRedis()
-
     async def batch_init_oxy(self, *class_type):
         """Batch initialize oxy objects of specified types asynchronously.
 
@@ -483,8 +594,8 @@ class MAS(BaseModel):
     # Optional Vearch integration
     # ------------------------------------------------------------------
 
-    async def create_vearch_table(self):
-        """Link to the vearch database and create tables for tools."""
+    def get_retrieval_index(self) -> list:
+        """List the ``[mas_name, agent_name, tool_name, tool_desc]`` of tools."""
         tool_list = []
         for tool_name, tool in self.oxy_name_to_oxy.items():
             if not self.is_agent(tool_name):
@@ -497,10 +608,22 @@ class MAS(BaseModel):
                     permitted_tool_name
                 ):
                     continue
-                tool_list.append((self.name, tool_name, permitted_tool_name, tool_desc))
+                tool_list.append([self.name, tool_name, permitted_tool_name, tool_desc])
+        return tool_list
+
+    async def create_vearch_table(self, snapshot: Optional[MASSnapshot] = None):
+        """Link to the vearch database and create tables for tools.
+
+        Args:
+            snapshot: Snapshot of an earlier init, the tables are not synced
+                again if it holds the same tools.
+        """
+        tool_list = self.get_retrieval_index()
         if tool_list:
             # vearch
-            self.vearch_client = VearchDB(Config.get_vearch_config())
+            self.vearch_client = db_vector.VearchDB(Config.get_vearch_config())
+            if snapshot and snapshot.retrieval_index == tool_list:
+                return
             await self.vearch_client.create_vearch_table_by_tool_list(tool_list)
 
     # ------------------------------------------------------------------
@@ -549,6 +672,76 @@ class MAS(BaseModel):
             )
             return False
 
+    def get_cancel_scope(self, trace_id: str) -> CancelScope:
+        """Return the cancel scope of a trace, creating it if needed.
+
+        The scope is dropped when the root request of the trace ends, see
+        ``Oxy._root_scope``.
+        """
+        if trace_id not in self.cancel_scopes:
+            self.cancel_scopes[trace_id] = CancelScope(trace_id)
+        return self.cancel_scopes[trace_id]
+
+    def cancel_trace(self, trace_id: str, reason: str = "cancelled") -> bool:
+        """Cancel every running task of a trace.
+
+        Returns:
+            bool: Whether anything was running for the trace.
+        """
+        is_found = False
+        if trace_id in self.cancel_scopes:
+            is_found = self.cancel_scopes[trace_id].cancel(reason) > 0
+        task = self.active_tasks.get(trace_id)
+        if task and not task.done():
+            task.cancel()
+            is_found = True
+        return is_found
+
+    async def request_cancel(self, trace_id: str, reason: str = "cancelled") -> bool:
+        """Cancel a trace, forwarding the request to the worker running it.
+
+        Returns:
+            bool: Whether the trace was running in this or another worker.
+        """
+        if self.cancel_trace(trace_id, reason):
+            return True
+        if self.task_registry:
+            return await self.task_registry.request_cancel(trace_id, reason)
+        return False
+
+    async def reset_session(self, is_reset_usage: bool = False):
+        """Clear the per-request state so the MAS can serve unrelated requests.
+
+        Tools, LLMs, MCP sessions and database clients stay warm, which makes
+        one MAS reusable across the items of a batch instead of rebuilding it
+        per item. Unfinished traces are cancelled and pending background
+        writes are awaited. Conversation history needs no reset: every request
+        gets a fresh ``group_id`` unless it passes ``from_trace_id``.
+
+        Args:
+            is_reset_usage: Whether the accumulated LLM usage is cleared too.
+        """
+        for trace_id in list(self.active_tasks) + list(self.cancel_scopes):
+            self.cancel_trace(trace_id, "session reset")
+        if self.background_tasks:
+            await asyncio.gather(*self.background_tasks, return_exceptions=True)
+        self.active_tasks.clear()
+        self.cancel_scopes.clear()
+        self.stream_dict.clear()
+        self.event_dict.clear()
+        if is_reset_usage:
+            self.llm_usage.clear()
+
+    def get_metrics(self) -> dict:
+        """Return runtime metrics: LLM usage, rate limits and scheduling."""
+        return {
+            "llm_usage": self.llm_usage,
+            "rate_limiters": get_rate_limiter_stats(),
+            "scheduler": self.scheduler.get_stats() if self.scheduler else {},
+            "active_tasks": len(self.active_tasks),
+            "tool_cache": get_tool_result_cache().get_stats(),
+        }
+
     async def call(self, callee, arguments, **kwargs):
         """Invoke an *Oxy* component directly and return its output.
 
@@ -710,6 +903,11 @@ class MAS(BaseModel):
             if "shared_data" not in payload:
                 payload["shared_data"] = dict()
             payload["shared_data"]["query"] = payload["query"]
+            if "budget" in payload:
+                # Limits of the whole call tree, see oxygent.budget
+                payload["shared_data"][BUDGET_KEY] = dict(
+                    payload.pop("budget"), start_time=time.time()
+                )
 
             group_data = payload.get("group_data", {})
 
@@ -811,7 +1009,20 @@ class MAS(BaseModel):
             if not oxy_request.callee:
                 oxy_request.callee = self.master_agent_name
 
-            oxy_response = await oxy_request.start()
+            trace_id = oxy_request.current_trace_id
+            self.get_cancel_scope(trace_id).add_task(asyncio.current_task())
+            if self.task_registry:
+                await self.task_registry.register(trace_id)
+            try:
+                if self.scheduler:
+                    async with self.scheduler.admit(oxy_request):
+                        oxy_response = await oxy_request.start()
+                else:
+                    oxy_response = await oxy_request.start()
+            finally:
+                self.cancel_scopes.pop(trace_id, None)
+                if self.task_registry:
+                    await self.task_registry.unregister(trace_id)
 
             if send_msg_key:
                 await self.send_message(
@@ -820,8 +1031,19 @@ class MAS(BaseModel):
                     group_id=oxy_request.group_id,
                 )
             return oxy_response
-        except Exception:
+        except OverloadError as e:
+            logger.warning(str(e), extra={"trace_id": payload.get("current_trace_id")})
+            if send_msg_key:
+                await self.send_message(
+                    SSEMessage(event="close", data=str(e)), send_msg_key
+                )
+            raise
+        except Exception as e:
             logger.error(traceback.format_exc())
+            if send_msg_key:
+                await self.send_message(
+                    SSEMessage(event="close", data=f"Error: {e}"), send_msg_key
+                )
             raise
 
     # ------------------------------------------------------------------
@@ -854,6 +1076,16 @@ class MAS(BaseModel):
     # FastAPI + SSE web service (unedited original docstring preserved)
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _retrieve_chat_error(task: asyncio.Task):
+        """Done callback of a chat running behind an SSE stream.
+
+        ``chat_with_agent`` already logged the error and closed the stream, the
+        exception is retrieved so asyncio does not report it again.
+        """
+        if not task.cancelled():
+            task.exception()
+
     async def event_stream(self, redis_key, current_trace_id, task):
         try:
             task.add_done_callback(
@@ -902,34 +1134,28 @@ class MAS(BaseModel):
                 "SSE connection terminated.",
                 extra={"trace_id": current_trace_id},
             )
-            self.active_tasks[current_trace_id].cancel()
+            self.cancel_trace(current_trace_id, reason="client disconnected")
             raise
 
-    async def start_web_service(
-        self, first_query=None, welcome_message=None, host=None, port=None
-    ):
-        """Start the FastAPI + SSE service (see original inline documentation)."""
+    def create_app(self, lifespan=None):
+        """Build the FastAPI app that serves this MAS.
 
-        if not self.master_agent_name:
-            logger.warning("No agent was registered.")
-
-        self.first_query = first_query  # First query would be displayed in the frontend
-        if welcome_message:
-            self.welcome_message = welcome_message
-        if host is None:
-            host = Config.get_server_host()
-        if port is None:
-            port = Config.get_server_port()
+        Args:
+            lifespan: Lifespan context of the app, used by the multi-worker
+                app factory to initialize the MAS inside each worker.
 
-        # Start the FastAPI web service simultaneously with the MAS
+        Returns:
+            FastAPI: The app with the web UI, chat, SSE and cancel routes.
+        """
         import importlib.resources
 
-        import uvicorn
         from fastapi import FastAPI, Request
         from fastapi.staticfiles import StaticFiles
         from sse_starlette.sse import EventSourceResponse
 
-        app = FastAPI()
+        from .routes import router
+
+        app = FastAPI(lifespan=lifespan)
 
         from fastapi.middleware.cors import CORSMiddleware
 
@@ -1027,6 +1253,10 @@ class MAS(BaseModel):
                 }
             ).to_dict()
 
+        @app.get("/get_metrics")
+        def get_metrics():
+            return WebResponse(data=self.get_metrics()).to_dict()
+
         async def request_to_payload(request: Request):
             if request.method == "GET":
                 params = dict(request.query_params)
@@ -1061,6 +1291,20 @@ class MAS(BaseModel):
 
             return payload
 
+        @app.api_route("/cancel", methods=["GET", "POST"])
+        async def cancel(request: Request):
+            if request.method == "POST":
+                params = await request.json()
+            else:
+                params = dict(request.query_params)
+            trace_id = params.get("trace_id", "")
+            if not trace_id:
+                return WebResponse(code=400, message="trace_id is required").to_dict()
+            is_cancelled = await self.request_cancel(
+                trace_id, params.get("reason", "cancelled by user")
+            )
+            return WebResponse(data={"is_cancelled": is_cancelled}).to_dict()
+
         @app.api_route("/chat", methods=["GET", "POST"])
         async def chat(request: Request):
             payload = await request_to_payload(request)
@@ -1068,7 +1312,10 @@ class MAS(BaseModel):
             intercepted_response = self.func_interceptor(payload)
             if intercepted_response is not None:
                 return intercepted_response
-            oxy_response = await self.chat_with_agent(payload=payload)
+            try:
+                oxy_response = await self.chat_with_agent(payload=payload)
+            except OverloadError as e:
+                return WebResponse(code=503, message=str(e)).to_dict()
             return oxy_response.output
 
         @app.api_route("/sse/chat", methods=["GET", "POST"])
@@ -1078,6 +1325,10 @@ class MAS(BaseModel):
             intercepted_response = self.func_interceptor(payload)
             if intercepted_response is not None:
                 return intercepted_response
+            if self.scheduler and self.scheduler.is_overloaded():
+                return WebResponse(
+                    code=503, message="Server is overloaded, please retry later."
+                ).to_dict()
             current_trace_id = payload["current_trace_id"]
 
             logger.info(
@@ -1088,6 +1339,8 @@ class MAS(BaseModel):
             task = asyncio.create_task(
                 self.chat_with_agent(payload=payload, send_msg_key=redis_key)
             )
+            # The queue may fill up before the task is admitted
+            task.add_done_callback(self._retrieve_chat_error)
 
             return EventSourceResponse(
                 self.event_stream(redis_key, current_trace_id, task)
@@ -1100,6 +1353,10 @@ class MAS(BaseModel):
             intercepted_response = self.func_interceptor(payload)
             if intercepted_response is not None:
                 return intercepted_response
+            if self.scheduler and self.scheduler.is_overloaded():
+                return WebResponse(
+                    code=503, message="Server is overloaded, please retry later."
+                ).to_dict()
             current_trace_id = payload["current_trace_id"]
 
             logger.info(
@@ -1110,12 +1367,36 @@ class MAS(BaseModel):
             task = asyncio.create_task(
                 self.chat_with_agent(payload=payload, send_msg_key=redis_key)
             )
+            task.add_done_callback(self._retrieve_chat_error)
             task.add_done_callback(
                 lambda future: self.active_tasks.pop(current_trace_id, None)
             )
             self.active_tasks[current_trace_id] = task
             return WebResponse().to_dict()
 
+        return app
+
+    async def start_web_service(
+        self, first_query=None, welcome_message=None, host=None, port=None
+    ):
+        """Start the FastAPI + SSE service (see original inline documentation)."""
+
+        if not self.master_agent_name:
+            logger.warning("No agent was registered.")
+
+        self.first_query = first_query  # First query would be displayed in the frontend
+        if welcome_message:
+            self.welcome_message = welcome_message
+        if host is None:
+            host = Config.get_server_host()
+        if port is None:
+            port = Config.get_server_port()
+
+        # Start the FastAPI web service simultaneously with the MAS
+        import uvicorn
+
+        app = self.create_app()
+
         async def run_uvicorn():
             """Run the Uvicorn server with the FastAPI app."""
             logger.info("🔗 OxyGent MAS FastAPI Service Initialization")
@@ -1126,7 +1407,7 @@ class MAS(BaseModel):
                 port=port,
                 log_level=Config.get_server_log_level().lower(),
                 log_config=None,
-                workers=Config.set_server_workers(),
+                workers=Config.get_server_workers(),
             )
             server = uvicorn.Server(config)
 
@@ -1161,8 +1442,6 @@ class MAS(BaseModel):
         Returns:
             list: Answers (or dicts with *output* + *trace_id*).
         """
-        import time
-
         cost_times = []
 
         async def handle_query(query):
@@ -1189,3 +1468,100 @@ class MAS(BaseModel):
         results = await asyncio.gather(*tasks)
         logger.info("done.")
         return results
+
+    async def run_dataset(
+        self,
+        input_path: str,
+        output_path: str,
+        id_key: str = "task_id",
+        query_key: str = "query",
+        max_concurrency: int = 5,
+        item_timeout: Optional[float] = None,
+        func_build_payload: Optional[Callable[[dict], dict]] = None,
+    ) -> dict:
+        """Evaluate a JSONL or CSV dataset, resuming an interrupted run.
+
+        Items are read one at a time and at most *max_concurrency* run at
+        once. The result of each item, its fields plus ``output``, ``state``,
+        ``trace_id``, ``error`` and ``latency``, is appended to *output_path*
+        as soon as it finishes. Items whose id already has a result without
+        error in *output_path* are skipped, so a rerun after a crash only
+        runs the rest.
+
+        Args:
+            input_path: JSONL or CSV file of items.
+            output_path: JSONL or CSV file the results are appended to.
+            id_key: Field identifying an item.
+            query_key: Field holding the query, when no
+                *func_build_payload* is given.
+            max_concurrency: Number of items run at the same time.
+            item_timeout: Seconds after which an item is cancelled and
+                recorded as failed.
+            func_build_payload: Maps an item to the payload of
+                :meth:`chat_with_agent`.
+
+        Returns:
+            dict: Counts of completed, failed and skipped items, elapsed
+            seconds, throughput in items per second and latency percentiles.
+        """
+        completed_ids = read_completed_ids(output_path, id_key)
+        writer = ResultWriter(output_path)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        stats = {"completed": 0, "failed": 0, "skipped": 0}
+        latencies = []
+
+        async def run_item(item):
+            start_time = time.time()
+            trace_id = generate_uuid()
+            result = dict(item, trace_id=trace_id)
+            try:
+                payload = (
+                    func_build_payload(item)
+                    if func_build_payload
+                    else {"query": item[query_key]}
+                )
+                payload["current_trace_id"] = trace_id
+                task = asyncio.create_task(self.chat_with_agent(payload=payload))
+                await asyncio.wait({task}, timeout=item_timeout)
+                if not task.done():
+                    self.cancel_trace(trace_id, f"item timeout of {item_timeout}s")
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    raise asyncio.TimeoutError(f"timed out after {item_timeout}s")
+                oxy_response = task.result()
+                result.update(output=oxy_response.output, state=oxy_response.state.name)
+                if oxy_response.state != OxyState.COMPLETED:
+                    # Recorded with an error, so a rerun retries the item
+                    raise RuntimeError(f"ended in state {oxy_response.state.name}")
+                stats["completed"] += 1
+            except Exception as e:
+                result.update(error=str(e) or type(e).__name__)
+                stats["failed"] += 1
+                logger.warning(
+                    f"Item {item.get(id_key)} failed: {result['error']}",
+                    extra={"trace_id": trace_id},
+                )
+            finally:
+                semaphore.release()
+            result["latency"] = time.time() - start_time
+            latencies.append(result["latency"])
+            writer.write(result)
+
+        start_time = time.time()
+        tasks = set()
+        for item in iter_dataset(input_path):
+            if str(item.get(id_key)) in completed_ids:
+                stats["skipped"] += 1
+                continue
+            await semaphore.acquire()  # Read the next item only when a slot frees
+            task = asyncio.create_task(run_item(item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        await asyncio.gather(*tasks)
+
+        stats["seconds"] = time.time() - start_time
+        run_count = stats["completed"] + stats["failed"]
+        stats["throughput"] = run_count / stats["seconds"] if stats["seconds"] else 0
+        stats["latency"] = get_percentiles(latencies)
+        logger.info(f"Dataset {input_path} done: {stats}")
+        return stats
@@ -0,0 +1,156 @@
+"""mas_snapshot.py Manifest of an initialized MAS for fast restarts.
+
+NOTE: ``MAS.init`` spawns or connects every MCP server to discover its tools,
+fetches the organization of remote agents, creates the Elasticsearch indexes
+and embeds the tool descriptions into Vearch. None of this changes while the
+oxy space stays the same, so the results are saved to a snapshot keyed by a
+hash of the oxy space definitions. A restart with the same key restores them:
+MCP tools are registered from their schemas while the servers connect in the
+background, and the index creation and Vearch sync are skipped.
+"""
+
+import inspect
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from .config import Config
+from .utils.common_utils import get_md5
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 2
+
+
+def _describe(obj) -> str:
+    """Stable JSON fallback, ``str()`` of most objects contains their address."""
+    if callable(obj):
+        try:
+            signature = str(inspect.signature(obj))
+        except (TypeError, ValueError):
+            signature = ""
+        name = getattr(obj, "__qualname__", type(obj).__qualname__)
+        return f"{getattr(obj, '__module__', '')}.{name}{signature}:{obj.__doc__}"
+    return type(obj).__qualname__
+
+
+def get_oxy_space_key(oxy_space: list) -> str:
+    """Hash the definitions of *oxy_space* and the config they depend on."""
+    definitions = [
+        {
+            "class": f"{type(oxy).__module__}.{type(oxy).__qualname__}",
+            "fields": oxy.model_dump(),
+        }
+        for oxy in oxy_space
+    ]
+    return get_md5(
+        json.dumps(
+            {
+                "version": SNAPSHOT_VERSION,
+                "app_name": Config.get_app_name(),
+                "es": Config.get_es_config(),
+                "vearch": Config.get_vearch_config(),
+                "oxy_space": definitions,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=_describe,
+        )
+    )
+
+
+class MASSnapshot:
+    """What ``MAS.init`` discovered, restored instead of rediscovered.
+
+    Examples
+    --------
+    >>> snapshot = MASSnapshot.load(path, get_oxy_space_key(oxy_space))
+    >>> if snapshot is None:
+    ...     ...  # initialize as usual, then MASSnapshot.from_mas(mas, key).save(path)
+    """
+
+    def __init__(
+        self,
+        key: str,
+        mcp_tools: Optional[dict] = None,
+        remote_orgs: Optional[dict] = None,
+        retrieval_index: Optional[list] = None,
+        created_at: Optional[float] = None,
+    ):
+        """
+        Args:
+            key: Hash of the oxy space, see :func:`get_oxy_space_key`.
+            mcp_tools: Tool schemas of each MCP client by client name.
+            remote_orgs: Organization of each remote agent by agent name.
+            retrieval_index: Tool entries synced to Vearch, None without it.
+            created_at: Unix time the snapshot was taken.
+        """
+        self.key = key
+        self.mcp_tools = mcp_tools or {}
+        self.remote_orgs = remote_orgs or {}
+        self.retrieval_index = retrieval_index
+        self.created_at = created_at or time.time()
+
+    @classmethod
+    def from_mas(cls, mas, key: str) -> "MASSnapshot":
+        """Take a snapshot of an initialized *mas*."""
+        from .oxy.agents.remote_agent import RemoteAgent
+        from .oxy.mcp_tools.base_mcp_client import BaseMCPClient
+
+        mcp_tools, remote_orgs = {}, {}
+        for oxy_name, oxy in mas.oxy_name_to_oxy.items():
+            if isinstance(oxy, BaseMCPClient):
+                mcp_tools[oxy_name] = oxy.get_tool_schemas()
+            elif isinstance(oxy, RemoteAgent) and oxy.org:
+                remote_orgs[oxy_name] = oxy.org
+        return cls(
+            key,
+            mcp_tools=mcp_tools,
+            remote_orgs=remote_orgs,
+            retrieval_index=mas.get_retrieval_index() if mas.vearch_client else None,
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "version": SNAPSHOT_VERSION,
+            "key": self.key,
+            "created_at": self.created_at,
+            "mcp_tools": self.mcp_tools,
+            "remote_orgs": self.remote_orgs,
+            "retrieval_index": self.retrieval_index,
+        }
+
+    def save(self, path: str):
+        """Write the snapshot atomically, readers never see a partial file."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not save the MAS snapshot: {e}")
+
+    @classmethod
+    def load(cls, path: str, key: str) -> Optional["MASSnapshot"]:
+        """Load the snapshot at *path*, None if missing, stale or unreadable."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring the MAS snapshot {path}: {e}")
+            return None
+        if data.get("version") != SNAPSHOT_VERSION or data.get("key") != key:
+            logger.info("The oxy space changed since the MAS snapshot, rebuilding.")
+            return None
+        return cls(
+            key,
+            mcp_tools=data.get("mcp_tools"),
+            remote_orgs=data.get("remote_orgs"),
+            retrieval_index=data.get("retrieval_index"),
+            created_at=data.get("created_at"),
+        )
@@ -184,28 +184,34 @@ class LocalAgent(BaseAgent):
             raise Exception(f"LLM model [{self.llm_model}] not exists.")
 
         if self.team_size > 1:
-            team_names = []
-            for i in range(self.team_size):
-                new_instance = copy.deepcopy(self)
-                new_instance.name = f"{self.name}_{i + 1}"
-                new_instance.is_master = False
-                new_instance.func_process_input = self.func_process_input
-                new_instance.func_process_output = self.func_process_output
-                new_instance.func_format_input = self.func_format_input
-                new_instance.func_format_output = self.func_format_output
-                team_names.append(new_instance.name)
-                self.mas.oxy_name_to_oxy[new_instance.name] = new_instance
-            from .parallel_agent import ParallelAgent
-
-            parallel_agent = ParallelAgent(
-                name=self.name,
-                desc=self.desc,
-                permitted_tool_name_list=team_names,
-                llm_model=self.llm_model,
-                is_master=self.is_master,
-            )
-            parallel_agent.set_mas(self.mas)
-            self.mas.oxy_name_to_oxy[self.name] = parallel_agent
+            self._init_team()
+
+    def _init_team(self):
+        """Serve the agent as a team of ``team_size`` parallel members.
+
+        The members share this agent, registered once as ``{name}_member``
+        with a concurrency limit scaled by the team size, and only differ by
+        the ``team_member_id`` argument of their requests, which prompts can
+        reference as ``${team_member_id}`` and which scopes the session of
+        their history. A ParallelAgent takes over the name of the agent and
+        fans requests out to the members.
+        """
+        from .parallel_agent import ParallelAgent
+
+        parallel_agent = ParallelAgent(
+            name=self.name,
+            desc=self.desc,
+            permitted_tool_name_list=[f"{self.name}_member"],
+            llm_model=self.llm_model,
+            is_master=self.is_master,
+            team_size=self.team_size,
+        )
+        self.name = f"{self.name}_member"
+        self.is_master = False
+        self.set_concurrency_limit(self.semaphore * self.team_size)
+        self.mas.oxy_name_to_oxy[self.name] = self
+        parallel_agent.set_mas(self.mas)
+        self.mas.oxy_name_to_oxy[parallel_agent.name] = parallel_agent
 
     async def _get_history(
         self, oxy_request: OxyRequest, is_get_user_master_session=False
@@ -5,8 +5,12 @@ across team members and aggregates their results into a unified response.
 """
 
 import asyncio
+from contextlib import aclosing
+from typing import Optional
 
-from ...schemas import Memory, Message, OxyRequest, OxyResponse
+from pydantic import Field
+
+from ...schemas import Memory, Message, OxyRequest, OxyResponse, OxyState
 from ...utils.common_utils import generate_uuid
 from .local_agent import LocalAgent
 
@@ -15,30 +19,42 @@ class ParallelAgent(LocalAgent):
     """Agent that executes tasks in parallel across multiple team members.
 
     This agent distributes the same task to all available team members simultaneously
-    and combines their responses.
+    and combines their responses. With ``team_size`` > 1 every permitted agent is
+    called that many times, each call carrying its ``team_member_id``.
+
+    Attributes:
+        quorum (int | None): Number of completed results after which the
+            remaining team members are cancelled, None waits for all of them.
+        deadline (float | None): Seconds after which unfinished team members
+            are cancelled and the results received so far are summarized.
+        is_incremental_summary (bool): Whether to summarize finished results
+            while other team members are still running, so only the last
+            results are left to summarize when the slowest one finishes.
     """
 
-    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
-        """Execute the request in parallel across all team members.
+    quorum: Optional[int] = Field(
+        None, description="Completed results needed before cancelling the rest"
+    )
+    deadline: Optional[float] = Field(
+        None, description="Seconds after which unfinished members are cancelled"
+    )
+    is_incremental_summary: bool = Field(
+        False, description="Summarize finished results while others still run"
+    )
 
-        Args:
-            oxy_request (OxyRequest): The request to execute across all team members.
+    def _init_team(self):
+        """The members of the team are fanned out in ``_execute``."""
 
-        Returns:
-            OxyResponse: Combined response with numbered results from all team members.
-        """
-
-        parallel_id = generate_uuid()
-        oxy_responses = await asyncio.gather(
-            *[
-                oxy_request.call(
-                    callee=permitted_tool_name,
-                    arguments=oxy_request.arguments,
-                    parallel_id=parallel_id,
-                )
-                for permitted_tool_name in self.permitted_tool_name_list
-            ]
-        )
+    async def _summarize(
+        self,
+        oxy_request: OxyRequest,
+        outputs: list,
+        previous_summary_task: Optional[asyncio.Task] = None,
+    ) -> OxyResponse:
+        """Summarize *outputs*, on top of the summary of a previous task if any."""
+        previous_summary = ""
+        if previous_summary_task:
+            previous_summary = (await previous_summary_task).output
 
         temp_memory = Memory()
         temp_memory.add_message(
@@ -49,11 +65,16 @@ Please summarize the results of the parallel execution of the above tasks."""
         )
         temp_memory.add_message(
             Message.user_message(
-                "The parallel resulte are as following:\n"
+                (
+                    f"The summary of the previous results is:\n{previous_summary}\n"
+                    if previous_summary
+                    else ""
+                )
+                + "The parallel resulte are as following:\n"
                 + "\n".join(
                     [
-                        str(i + 1) + ". " + res.output
-                        for i, res in enumerate(oxy_responses)
+                        str(i + 1) + ". " + str(output)
+                        for i, output in enumerate(outputs)
                     ]
                 )
             )
@@ -67,3 +88,69 @@ Please summarize the results of the parallel execution of the above tasks."""
                 )
             },
         )
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Execute the request in parallel across all team members.
+
+        Results are collected as they complete. Once ``quorum`` results have
+        completed or ``deadline`` has passed, the remaining members are
+        cancelled.
+
+        Args:
+            oxy_request (OxyRequest): The request to execute across all team members.
+
+        Returns:
+            OxyResponse: Combined response with numbered results from all team members,
+                FAILED if the deadline passed before any of them finished.
+        """
+
+        parallel_id = generate_uuid()
+        calls = [
+            oxy_request.call(
+                callee=permitted_tool_name,
+                arguments=(
+                    {**oxy_request.arguments, "team_member_id": member_id + 1}
+                    if self.team_size > 1
+                    else oxy_request.arguments
+                ),
+                parallel_id=parallel_id,
+            )
+            for permitted_tool_name in self.permitted_tool_name_list
+            for member_id in range(self.team_size)
+        ]
+        scope = oxy_request.get_cancel_scope()
+        finished = []  # (index, output) not summarized yet
+        completed_count = 0
+        summary_task = None
+        async with aclosing(
+            oxy_request.as_completed(*calls, timeout=self.deadline)
+        ) as results:
+            async for i, oxy_response in results:
+                finished.append((i, oxy_response.output))
+                if oxy_response.state is OxyState.COMPLETED:
+                    completed_count += 1
+                if self.quorum and completed_count >= self.quorum:
+                    break
+                if self.is_incremental_summary and (
+                    summary_task is None or summary_task.done()
+                ):
+                    summary_task = scope.spawn(
+                        self._summarize(
+                            oxy_request,
+                            [output for _, output in sorted(finished)],
+                            summary_task,
+                        )
+                    )
+                    finished = []
+
+        if summary_task is None and not finished:
+            # The deadline passed before any team member finished
+            return OxyResponse(
+                state=OxyState.FAILED,
+                output=f"No team member finished within {self.deadline} seconds",
+            )
+        if summary_task and not finished:
+            return await summary_task
+        return await self._summarize(
+            oxy_request, [output for _, output in sorted(finished)], summary_task
+        )
@@ -8,13 +8,23 @@ with tool execution in an iterative loop.
 import asyncio
 import json
 import logging
+import math
+import re
+import time
 from typing import Callable, Optional
 
 from pydantic import Field
 
+from ...budget import Budget
 from ...config import Config
-from ...prompts import SYSTEM_PROMPT, SYSTEM_PROMPT_RETRIEVAL
+from ...prompts import (
+    SYSTEM_PROMPT,
+    SPECULATIVE_ROUTER_PROMPT,
+    SYSTEM_PROMPT_NATIVE_TOOL_CALL,
+    SYSTEM_PROMPT_RETRIEVAL,
+)
 from ...schemas import (
+    ConversationBuilder,
     ExecResult,
     LLMResponse,
     LLMState,
@@ -25,11 +35,19 @@ from ...schemas import (
     OxyResponse,
     OxyState,
 )
+from ...schemas.memory import Function, ToolCall
 from ...utils.common_utils import chunk_list, extract_first_json, generate_uuid
+from ...utils.json_stream_parser import JSONStreamParser
 from .local_agent import LocalAgent
 
 logger = logging.getLogger(__name__)
 
+# Function words ignored when matching queries against sub-agent descriptions
+STOP_WORDS = frozenset(
+    "a an and are as at be by can for from how in is it of on or that the this"
+    " to what when where which who why with".split()
+)
+
 
 class ReActAgent(LocalAgent):
     """Agent implementing the ReAct (Reasoning and Acting) paradigm.
@@ -57,6 +75,27 @@ class ReActAgent(LocalAgent):
         is_discard_react_memory (bool): Whether to discard detailed ReAct memory.
         memory_max_tokens (int): Maximum tokens for memory management.
         trust_mode (bool): Whether to enable trust mode for direct tool results.
+        is_stream_tool_call (bool): Whether to start each tool call as soon as it
+            has streamed in, overlapping tool latency with LLM generation.
+            Only tools with a ``cache_policy`` are started early, since a call
+            the final output does not confirm may already have run.
+        is_native_tool_call (bool): Whether to send the tools as OpenAI ``tools``
+            and execute the returned ``tool_calls`` in parallel instead of
+            parsing a JSON protocol from the text output.
+        speculative_top_k (int): Number of sub-agents started with the user query
+            concurrently with the first reasoning round, 0 disables speculation.
+        speculative_agent_names (list[str]): Side-effect-free sub-agents that
+            may be started speculatively, none by default. A speculative call
+            is only adopted if the master calls it with the user query.
+        speculative_router_llm (str | None): Small LLM ranking the sub-agents for
+            speculation, defaults to a keyword classifier over their descriptions.
+
+    The loop also ends early, with the fallback summary, when the budget of the
+    request (see ``oxygent.budget``) is exhausted, or when its remaining time
+    cannot fit another LLM round and the summary. The round time is an EWMA
+    of the LLM latency of past rounds of this agent, across all requests, and
+    leaves out the time of the tool calls. A batch of tool calls is truncated
+    to the tool calls left in the budget.
 
     TODO:
         - LLM model: Support both service URLs and weight files for training
@@ -78,6 +117,28 @@ class ReActAgent(LocalAgent):
     weight_react_memory: int = Field(1, description="Weight for react_memory")
 
     trust_mode: bool = Field(False, description="Enable trust mode for direct results")
+    is_stream_tool_call: bool = Field(
+        False, description="Start tool calls while the LLM is still streaming"
+    )
+    is_native_tool_call: bool = Field(
+        False, description="Call tools through the native function calling of the LLM"
+    )
+
+    speculative_top_k: int = Field(
+        0, description="Sub-agents started speculatively in the first round"
+    )
+    speculative_router_llm: Optional[str] = Field(
+        None, description="LLM ranking the sub-agents for speculative dispatch"
+    )
+    speculative_agent_names: list[str] = Field(
+        default_factory=list,
+        description="Side-effect-free sub-agents allowed to start speculatively",
+    )
+    func_rank_sub_agents: Optional[Callable[[str, dict], list]] = Field(
+        None,
+        exclude=True,
+        description="Function ranking sub-agents by query and name-to-description map",
+    )
 
     func_parse_llm_response: Optional[Callable[[str, OxyRequest], LLMResponse]] = Field(
         None, exclude=True, description="Function to parse LLM output"
@@ -92,15 +153,25 @@ class ReActAgent(LocalAgent):
         super().__init__(**kwargs)
 
         if not self.prompt:
-            self.prompt = (
-                SYSTEM_PROMPT_RETRIEVAL if self.is_sourcing_tools else SYSTEM_PROMPT
-            )
+            if self.is_native_tool_call:
+                self.prompt = SYSTEM_PROMPT_NATIVE_TOOL_CALL
+            elif self.is_sourcing_tools:
+                self.prompt = SYSTEM_PROMPT_RETRIEVAL
+            else:
+                self.prompt = SYSTEM_PROMPT
         if self.func_parse_llm_response is None:
             self.func_parse_llm_response = self._parse_llm_response
 
         if self.func_reflexion is None:
             self.func_reflexion = self._default_reflexion
 
+        if self.func_rank_sub_agents is None:
+            self.func_rank_sub_agents = self._rank_sub_agents_by_keywords
+
+        # EWMA of the LLM latency of a round, shared by all requests, a prior
+        # for the first round of a new request; tool call time is not included
+        self._round_seconds: Optional[float] = None
+
         # Add retrieve_tools if vector search is conf igured
         if Config.get_vearch_config():
             self.tools.append("retrieve_tools")
@@ -292,6 +363,309 @@ class ReActAgent(LocalAgent):
                 state=LLMState.ERROR_PARSE, output=e, ori_response=ori_response
             )
 
+    def _get_llm_tools(self, oxy_request: OxyRequest) -> list[dict]:
+        """Function-calling schemas of the tools the agent may call."""
+        return [
+            oxy_request.get_oxy(tool_name).get_llm_tool_schema()
+            for tool_name in self.permitted_tool_name_list
+            if oxy_request.has_oxy(tool_name)
+        ]
+
+    def _parse_native_tool_calls(self, tool_calls: list, content: str) -> LLMResponse:
+        """Convert the ``tool_calls`` returned by the LLM into tool call dicts."""
+        tool_call_dict_list = []
+        for tool_call in tool_calls:
+            function = tool_call.get("function") or {}
+            try:
+                arguments = json.loads(function.get("arguments") or "{}")
+            except json.JSONDecodeError:
+                return LLMResponse(
+                    state=LLMState.ERROR_PARSE,
+                    output=f"The arguments of tool {function.get('name')} are not valid JSON, please call it again.",
+                    ori_response=content or json.dumps(tool_calls, ensure_ascii=False),
+                )
+            tool_call_dict_list.append(
+                {
+                    "tool_name": function.get("name"),
+                    "arguments": arguments,
+                    "tool_call_id": tool_call.get("id") or f"call_{generate_uuid()}",
+                }
+            )
+        return LLMResponse(
+            state=LLMState.TOOL_CALL,
+            output=tool_call_dict_list,
+            ori_response=content or "",
+        )
+
+    @staticmethod
+    def _build_tool_call_messages(
+        llm_response: LLMResponse, tool_call_dict_list: list, observation: Observation
+    ) -> list[Message]:
+        """Assistant ``tool_calls`` message followed by one tool message per call."""
+        messages = [
+            Message(
+                role="assistant",
+                content=llm_response.ori_response,
+                tool_calls=[
+                    ToolCall(
+                        id=tool_call_dict["tool_call_id"],
+                        function=Function(
+                            name=tool_call_dict["tool_name"],
+                            arguments=json.dumps(
+                                tool_call_dict["arguments"], ensure_ascii=False
+                            ),
+                        ),
+                    )
+                    for tool_call_dict in tool_call_dict_list
+                ],
+            )
+        ]
+        for tool_call_dict, exec_result in zip(
+            tool_call_dict_list, observation.exec_results
+        ):
+            messages.append(
+                Message.tool_message(
+                    Observation(exec_results=[exec_result]).to_str(),
+                    name=tool_call_dict["tool_name"],
+                    tool_call_id=tool_call_dict["tool_call_id"],
+                )
+            )
+        return messages
+
+    def _call_tool(self, oxy_request: OxyRequest, tool_call_dict: dict, parallel_id):
+        return oxy_request.call(
+            callee=tool_call_dict.get("tool_name") or tool_call_dict.get("name"), # 兼容 name 字段
+            arguments=tool_call_dict.get("arguments", {}), # 兼容 arguments 缺失
+            parallel_id=parallel_id,
+        )
+
+    @staticmethod
+    def _get_tool_call_key(tool_call_dict: dict) -> str:
+        return json.dumps(
+            [
+                tool_call_dict.get("tool_name") or tool_call_dict.get("name"),
+                tool_call_dict.get("arguments", {}),
+            ],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+
+    def _get_stream_listener(
+        self, oxy_request: OxyRequest, parallel_id: str, early_calls: dict
+    ) -> Callable[[str], None]:
+        """Build a listener starting tool calls as soon as they have streamed in.
+
+        The started calls are collected in *early_calls* by tool call key, to
+        be adopted or cancelled once the complete LLM output is parsed. Tools
+        without a ``cache_policy`` are not known to be idempotent, they wait
+        for the complete output.
+        """
+        parser = JSONStreamParser()
+        scope = oxy_request.get_cancel_scope()
+
+        def func_stream_listener(delta: str):
+            for tool_call_dict in parser.feed(delta):
+                if "tool_name" not in tool_call_dict:
+                    continue
+                tool = self.mas.oxy_name_to_oxy.get(tool_call_dict["tool_name"])
+                if not getattr(tool, "cache_policy", None):
+                    continue
+                task = scope.spawn(
+                    self._call_tool(oxy_request, tool_call_dict, parallel_id)
+                )
+                key = self._get_tool_call_key(tool_call_dict)
+                early_calls.setdefault(key, []).append(task)
+
+        return func_stream_listener
+
+    def _adopt_early_calls(self, tool_call_dict_list: list, early_calls: dict) -> list:
+        """Match the parsed tool calls with the calls started while streaming.
+
+        Started calls the final parse does not confirm are cancelled.
+
+        Returns:
+            list: The started task of each tool call, or None if there is none.
+        """
+        adopted_tasks = []
+        for tool_call_dict in tool_call_dict_list:
+            tasks = early_calls.get(self._get_tool_call_key(tool_call_dict))
+            adopted_tasks.append(tasks.pop(0) if tasks else None)
+        for tasks in early_calls.values():
+            for task in tasks:
+                task.cancel()
+        early_calls.clear()
+        return adopted_tasks
+
+    @staticmethod
+    async def _await_task(task: asyncio.Task) -> OxyResponse:
+        return await task
+
+    def _update_round_seconds(self, seconds: float, alpha: float = 0.3):
+        if self._round_seconds is None:
+            self._round_seconds = seconds
+        else:
+            self._round_seconds = alpha * seconds + (1 - alpha) * self._round_seconds
+
+    @staticmethod
+    def _fit_tool_call_budget(
+        budget: Budget, tool_call_dict_list: list, adopted_tasks: list
+    ) -> tuple[list, list]:
+        """Drop the tool calls of a batch beyond the calls left in the budget."""
+        remaining = budget.get_remaining_tool_calls()
+        if remaining is None or len(tool_call_dict_list) <= remaining:
+            return tool_call_dict_list, adopted_tasks
+        for task in adopted_tasks[remaining:]:
+            if task:
+                task.cancel()
+        logger.info(
+            f"Tool call budget left for {remaining} of "
+            f"{len(tool_call_dict_list)} tool calls"
+        )
+        return tool_call_dict_list[:remaining], adopted_tasks[:remaining]
+
+    def _get_budget_stop_reason(self, budget: Optional[Budget]) -> Optional[str]:
+        """Why no new round should be started within the budget, if so."""
+        if budget is None:
+            return None
+        reason = budget.get_exceeded_reason()
+        if reason is None and self._round_seconds is not None:
+            remaining_seconds = budget.get_remaining_seconds()
+            # The round only helps if the fallback summary still fits after it
+            if (
+                remaining_seconds is not None
+                and remaining_seconds < 2 * self._round_seconds
+            ):
+                reason = f"{remaining_seconds:.1f}s left cannot fit another round"
+        return reason
+
+    @staticmethod
+    def _rank_sub_agents_by_keywords(query: str, agent_desc_dict: dict) -> list:
+        """Rank sub-agents by the IDF-weighted words they share with the query.
+
+        Words found in every description, like "agent", carry no weight, and
+        sub-agents sharing no weighted word with the query are left out.
+        """
+
+        def tokenize(text: str) -> set:
+            tokens = re.findall(r"[a-z0-9]+|[\u4e00-\u9fff]", text.lower())
+            return set(tokens) - STOP_WORDS
+
+        query_tokens = tokenize(query)
+        agent_tokens = {
+            name: tokenize(name.replace("_", " ") + " " + desc)
+            for name, desc in agent_desc_dict.items()
+        }
+        n = len(agent_tokens)
+        scores = {}
+        for name, tokens in agent_tokens.items():
+            score = 0.0
+            for token in query_tokens & tokens:
+                df = sum(token in other for other in agent_tokens.values())
+                score += math.log(n / df) if n > 1 else 1.0
+            if score > 0:
+                scores[name] = score
+        return sorted(scores, key=lambda name: -scores[name])
+
+    async def _rank_sub_agents(self, oxy_request: OxyRequest) -> list:
+        """Rank the sub-agents of the agent by how likely the query needs them."""
+        agent_desc_dict = {
+            name: oxy_request.get_oxy(name).desc
+            for name in self.sub_agents
+            if name != self.intent_understanding_agent
+            and name in self.speculative_agent_names
+            and oxy_request.has_oxy(name)
+        }
+        if not agent_desc_dict:
+            return []
+        query = oxy_request.get_query()
+        if not self.speculative_router_llm:
+            return self.func_rank_sub_agents(query, agent_desc_dict)
+
+        agents_description = "\n".join(
+            f"- {name}: {desc}" for name, desc in agent_desc_dict.items()
+        )
+        prompt = (
+            SPECULATIVE_ROUTER_PROMPT.strip()
+            .replace("${agents_description}", agents_description)
+            .replace("${top_k}", str(self.speculative_top_k))
+        )
+        oxy_response = await oxy_request.call(
+            callee=self.speculative_router_llm,
+            arguments={
+                "messages": [
+                    Message.system_message(prompt).to_dict(),
+                    Message.user_message(query).to_dict(),
+                ]
+            },
+        )
+        output = str(oxy_response.output or "")
+        if "</think>" in output:
+            output = output.split("</think>")[-1]
+        # Keep the names in the order the router listed them
+        return sorted(
+            [name for name in agent_desc_dict if name in output], key=output.find
+        )
+
+    async def _speculate(
+        self, oxy_request: OxyRequest, parallel_id: str, speculative_calls: dict
+    ):
+        """Start the top-k most likely sub-agents with the user query.
+
+        The started calls are collected in *speculative_calls* by sub-agent
+        name, with the arguments they were started with.
+        """
+        scope = oxy_request.get_cancel_scope()
+        ranked_names = await self._rank_sub_agents(oxy_request)
+        arguments = {"query": oxy_request.get_query()}
+        for name in ranked_names[: self.speculative_top_k]:
+            logger.info(
+                f"Speculatively calling {name}",
+                extra={
+                    "trace_id": oxy_request.current_trace_id,
+                    "node_id": oxy_request.node_id,
+                },
+            )
+            speculative_calls[name] = (
+                arguments,
+                scope.spawn(
+                    self._call_tool(
+                        oxy_request,
+                        {"tool_name": name, "arguments": arguments},
+                        parallel_id,
+                    )
+                ),
+            )
+
+    @staticmethod
+    def _adopt_speculative_calls(
+        tool_call_dict_list: list,
+        adopted_tasks: list,
+        speculation: Optional[asyncio.Task],
+        speculative_calls: dict,
+    ) -> list:
+        """Adopt the speculative sub-agent calls the master made with the same
+        arguments.
+
+        Calls the master did not make, or made with other arguments, and a
+        still running ranking, are cancelled.
+        """
+        if speculation is None:
+            return adopted_tasks
+        speculation.cancel()
+        adopted_tasks = list(adopted_tasks)
+        for i, tool_call_dict in enumerate(tool_call_dict_list):
+            name = tool_call_dict.get("tool_name")
+            if adopted_tasks[i] is None and name in speculative_calls:
+                arguments, task = speculative_calls[name]
+                if tool_call_dict.get("arguments", {}) == arguments:
+                    adopted_tasks[i] = task
+                    del speculative_calls[name]
+        for _, task in speculative_calls.values():
+            task.cancel()
+        speculative_calls.clear()
+        return adopted_tasks
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the ReAct reasoning and acting loop.
 
@@ -306,28 +680,73 @@ class ReActAgent(LocalAgent):
             OxyResponse: Final response with answer and ReAct memory trace.
         """
         react_memory = Memory()
+        # Render instruction + short memory + query once, rounds only append
+        # their ReAct messages to this stable prefix
+        conversation = ConversationBuilder.from_messages(
+            [Message.system_message(self._build_instruction(oxy_request.arguments))]
+            + Message.dict_list_to_messages(oxy_request.get_short_memory())
+            + [Message.user_message(oxy_request.get_query())]
+        )
+        llm_tools = (
+            self._get_llm_tools(oxy_request) if self.is_native_tool_call else []
+        )
+        speculation = None
+        speculative_calls = {}
+        budget = Budget.from_request(oxy_request)
+        budget_stop_reason = None
         for current_round in range(self.max_react_rounds + 1):
-            # Build complete message context: instruction + short memory + query + react memory
-            temp_memory = Memory()
-            temp_memory.add_message(
-                Message.system_message(self._build_instruction(oxy_request.arguments))
-            )
-            temp_memory.add_messages(
-                Message.dict_list_to_messages(oxy_request.get_short_memory())
-            )
-            # Add current query and ReAct history
-            temp_memory.add_message(Message.user_message(oxy_request.get_query()))
-            temp_memory.add_messages(react_memory.messages)
-
-            full_memory = temp_memory.to_dict_list()
+            budget_stop_reason = self._get_budget_stop_reason(budget)
+            if budget_stop_reason:
+                logger.info(
+                    f"Stopping the ReAct loop early: {budget_stop_reason}",
+                    extra={
+                        "trace_id": oxy_request.current_trace_id,
+                        "node_id": oxy_request.node_id,
+                    },
+                )
+                break
+            full_memory = conversation.to_dict_list()
+            parallel_id = generate_uuid()
+            early_calls = {}
+            if (
+                current_round == 0
+                and self.speculative_top_k > 0
+                and self.speculative_agent_names
+            ):
+                # Routing overlaps with the first reasoning round of the master
+                speculation = oxy_request.get_cancel_scope().spawn(
+                    self._speculate(oxy_request, parallel_id, speculative_calls)
+                )
+            llm_arguments = {"messages": full_memory}
+            if llm_tools:
+                llm_arguments["tools"] = llm_tools
+            start_time = time.time()
             oxy_response = await oxy_request.call(
                 callee=self.llm_model,
-                arguments={"messages": full_memory},
+                arguments=llm_arguments,
+                func_stream_listener=(
+                    self._get_stream_listener(oxy_request, parallel_id, early_calls)
+                    if self.is_stream_tool_call and not llm_tools
+                    else None
+                ),
             )
+            self._update_round_seconds(time.time() - start_time)
             oxy_request.arguments["full_memory"] = full_memory
-            llm_response = self.func_parse_llm_response(
-                oxy_response.output, oxy_request
+            native_tool_calls = (
+                oxy_response.extra.get("tool_calls") if llm_tools else None
             )
+            if native_tool_calls:
+                llm_response = self._parse_native_tool_calls(
+                    native_tool_calls, oxy_response.output
+                )
+            else:
+                llm_response = self.func_parse_llm_response(
+                    oxy_response.output, oxy_request
+                )
+            if llm_response.state is not LLMState.TOOL_CALL:
+                self._adopt_early_calls([], early_calls)
+                self._adopt_speculative_calls([], [], speculation, speculative_calls)
+                speculation = None
 
             # Execute based on LLM decision
             if llm_response.state is LLMState.ANSWER:
@@ -347,15 +766,30 @@ class ReActAgent(LocalAgent):
                         f"Invalid tool call output type: {type(llm_response.output)}"
                     )
 
-                parallel_id = generate_uuid()
-                oxy_responses = await asyncio.gather(
+                adopted_tasks = self._adopt_early_calls(
+                    tool_call_dict_list, early_calls
+                )
+                adopted_tasks = self._adopt_speculative_calls(
+                    tool_call_dict_list, adopted_tasks, speculation, speculative_calls
+                )
+                speculation = None
+                if budget:
+                    tool_call_dict_list, adopted_tasks = self._fit_tool_call_budget(
+                        budget, tool_call_dict_list, adopted_tasks
+                    )
+                    if not tool_call_dict_list:
+                        # Sub-agents spent the rest while the LLM was reasoning
+                        budget_stop_reason = budget.get_exceeded_reason()
+                        break
+                    budget.add_tool_calls(len(tool_call_dict_list))
+                oxy_responses = await oxy_request.gather(
                     *[
-                        oxy_request.call(
-                            callee=tool_call_dict.get("tool_name") or tool_call_dict.get("name"), # 兼容 name 字段
-                            arguments=tool_call_dict.get("arguments", {}), # 兼容 arguments 缺失
-                            parallel_id=parallel_id,
+                        self._await_task(task)
+                        if task
+                        else self._call_tool(oxy_request, tool_call_dict, parallel_id)
+                        for tool_call_dict, task in zip(
+                            tool_call_dict_list, adopted_tasks
                         )
-                        for tool_call_dict in tool_call_dict_list
                     ]
                 )
 
@@ -385,10 +819,35 @@ class ReActAgent(LocalAgent):
                         )
 
                 # Add to ReAct memory for next iteration
-                react_memory.add_message(
-                    Message.assistant_message(llm_response.ori_response)
-                )
-                react_memory.add_message(Message.user_message(observation.to_str()))
+                if native_tool_calls:
+                    # The stored ReAct memory keeps its text form of query-answer pairs
+                    called_tools = json.dumps(
+                        [
+                            {"tool_name": d["tool_name"], "arguments": d["arguments"]}
+                            for d in tool_call_dict_list
+                        ],
+                        ensure_ascii=False,
+                    )
+                    react_memory.add_messages(
+                        [
+                            Message.assistant_message(
+                                f"{llm_response.ori_response}\n{called_tools}".strip()
+                            ),
+                            Message.user_message(observation.to_str()),
+                        ]
+                    )
+                    conversation.add_messages(
+                        self._build_tool_call_messages(
+                            llm_response, tool_call_dict_list, observation
+                        )
+                    )
+                else:
+                    round_messages = [
+                        Message.assistant_message(llm_response.ori_response),
+                        Message.user_message(observation.to_str()),
+                    ]
+                    react_memory.add_messages(round_messages)
+                    conversation.add_messages(round_messages)
             else:
                 # Parsing error - add to memory for correction
                 logger.info(
@@ -398,10 +857,12 @@ class ReActAgent(LocalAgent):
                         "node_id": oxy_request.node_id,
                     },
                 )
-                react_memory.add_message(
-                    Message.assistant_message(llm_response.ori_response)
-                )
-                react_memory.add_message(Message.user_message(llm_response.output))
+                round_messages = [
+                    Message.assistant_message(llm_response.ori_response),
+                    Message.user_message(llm_response.output),
+                ]
+                react_memory.add_messages(round_messages)
+                conversation.add_messages(round_messages)
 
         # Fallback mechanism when max rounds reached
         # Extract tool call results for final summary
@@ -429,8 +890,11 @@ class ReActAgent(LocalAgent):
             arguments={"messages": [msg.to_dict() for msg in temp_messages]},
         )
 
+        extra = {"react_memory": react_memory.to_dict_list()}
+        if budget_stop_reason:
+            extra["budget_stop_reason"] = budget_stop_reason
         return OxyResponse(
             state=OxyState.COMPLETED,
             output=oxy_response.output,
-            extra={"react_memory": react_memory.to_dict_list()},
+            extra=extra,
         )
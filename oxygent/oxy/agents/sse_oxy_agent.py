@@ -19,6 +19,8 @@ class SSEOxyGent(RemoteAgent):
 
     async def init(self):
         await super().init()
+        if self.org:  # Restored from a MAS snapshot
+            return
 
         async with httpx.AsyncClient() as client:
             response = await client.get(build_url(self.server_url, "/get_organization"))
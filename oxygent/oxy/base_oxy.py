@@ -9,14 +9,17 @@ import asyncio
 import inspect
 import json
 import logging
+import time
 import traceback
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
 from typing import Any, Callable, Optional
 
 from pydantic import BaseModel, Field
 
 # from ..mas import MAS
 from ..config import Config
+from ..limiters import AdaptiveLimiter, get_backoff_delay
 from ..schemas import OxyRequest, OxyResponse, OxyState
 from ..utils.common_utils import (
     filter_json_types,
@@ -51,6 +54,17 @@ def ensure_async(func: Callable) -> Callable:
     return async_wrapper
 
 
+# Python annotations used by FunctionTool schemas mapped to JSON Schema types
+JSON_SCHEMA_TYPES = {
+    "str": "string",
+    "int": "integer",
+    "float": "number",
+    "bool": "boolean",
+    "list": "array",
+    "dict": "object",
+}
+
+
 async def default_async_identity(x):
     """Default async identity function that returns input unchanged."""
     return x
@@ -70,8 +84,11 @@ class Oxy(BaseModel, ABC):
         category (str): Category classification (tool, agent, etc.).
         is_permission_required (bool): Whether permission is needed for execution.
         semaphore (int): Maximum number of concurrent executions.
+        is_adaptive_semaphore (bool): Whether to adapt the concurrency limit
+            between min_semaphore and semaphore from latency and errors.
         timeout (float): Execution timeout in seconds.
         retries (int): Number of retry attempts on failure.
+        delay (float): Base delay of the exponential retry backoff.
     """
 
     name: str = Field(..., description="Identifier for the agent.")
@@ -148,13 +165,24 @@ class Oxy(BaseModel, ABC):
         None, description="User-friendly error message"
     )
     semaphore: int = Field(16, description="Concurrency limit")
+    is_adaptive_semaphore: bool = Field(
+        False, description="Whether to adapt the concurrency limit at runtime"
+    )
+    min_semaphore: int = Field(1, description="Lower bound of the adaptive limit")
     timeout: float = Field(3600, description="Timeout in seconds.")
     retries: int = Field(2)
-    delay: float = Field(1.0)
+    delay: float = Field(1.0, description="Base delay of the retry backoff")
+    max_delay: float = Field(30.0, description="Maximum delay of the retry backoff")
+    backoff_factor: float = Field(2.0, description="Growth factor of the backoff")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._semaphore: asyncio.Semaphore = asyncio.Semaphore(self.semaphore)
+        self._adaptive_limiter: Optional[AdaptiveLimiter] = (
+            AdaptiveLimiter(self.semaphore, min_limit=self.min_semaphore)
+            if self.is_adaptive_semaphore
+            else None
+        )
         self._ensure_async_functions()
         self._set_desc_for_llm()
 
@@ -217,9 +245,95 @@ class Oxy(BaseModel, ABC):
             {chr(10).join(args_desc)}
             """
 
+    def get_llm_tool_schema(self) -> dict:
+        """Describe this oxy as an OpenAI function-calling tool."""
+        properties = {}
+        for param_name, param_info in self.input_schema.get("properties", {}).items():
+            if param_info.get("description", "No description") == "SystemArg":
+                continue
+            param_schema = {k: v for k, v in param_info.items() if k != "type"}
+            param_type = param_info.get("type") or "string"
+            param_type = JSON_SCHEMA_TYPES.get(param_type, param_type)
+            # Unknown annotations (e.g. Optional[int]) accept any type
+            if param_type in JSON_SCHEMA_TYPES.values() or param_type == "null":
+                param_schema["type"] = param_type
+            properties[param_name] = param_schema
+        return {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.desc,
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": [
+                        param_name
+                        for param_name in self.input_schema.get("required", [])
+                        if param_name in properties
+                    ],
+                },
+            },
+        }
+
     async def init(self):
         self._set_desc_for_llm()
 
+    @asynccontextmanager
+    async def _concurrency_slot(self, oxy_request: OxyRequest):
+        """Occupy an execution slot of this oxy.
+
+        With a MAS scheduler the wait joins its fair queueing policy,
+        otherwise the local semaphore is used.
+        """
+        scheduler = getattr(self.mas, "scheduler", None) if self.mas else None
+        if scheduler is not None:
+            async with scheduler.slot(
+                self.name, self.get_concurrency_limit(), oxy_request
+            ):
+                yield
+        elif self._adaptive_limiter:
+            async with self._adaptive_limiter.slot():
+                yield
+        else:
+            async with self._semaphore:
+                yield
+
+    @asynccontextmanager
+    async def _root_scope(self, oxy_request: OxyRequest):
+        """Drop the cancel scope of the trace once its root request ends.
+
+        Calls made on behalf of the request, e.g. by ``OxyRequest.gather``,
+        create the scope wherever the request entered the MAS, through
+        ``MAS.chat_with_agent``, ``MAS.call`` or a direct ``execute``.
+        """
+        try:
+            yield
+        finally:
+            cancel_scopes = getattr(self.mas, "cancel_scopes", None)
+            if oxy_request.caller_category == "user" and cancel_scopes is not None:
+                cancel_scopes.pop(oxy_request.current_trace_id, None)
+
+    def set_concurrency_limit(self, limit: int):
+        """Replace the number of concurrent executions allowed."""
+        self.semaphore = limit
+        self._semaphore = asyncio.Semaphore(limit)
+        if self._adaptive_limiter:
+            self._adaptive_limiter = AdaptiveLimiter(
+                limit, min_limit=self.min_semaphore
+            )
+
+    def get_concurrency_limit(self) -> int:
+        """Return the current number of concurrent executions allowed."""
+        if self._adaptive_limiter:
+            return self._adaptive_limiter.current
+        return self.semaphore
+
+    def _get_retry_delay(self, attempt: int, e: Exception) -> float:
+        """Exponential backoff with jitter, honoring a server Retry-After."""
+        return get_backoff_delay(
+            attempt, self.delay, self.max_delay, self.backoff_factor, e
+        )
+
     async def _pre_process(self, oxy_request: OxyRequest) -> OxyRequest:
         """Pre-process the request before execution."""
         # Initialize the parameters
@@ -526,6 +640,12 @@ class Oxy(BaseModel, ABC):
                 }
             )
 
+    async def _run_execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Run one execution attempt with the custom or built-in executor."""
+        if self.func_execute:
+            return await self.func_execute(oxy_request)
+        return await self._execute(oxy_request)
+
     async def execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the complete lifecycle of an Oxy operation.
 
@@ -547,7 +667,7 @@ class Oxy(BaseModel, ABC):
         - Output formatting
         - Post-send message handling
         """
-        async with self._semaphore:
+        async with self._root_scope(oxy_request), self._concurrency_slot(oxy_request):
             # Pre-process
             oxy_request = await self._pre_process(oxy_request)
             await self._pre_log(oxy_request)
@@ -600,10 +720,10 @@ class Oxy(BaseModel, ABC):
                                 output=error_message,
                             )
                             break
-                    if self.func_execute:
-                        oxy_response = await self.func_execute(oxy_request)
-                    else:
-                        oxy_response = await self._execute(oxy_request)
+                    start_time = time.time()
+                    oxy_response = await self._run_execute(oxy_request)
+                    if self._adaptive_limiter:
+                        self._adaptive_limiter.on_success(time.time() - start_time)
                     break
                 except asyncio.CancelledError:
                     # if the task is cancelled, log and return a canceled response
@@ -619,11 +739,18 @@ class Oxy(BaseModel, ABC):
                         output=f"Tool {self.name} was cancelled",
                     )
                     oxy_response.oxy_request = oxy_request
-                    asyncio.create_task(self._post_save_data(oxy_response))
+                    # Keep a reference so that the record survives the cancellation
+                    task = asyncio.create_task(self._post_save_data(oxy_response))
+                    background_tasks = getattr(self.mas, "background_tasks", None)
+                    if background_tasks is not None:
+                        background_tasks.add(task)
+                        task.add_done_callback(background_tasks.discard)
                     raise
                 except Exception as e:
                     # Handle exceptions and retry logic
                     await self._handle_exception(e)
+                    if self._adaptive_limiter:
+                        self._adaptive_limiter.on_error(e)
                     attempt += 1
                     logger.warning(
                         f"Error executing oxy {self.name}: {str(e)}. Attempt {attempt} of {self.retries}.",
@@ -640,7 +767,7 @@ class Oxy(BaseModel, ABC):
                         },
                     )
                     if attempt < self.retries:
-                        await asyncio.sleep(self.delay)
+                        await asyncio.sleep(self._get_retry_delay(attempt, e))
                     else:
                         error_msg = traceback.format_exc()
                         logger.error(
@@ -5,9 +5,12 @@ tools in the OxyGent system. Tools are specialized Oxy instances that typically
 permissions and have shorter timeout periods.
 """
 
+from typing import Optional
+
 from pydantic import Field
 
-from ..schemas import OxyRequest, OxyResponse
+from ..schemas import OxyRequest, OxyResponse, OxyState
+from ..tool_cache import ToolCachePolicy, get_tool_result_cache
 from .base_oxy import Oxy
 
 
@@ -19,6 +22,8 @@ class BaseTool(Oxy):
             this tool. Defaults to True for security.
         category (str): Tool category identifier. Always "tool".
         timeout (float): Execution timeout in seconds. Defaults to 60 seconds.
+        cache_policy (ToolCachePolicy | None): Memoization policy of the tool
+            results, None disables caching.
     """
 
     is_permission_required: bool = Field(
@@ -26,6 +31,46 @@ class BaseTool(Oxy):
     )
     category: str = Field("tool", description="Tool category identifier")
     timeout: float = Field(60, description="Timeout in seconds.")
+    cache_policy: Optional[ToolCachePolicy] = Field(
+        None, description="Memoization policy of deterministic tool results"
+    )
+
+    async def _run_execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Serve completed results from the tool cache when a policy is set.
+
+        A hit skips the execution but still goes through the lifecycle of
+        ``execute``, so a lightweight node is recorded for the call.
+        """
+        if not self.cache_policy:
+            return await super()._run_execute(oxy_request)
+        cache = get_tool_result_cache()
+        key = self.cache_policy.get_key(self.name, oxy_request.arguments)
+        redis_client = None
+        prefix = "oxygent"
+        if self.cache_policy.is_shared and self.mas:
+            redis_client = getattr(self.mas, "redis_client", None)
+            if not hasattr(redis_client, "get"):
+                redis_client = None  # LocalRedis only implements lists
+            prefix = self.mas.message_prefix
+        cached = await cache.get(key, redis_client, prefix)
+        if cached is not None:
+            output, extra = cached
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output=output,
+                extra={**extra, "is_cached": True},
+            )
+        oxy_response = await super()._run_execute(oxy_request)
+        if oxy_response.state is OxyState.COMPLETED:
+            await cache.set(
+                key,
+                oxy_response.output,
+                oxy_response.extra,
+                self.cache_policy.ttl,
+                redis_client,
+                prefix,
+            )
+        return oxy_response
 
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         raise NotImplementedError("This method is not yet implemented")
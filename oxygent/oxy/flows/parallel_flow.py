@@ -4,14 +4,32 @@ This module provides the ParallelFlow class, which orchestrates concurrent execu
 multiple tools or agents and aggregates their results into a unified response.
 """
 
-import asyncio
+from contextlib import aclosing
+from typing import Optional
+
+from pydantic import Field
 
 from ...schemas import OxyRequest, OxyResponse, OxyState
 from ..base_flow import BaseFlow
 
 
 class ParallelFlow(BaseFlow):
-    """Flow that executes multiple tools or agents concurrently."""
+    """Flow that executes multiple tools or agents concurrently.
+
+    Attributes:
+        quorum (int | None): Number of completed results after which the
+            remaining executions are cancelled, None waits for all of them.
+        deadline (float | None): Seconds after which unfinished executions are
+            cancelled and the results received so far are returned, FAILED
+            if none finished.
+    """
+
+    quorum: Optional[int] = Field(
+        None, description="Completed results needed before cancelling the rest"
+    )
+    deadline: Optional[float] = Field(
+        None, description="Seconds after which unfinished executions are cancelled"
+    )
 
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the request concurrently across all permitted tools.
@@ -20,19 +38,34 @@ class ParallelFlow(BaseFlow):
         simultaneously and aggregates their outputs into a unified response.
         """
         # Execute the same request concurrently across all permitted tools
-        oxy_responses = await asyncio.gather(
-            *[
-                oxy_request.call(
-                    callee=permitted_tool_name, arguments=oxy_request.arguments
-                )
-                for permitted_tool_name in self.permitted_tool_name_list
-            ]
-        )
+        calls = [
+            oxy_request.call(
+                callee=permitted_tool_name, arguments=oxy_request.arguments
+            )
+            for permitted_tool_name in self.permitted_tool_name_list
+        ]
+        outputs = {}
+        completed_count = 0
+        async with aclosing(
+            oxy_request.as_completed(*calls, timeout=self.deadline)
+        ) as results:
+            async for i, res in results:
+                outputs[i] = res.output
+                if res.state is OxyState.COMPLETED:
+                    completed_count += 1
+                if self.quorum and completed_count >= self.quorum:
+                    break
 
+        if calls and not outputs:
+            # The deadline passed before any execution finished
+            return OxyResponse(
+                state=OxyState.FAILED,
+                output=f"No execution finished within {self.deadline} seconds",
+            )
         # Aggregate all outputs into a single response
         oxy_response = OxyResponse(
             state=OxyState.COMPLETED,
             output="The following are the results from multiple executions:"
-            + "\n".join([res.output for res in oxy_responses]),
+            + "\n".join([str(outputs[i]) for i in sorted(outputs)]),
         )
         return oxy_response
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Callable, List, Optional, Union
 
@@ -18,6 +19,27 @@ class Plan(BaseModel):
     )
 
 
+class PlanStep(BaseModel):
+    """One step of a plan and the steps it depends on."""
+
+    id: int = Field(description="unique id of the step")
+    task: str = Field(description="the step to follow")
+    depends_on: List[int] = Field(
+        default_factory=list,
+        description="ids of the steps whose results this step needs, "
+        "empty if it can be executed right away",
+    )
+
+
+class DAGPlan(BaseModel):
+    """Plan to follow in future, as a graph of dependent steps."""
+
+    steps: List[PlanStep] = Field(
+        description="different steps to follow, independent steps are executed "
+        "concurrently"
+    )
+
+
 class Response(BaseModel):
     """Response to user."""
 
@@ -34,12 +56,25 @@ class Action(BaseModel):
 
 
 class PlanAndSolve(BaseFlow):
-    """Plan-and-Solve Prompting Workflow."""
+    """Plan-and-Solve Prompting Workflow.
+
+    With ``is_dag_plan`` the planner emits steps with ``depends_on`` ids, and
+    every step is executed as soon as its dependencies are done, up to
+    ``max_concurrent_steps`` at a time. Each step only receives the results of
+    its own dependencies. The replanner is not used in this mode.
+    """
 
     max_replan_rounds: int = Field(30, description="Maximum retries for operations.")
 
     planner_agent_name: str = Field("planner_agent", description="planner agent name")
-    pre_plan_steps: List[str] = Field(None, description="pre plan steps")
+    pre_plan_steps: List[Union[str, dict]] = Field(
+        None, description="pre plan steps, dicts of PlanStep fields in DAG mode"
+    )
+
+    is_dag_plan: bool = Field(False, description="plan a DAG of dependent steps")
+    max_concurrent_steps: int = Field(
+        4, description="maximum steps executed concurrently in DAG mode"
+    )
 
     enable_replanner: bool = Field(False, description="enable replanner")
 
@@ -70,6 +105,9 @@ class PlanAndSolve(BaseFlow):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+        if self.is_dag_plan and "pydantic_parser_planner" not in kwargs:
+            self.pydantic_parser_planner = PydanticOutputParser(output_cls=DAGPlan)
+
         self.add_permitted_tools(
             [
                 self.planner_agent_name,
@@ -77,30 +115,143 @@ class PlanAndSolve(BaseFlow):
             ]
         )
 
+    async def _call_planner(self, oxy_request: OxyRequest, original_query: str):
+        if self.pydantic_parser_planner:
+            query = self.pydantic_parser_planner.format(original_query)
+        else:
+            query = original_query.copy()
+
+        oxy_response = await oxy_request.call(
+            callee=self.planner_agent_name,
+            arguments={"query": query},
+        )
+        if self.pydantic_parser_planner:
+            return self.pydantic_parser_planner.parse(oxy_response.output)
+        else:
+            return self.func_parse_planner_response(oxy_response.output)
+
+    @staticmethod
+    def _to_dag_steps(steps: list) -> List[PlanStep]:
+        """Normalize plan steps into a valid DAG.
+
+        Plain strings become a chain of steps each depending on the previous
+        one. Unknown dependency ids are dropped, and a plan with duplicate
+        step ids or a cycle falls back to executing its steps in the listed
+        order.
+        """
+        dag_steps = []
+        for i, step in enumerate(steps):
+            if isinstance(step, str):
+                step = PlanStep(id=i + 1, task=step, depends_on=[i] if i > 0 else [])
+            elif isinstance(step, dict):
+                step = PlanStep.model_validate(step)
+            dag_steps.append(step)
+
+        step_ids = {step.id for step in dag_steps}
+        if len(step_ids) < len(dag_steps):
+            # Dependencies on a duplicate id are ambiguous, renumber as a chain
+            logger.warning("Plan has duplicate step ids, executing in order")
+            return [
+                step.model_copy(
+                    update={"id": i + 1, "depends_on": [i] if i > 0 else []}
+                )
+                for i, step in enumerate(dag_steps)
+            ]
+        for step in dag_steps:
+            unknown_ids = set(step.depends_on) - step_ids
+            if unknown_ids:
+                logger.warning(f"Step {step.id} depends on unknown steps {unknown_ids}")
+                step.depends_on = [i for i in step.depends_on if i in step_ids]
+
+        # Kahn's algorithm, every step must eventually become ready
+        done_ids = set()
+        while len(done_ids) < len(dag_steps):
+            ready_ids = {
+                step.id
+                for step in dag_steps
+                if step.id not in done_ids and set(step.depends_on) <= done_ids
+            }
+            if not ready_ids:
+                logger.warning("Plan has a dependency cycle, executing in order")
+                for i, step in enumerate(dag_steps):
+                    step.depends_on = [dag_steps[i - 1].id] if i > 0 else []
+                break
+            done_ids |= ready_ids
+        return dag_steps
+
+    async def _execute_dag(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Execute the plan steps concurrently in dependency order."""
+        original_query = oxy_request.get_query()
+        if self.pre_plan_steps is None:
+            plan_response = await self._call_planner(oxy_request, original_query)
+            plan_steps = plan_response.steps
+        else:
+            plan_steps = self.pre_plan_steps
+        dag_steps = self._to_dag_steps(plan_steps)
+        id_to_step = {step.id: step for step in dag_steps}
+        step_outputs = {}
+        semaphore = asyncio.Semaphore(self.max_concurrent_steps)
+
+        async def execute_step(step: PlanStep):
+            past_steps = "\n".join(
+                f"task:{id_to_step[i].task}, execute task result:{step_outputs[i]}"
+                for i in step.depends_on
+            )
+            task_formatted = f"""
+                We have finished the following steps: {past_steps}
+                The current step to execute is:{step.task}
+                You should only execute the current step, and do not execute other steps in our plan.
+            """.strip()
+            async with semaphore:
+                return await oxy_request.call(
+                    callee=self.executor_agent_name,
+                    arguments={"query": task_formatted},
+                )
+
+        scope = oxy_request.get_cancel_scope()
+        pending_steps = list(dag_steps)
+        running = {}
+        try:
+            while pending_steps or running:
+                for step in list(pending_steps):
+                    if all(i in step_outputs for i in step.depends_on):
+                        pending_steps.remove(step)
+                        running[scope.spawn(execute_step(step))] = step
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    step = running.pop(task)
+                    step_outputs[step.id] = task.result().output
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+
+        # The result of the plan is the result of the steps nothing depends on
+        dependency_ids = {i for step in dag_steps for i in step.depends_on}
+        final_steps = [step for step in dag_steps if step.id not in dependency_ids]
+        if len(final_steps) == 1:
+            output = step_outputs[final_steps[0].id]
+        else:
+            output = "\n".join(
+                f"task:{step.task}, execute task result:{step_outputs[step.id]}"
+                for step in final_steps
+            )
+        return OxyResponse(state=OxyState.COMPLETED, output=output)
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        if self.is_dag_plan:
+            return await self._execute_dag(oxy_request)
+
         plan_str = ""
         past_steps = ""
         original_query = oxy_request.get_query()
         plan_steps = self.pre_plan_steps
         for current_round in range(self.max_replan_rounds + 1):
             if (current_round == 0) and (self.pre_plan_steps is None):
-                if self.pydantic_parser_planner:
-                    query = self.pydantic_parser_planner.format(original_query)
-                else:
-                    query = original_query.copy()
-
-                oxy_response = await oxy_request.call(
-                    callee=self.planner_agent_name,
-                    arguments={"query": query},
-                )
-                if self.pydantic_parser_planner:
-                    plan_response = self.pydantic_parser_planner.parse(
-                        oxy_response.output
-                    )
-                else:
-                    plan_response = self.func_parse_planner_response(
-                        oxy_response.output
-                    )
+                plan_response = await self._call_planner(oxy_request, original_query)
                 plan_steps = plan_response.steps
                 plan_str = "\n".join(
                     f"{i + 1}. {step}" for i, step in enumerate(plan_steps)
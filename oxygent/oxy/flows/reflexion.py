@@ -1,11 +1,15 @@
 """Reflexion Flow for OxyGent"""
 
+import json
 import logging
+from collections import OrderedDict
+from contextlib import aclosing
 from typing import Callable, Optional
 
 from pydantic import BaseModel, Field
 
 from ...schemas import Message, OxyRequest, OxyResponse, OxyState
+from ...utils.common_utils import get_md5
 from ...utils.llm_pydantic_parser import PydanticOutputParser
 from ..base_flow import BaseFlow
 
@@ -23,12 +27,26 @@ class ReflectionEvaluation(BaseModel):
 
 
 class Reflexion(BaseFlow):
-    """Reflexion Flow for iterative answer improvement."""
+    """Reflexion Flow for iterative answer improvement.
+
+    With ``num_candidates`` > 1 every round generates that many worker answers
+    concurrently, each evaluated as soon as it is ready, and the round stops
+    at the first satisfactory one. Verdicts are cached by question and answer,
+    so a repeated answer is not evaluated again.
+    """
 
     max_reflexion_rounds: int = Field(3, description="Maximum reflexion iterations")
 
     worker_agent: str = Field("worker_agent", description="Worker agent name")
     reflexion_agent: str = Field("reflexion_agent", description="Reflexion agent name")
+    llm_model: str = Field("default_llm", description="LLM model name for fallback")
+
+    num_candidates: int = Field(
+        1, description="Worker answers generated concurrently per round"
+    )
+    evaluation_cache_size: int = Field(
+        1024, description="Cached evaluator verdicts, 0 disables the cache"
+    )
 
     # Custom parsing functions
     func_parse_worker_response: Optional[Callable[[str], str]] = (
@@ -96,6 +114,8 @@ Previous answer: {previous_answer}""",
         if self.func_parse_reflexion_response is None:
             self.func_parse_reflexion_response = self._default_parse_reflexion_response
 
+        self._evaluation_cache: OrderedDict[str, ReflectionEvaluation] = OrderedDict()
+
     def _default_parse_worker_response(self, response: str) -> str:
         """Default worker response parser - just return the response."""
         return response.strip()
@@ -136,6 +156,53 @@ Previous answer: {previous_answer}""",
             improvement_suggestions=improvement_suggestions,
         )
 
+    async def _evaluate(
+        self, oxy_request: OxyRequest, original_query: str, answer: str
+    ) -> ReflectionEvaluation:
+        """Evaluate an answer with the reflexion agent, or from the verdict cache."""
+        cache_key = get_md5(json.dumps([original_query, answer], ensure_ascii=False))
+        if cache_key in self._evaluation_cache:
+            self._evaluation_cache.move_to_end(cache_key)
+            logger.info("Evaluation result served from cache")
+            return self._evaluation_cache[cache_key]
+
+        evaluation_query = self.evaluation_template.format(
+            query=original_query, answer=answer
+        )
+
+        if self.pydantic_parser_reflexion:
+            evaluation_query = self.pydantic_parser_reflexion.format(evaluation_query)
+
+        reflexion_response = await oxy_request.call(
+            callee=self.reflexion_agent, arguments={"query": evaluation_query}
+        )
+
+        evaluation = self.func_parse_reflexion_response(reflexion_response.output)
+        # A failed evaluation says nothing about the answer, it is not kept
+        if (
+            self.evaluation_cache_size > 0
+            and reflexion_response.state is OxyState.COMPLETED
+        ):
+            self._evaluation_cache[cache_key] = evaluation
+            while len(self._evaluation_cache) > self.evaluation_cache_size:
+                self._evaluation_cache.popitem(last=False)
+        return evaluation
+
+    async def _generate_candidate(
+        self, oxy_request: OxyRequest, original_query: str, current_query: str
+    ) -> tuple[str, ReflectionEvaluation]:
+        """Get an answer from the worker agent and evaluate it."""
+        worker_response = await oxy_request.call(
+            callee=self.worker_agent, arguments={"query": current_query}
+        )
+
+        answer = self.func_parse_worker_response(worker_response.output)
+        logger.info(f"Worker answer: {answer[:200]}...")
+
+        evaluation = await self._evaluate(oxy_request, original_query, answer)
+        logger.info(f"Evaluation result: {evaluation.is_satisfactory}")
+        return answer, evaluation
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute the reflexion flow."""
 
@@ -147,31 +214,34 @@ Previous answer: {previous_answer}""",
         for current_round in range(self.max_reflexion_rounds + 1):
             logger.info(f"Reflexion round {current_round + 1}")
 
-            # Step 1: Get answer from worker agent
-            worker_response = await oxy_request.call(
-                callee=self.worker_agent, arguments={"query": current_query}
-            )
-
-            current_answer = self.func_parse_worker_response(worker_response.output)
-            logger.info(f"Worker answer: {current_answer[:200]}...")
-
-            # Step 2: Evaluate with reflexion agent
-            evaluation_query = self.evaluation_template.format(
-                query=original_query, answer=current_answer
-            )
-
-            if self.pydantic_parser_reflexion:
-                evaluation_query = self.pydantic_parser_reflexion.format(
-                    evaluation_query
+            # Step 1 and 2: Get answers from the worker agent and evaluate them,
+            # the remaining candidates are cancelled once one is satisfactory
+            candidates = {}
+            async with aclosing(
+                oxy_request.as_completed(
+                    *[
+                        self._generate_candidate(
+                            oxy_request, original_query, current_query
+                        )
+                        for _ in range(max(1, self.num_candidates))
+                    ]
                 )
-
-            reflexion_response = await oxy_request.call(
-                callee=self.reflexion_agent, arguments={"query": evaluation_query}
+            ) as results:
+                async for i, (answer, evaluation) in results:
+                    candidates[i] = (answer, evaluation)
+                    if evaluation.is_satisfactory:
+                        break
+
+            # Keep the satisfactory candidate, else the first with suggestions
+            _, (current_answer, evaluation) = min(
+                candidates.items(),
+                key=lambda item: (
+                    not item[1][1].is_satisfactory,
+                    not item[1][1].improvement_suggestions,
+                    item[0],
+                ),
             )
 
-            evaluation = self.func_parse_reflexion_response(reflexion_response.output)
-            logger.info(f"Evaluation result: {evaluation.is_satisfactory}")
-
             # Step 3: Check if satisfactory
             if evaluation.is_satisfactory:
                 logger.info(f"Answer satisfactory after {current_round + 1} rounds")
@@ -8,9 +8,11 @@ It supports both synchronous and asynchronous functions with automatic conversio
 import asyncio
 import functools
 import concurrent.futures
+from typing import Optional
 
 from pydantic import Field
 
+from ...tool_cache import ToolCachePolicy
 from ..base_tool import BaseTool
 from .function_tool import FunctionTool
 
@@ -29,6 +31,11 @@ class FunctionHub(BaseTool):
     func_dict: dict = Field(
         default_factory=dict, description="Registry of functions and their metadata"
     )
+    func_cache_policies: dict = Field(
+        default_factory=dict,
+        exclude=True,
+        description="Cache policies of the registered functions",
+    )
 
     def __init__(self, **data):
         """Initialize the FunctionHub with thread pool support."""
@@ -50,17 +57,23 @@ class FunctionHub(BaseTool):
         instances and registers them with the MAS (Multi-Agent System).
         """
         await super().init()
-        params = self.model_dump(exclude={"func_dict", "name", "desc"})
+        params = self.model_dump(
+            exclude={"func_dict", "name", "desc", "cache_policy"}
+        )
 
         # Create FunctionTool instances for each registered function
         for tool_name, (tool_desc, tool_func) in self.func_dict.items():
             function_tool = FunctionTool(
-                name=tool_name, desc=tool_desc, func_process=tool_func, **params
+                name=tool_name,
+                desc=tool_desc,
+                func_process=tool_func,
+                cache_policy=self.func_cache_policies.get(tool_name, self.cache_policy),
+                **params,
             )
             function_tool.set_mas(self.mas)
             self.mas.add_oxy(function_tool)
 
-    def tool(self, description):
+    def tool(self, description, cache_policy: Optional[ToolCachePolicy] = None):
         """Decorator for registering functions as tools.
 
         This decorator automatically converts both synchronous and asynchronous
@@ -69,6 +82,8 @@ class FunctionHub(BaseTool):
 
         Args:
             description (str): Human-readable description of the tool's functionality.
+            cache_policy (ToolCachePolicy, optional): Memoization policy for
+                deterministic functions, defaults to the policy of the hub.
 
         Returns:
             Callable: Decorator function that registers and returns the async version
@@ -103,6 +118,8 @@ class FunctionHub(BaseTool):
 
             # Register function in the hub's dictionary
             self.func_dict[func.__name__] = (description, async_func)
+            if cache_policy:
+                self.func_cache_policies[func.__name__] = cache_policy
             return async_func  # Return the async version
 
         return decorator
@@ -1,9 +1,11 @@
 from .http_llm import HttpLLM
 from .mock_llm import MockLLM
 from .openai_llm import OpenAILLM
+from .router_llm import RouterLLM
 
 __all__ = [
     "HttpLLM",
     "OpenAILLM",
     "MockLLM",
+    "RouterLLM",
 ]
@@ -15,8 +15,10 @@ import aiofiles
 from pydantic import Field
 
 from ...config import Config
-from ...schemas import OxyRequest, OxyResponse
+from ...limiters import RateLimiter, get_rate_limiter
+from ...schemas import OxyRequest, OxyResponse, OxyState
 from ...utils.common_utils import (
+    estimate_tokens,
     extract_first_json,
     image_to_base64,
     parse_mixed_string,
@@ -45,6 +47,9 @@ class BaseLLM(Oxy):
         is_convert_url_to_base64: Whether to convert media URLs to base64.
         max_image_pixels: Maximum pixel count for image processing.
         max_video_size: Maximum size in bytes for video processing.
+        rpm_limit: Requests per minute allowed for the shared quota.
+        tpm_limit: Tokens per minute allowed for the shared quota.
+        rate_limit_key: Identifier of the quota shared by several LLMs.
     """
 
     category: str = Field("llm", description="")
@@ -81,18 +86,146 @@ class BaseLLM(Oxy):
     )
     is_disable_system_prompt: bool = Field(default=False)
 
+    rpm_limit: Optional[int] = Field(None, description="Requests per minute budget")
+    tpm_limit: Optional[int] = Field(None, description="Tokens per minute budget")
+    rate_limit_key: str = Field(
+        "", description="Quota identifier, defaults to base_url and model_name"
+    )
+
+    def _get_rate_limiter(self) -> Optional[RateLimiter]:
+        if not (self.rpm_limit or self.tpm_limit):
+            return None
+        key = self.rate_limit_key
+        if not key:
+            model_name = getattr(self, "model_name", "")
+            key = (
+                f"{getattr(self, 'base_url', '')}|{model_name}"
+                if model_name
+                else self.name
+            )
+        redis_client = self.mas.redis_client if self.mas else None
+        prefix = self.mas.message_prefix if self.mas else "oxygent"
+        return get_rate_limiter(
+            key, self.rpm_limit, self.tpm_limit, redis_client, prefix
+        )
+
+    @staticmethod
+    def _parse_usage(data: dict) -> dict:
+        """Normalize the token usage reported by OpenAI, Ollama or Gemini."""
+        if not isinstance(data, dict):
+            return {}
+        if isinstance(data.get("usage"), dict):
+            usage = data["usage"]
+            prompt_tokens = usage.get("prompt_tokens") or 0
+            completion_tokens = usage.get("completion_tokens") or 0
+        elif isinstance(data.get("usageMetadata"), dict):
+            usage = data["usageMetadata"]
+            prompt_tokens = usage.get("promptTokenCount") or 0
+            completion_tokens = usage.get("candidatesTokenCount") or 0
+        elif "prompt_eval_count" in data or "eval_count" in data:
+            prompt_tokens = data.get("prompt_eval_count") or 0
+            completion_tokens = data.get("eval_count") or 0
+        else:
+            return {}
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @staticmethod
+    def _merge_tool_call_deltas(tool_calls: list, deltas: Optional[list]) -> list:
+        """Accumulate OpenAI-style ``tool_calls`` (or streamed deltas of them).
+
+        Streamed deltas carry an ``index`` and fragments of the arguments string,
+        complete tool calls (non-stream responses, Ollama) are appended as is.
+        """
+        for delta in deltas or []:
+            index = delta.get("index")
+            if index is None:
+                index = len(tool_calls)
+            while len(tool_calls) <= index:
+                tool_calls.append(
+                    {
+                        "id": "",
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""},
+                    }
+                )
+            tool_call = tool_calls[index]
+            if delta.get("id"):
+                tool_call["id"] = delta["id"]
+            function = delta.get("function") or {}
+            if function.get("name"):
+                tool_call["function"]["name"] += function["name"]
+            arguments = function.get("arguments")
+            if isinstance(arguments, dict):
+                tool_call["function"]["arguments"] = json.dumps(
+                    arguments, ensure_ascii=False
+                )
+            elif arguments:
+                tool_call["function"]["arguments"] += arguments
+        return tool_calls
+
+    def _record_usage(self, oxy_request: OxyRequest, usage: dict):
+        """Accumulate usage for the current run and for the whole MAS."""
+        counters = [oxy_request.shared_data.setdefault("_llm_usage", {})]
+        if self.mas:
+            counters.append(self.mas.llm_usage.setdefault(self.name, {}))
+        for counter in counters:
+            counter["requests"] = counter.get("requests", 0) + 1
+            for key in ["prompt_tokens", "completion_tokens", "total_tokens"]:
+                counter[key] = counter.get(key, 0) + usage.get(key, 0)
+
+    async def _run_execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        """Draw on the RPM / TPM budget before each attempt, retries included."""
+        rate_limiter = self._get_rate_limiter()
+        if rate_limiter:
+            await rate_limiter.acquire(
+                estimate_tokens(oxy_request.arguments.get("messages", []))
+            )
+        return await super()._run_execute(oxy_request)
+
+    async def _after_execute(self, oxy_response: OxyResponse) -> OxyResponse:
+        oxy_response = await super()._after_execute(oxy_response)
+        if oxy_response.state is not OxyState.COMPLETED:
+            return oxy_response
+        oxy_request = oxy_response.oxy_request
+        prompt_estimate = estimate_tokens(oxy_request.arguments.get("messages", []))
+        usage = oxy_response.extra.get("usage")
+        if not usage:
+            completion_estimate = estimate_tokens(oxy_response.output)
+            usage = {
+                "prompt_tokens": prompt_estimate,
+                "completion_tokens": completion_estimate,
+                "total_tokens": prompt_estimate + completion_estimate,
+                "is_estimated": True,
+            }
+            oxy_response.extra["usage"] = usage
+        rate_limiter = self._get_rate_limiter()
+        if rate_limiter:
+            await rate_limiter.adjust(usage["total_tokens"] - prompt_estimate)
+        self._record_usage(oxy_request, usage)
+        return oxy_response
+
     async def _get_messages(self, oxy_request: OxyRequest):
         # merge system prompt
+        # The message dicts may be shared with the caller (e.g. the prompt prefix
+        # of a ReActAgent reused across rounds), so they are replaced, not mutated
         if (
             self.is_disable_system_prompt
             and oxy_request.arguments["messages"][0].get("role") == "system"
         ):
-            oxy_request.arguments["messages"][1]["content"] = (
-                oxy_request.arguments["messages"][0]["content"]
+            system_message, first_message, *rest_messages = oxy_request.arguments[
+                "messages"
+            ]
+            first_message = {
+                **first_message,
+                "content": system_message["content"]
                 + "\nUser Input: "
-                + oxy_request.arguments["messages"][1]["content"]
-            )
-            oxy_request.arguments["messages"] = oxy_request.arguments["messages"][1:]
+                + first_message["content"],
+            }
+            oxy_request.arguments["messages"] = [first_message, *rest_messages]
 
         # Preprocess messages for multimoding input
         if not self.is_multimodal_supported:
@@ -101,7 +234,7 @@ class BaseLLM(Oxy):
         messages_processed = copy.deepcopy(oxy_request.arguments["messages"])
         messages_temp = []
         for message in messages_processed:
-            role, content = message["role"], message["content"]
+            role, content = message["role"], message.get("content")
             if role == "user":
                 # 如果不是str类型则不做处理
                 if not isinstance(content, str):
@@ -151,7 +284,8 @@ class BaseLLM(Oxy):
                             )
                         else:
                             pass
-            messages_temp.append({"role": role, "content": content})
+            # Keep tool_calls / tool_call_id of function-calling messages
+            messages_temp.append({**message, "content": content})
         messages_processed = messages_temp
 
         # hold url
@@ -101,13 +101,22 @@ class HttpLLM(RemoteLLM):
                 if k == "messages":
                     continue
                 payload[k] = v
+            if use_openai and payload["stream"]:
+                # Compatible servers only send the usage of a stream when asked to
+                payload.setdefault("stream_options", {"include_usage": True})
 
         if payload.get("stream", False) and (use_openai or not is_gemini):
             result_parts: list[str] = []
+            usage: dict = {}
+            tool_calls: list = []
             async with httpx.AsyncClient(timeout=None) as client:
                 async with client.stream(
                     "POST", url, headers=headers, json=payload
                 ) as resp:
+                    if resp.status_code >= 400:
+                        # Read the body so that the raised error carries it
+                        await resp.aread()
+                        resp.raise_for_status()
                     async for line in resp.aiter_lines():
                         if not line:
                             continue
@@ -127,20 +136,22 @@ class HttpLLM(RemoteLLM):
                                     "node_id": oxy_request.node_id,
                                 },
                             )
+                        usage = self._parse_usage(chunk) or usage
                         if use_openai:
                             if "choices" not in chunk or not chunk["choices"]:
                                 continue
-                            delta = chunk["choices"][0]["delta"].get(
-                                "content", ""
-                            ) or chunk["choices"][0]["delta"].get(
-                                "reasoning_content", ""
-                            )
+                            chunk_message = chunk["choices"][0]["delta"]
                         else:
-                            delta = chunk.get("message", {}).get(
-                                "content", ""
-                            ) or chunk.get("message", {}).get("reasoning_content", "")
+                            chunk_message = chunk.get("message", {})
+                        delta = chunk_message.get("content", "") or chunk_message.get(
+                            "reasoning_content", ""
+                        )
+                        self._merge_tool_call_deltas(
+                            tool_calls, chunk_message.get("tool_calls")
+                        )
                         if delta:
                             result_parts.append(delta)
+                            oxy_request.on_stream_delta(delta)
                             await oxy_request.send_message(
                                 {
                                     "type": "stream",
@@ -162,7 +173,10 @@ class HttpLLM(RemoteLLM):
                     }
                 )
             result = "".join(result_parts)
-            return OxyResponse(state=OxyState.COMPLETED, output=result)
+            extra = {"usage": usage}
+            if tool_calls:
+                extra["tool_calls"] = tool_calls
+            return OxyResponse(state=OxyState.COMPLETED, output=result, extra=extra)
 
         async with httpx.AsyncClient(timeout=self.timeout) as client:
             http_response = await client.post(url, headers=headers, json=payload)
@@ -183,6 +197,13 @@ class HttpLLM(RemoteLLM):
                     "reasoning_content"
                 )
             else:  # ollama
-                result = data["message"]["content"]
+                response_message = data["message"]
+                result = response_message["content"]
 
-            return OxyResponse(state=OxyState.COMPLETED, output=result)
+            extra = {"usage": self._parse_usage(data)}
+            if not is_gemini and response_message.get("tool_calls"):
+                extra["tool_calls"] = self._merge_tool_call_deltas(
+                    [], response_message["tool_calls"]
+                )
+                result = result or ""
+            return OxyResponse(state=OxyState.COMPLETED, output=result, extra=extra)
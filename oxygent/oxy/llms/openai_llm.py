@@ -7,8 +7,6 @@ supports all OpenAI models and compatible APIs.
 
 import logging
 
-from openai import AsyncOpenAI
-
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse, OxyState
 from .remote_llm import RemoteLLM
@@ -62,17 +60,37 @@ class OpenAILLM(RemoteLLM):
             if k == "messages":
                 continue
             payload[k] = v
+        if payload["stream"]:
+            # Compatible servers only send the usage of a stream when asked to
+            payload.setdefault("stream_options", {"include_usage": True})
 
+        from openai import AsyncOpenAI  # Imported here to keep it out of startup
+
+        # Retries are driven by Oxy.execute, which backs off with jitter and
+        # honors Retry-After, so the client must not retry on its own.
         client = AsyncOpenAI(
             api_key=self.api_key,
             base_url=self.base_url,
+            max_retries=0,
         )
         completion = await client.chat.completions.create(**payload)
         if payload["stream"]:
             answer = ""
+            usage = {}
+            tool_calls = []
             think_start = True
             think_end = False
             async for chunk in completion:
+                if getattr(chunk, "usage", None):
+                    usage = self._parse_usage({"usage": chunk.usage.model_dump()})
+                if not chunk.choices:
+                    continue
+                if getattr(chunk.choices[0].delta, "tool_calls", None):
+                    self._merge_tool_call_deltas(
+                        tool_calls,
+                        [tc.model_dump() for tc in chunk.choices[0].delta.tool_calls],
+                    )
+                char = None
                 if hasattr(chunk.choices[0].delta, "reasoning_content"):
                     if think_start:
                         await oxy_request.send_message(
@@ -86,6 +104,7 @@ class OpenAILLM(RemoteLLM):
                             }
                         )
                         answer += "<think>"
+                        oxy_request.on_stream_delta("<think>")
                         think_start = False
                         think_end = True
                     char = chunk.choices[0].delta.reasoning_content
@@ -102,10 +121,12 @@ class OpenAILLM(RemoteLLM):
                             }
                         )
                         answer += "</think>"
+                        oxy_request.on_stream_delta("</think>")
                         think_end = False
                     char = chunk.choices[0].delta.content
                 if char:
                     answer += char
+                    oxy_request.on_stream_delta(char)
                     await oxy_request.send_message(
                         {
                             "type": "stream",
@@ -126,8 +147,22 @@ class OpenAILLM(RemoteLLM):
                     },
                 }
             )
-            return OxyResponse(state=OxyState.COMPLETED, output=answer)
+            extra = {"usage": usage}
+            if tool_calls:
+                extra["tool_calls"] = tool_calls
+            return OxyResponse(state=OxyState.COMPLETED, output=answer, extra=extra)
         else:
-            return OxyResponse(
-                state=OxyState.COMPLETED, output=completion.choices[0].message.content
+            usage = (
+                self._parse_usage({"usage": completion.usage.model_dump()})
+                if completion.usage
+                else {}
             )
+            response_message = completion.choices[0].message
+            output = response_message.content
+            extra = {"usage": usage}
+            if response_message.tool_calls:
+                extra["tool_calls"] = self._merge_tool_call_deltas(
+                    [], [tc.model_dump() for tc in response_message.tool_calls]
+                )
+                output = output or ""
+            return OxyResponse(state=OxyState.COMPLETED, output=output, extra=extra)
@@ -0,0 +1,261 @@
+"""Router LLM dispatching each request across several LLM endpoints.
+
+This module provides the RouterLLM class, which fronts a set of registered LLM Oxys
+(different base URLs, providers or models) with health- and latency-aware routing,
+hedged requests and failover. The losing request of a hedge is cancelled, which closes
+the underlying HTTP stream of the endpoint. Only one endpoint streams to the client: the
+first one to stream wins the request.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from pydantic import Field
+
+from ...schemas import OxyRequest, OxyResponse, OxyState
+from .base_llm import BaseLLM
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointStats:
+    """Health and latency observed for one endpoint of a RouterLLM."""
+
+    def __init__(self, window: int = 100):
+        self.latencies: deque = deque(maxlen=window)
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.consecutive_failures = 0
+
+    def record_failure(self, max_consecutive_failures: int, cooldown: float):
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= max_consecutive_failures:
+            self.open_until = time.time() + cooldown
+
+    def is_healthy(self) -> bool:
+        return time.time() >= self.open_until
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(int(percentile * len(ordered)), len(ordered) - 1)
+        return ordered[index]
+
+    def get_stats(self) -> dict:
+        return {
+            "samples": len(self.latencies),
+            "p50": self.get_percentile(0.5),
+            "p95": self.get_percentile(0.95),
+            "in_flight": self.in_flight,
+            "consecutive_failures": self.consecutive_failures,
+            "is_healthy": self.is_healthy(),
+        }
+
+
+class StreamOwner:
+    """The endpoint whose stream is forwarded, the first one to stream."""
+
+    def __init__(self):
+        self.llm_name: Optional[str] = None
+        self.claimed = asyncio.get_running_loop().create_future()
+
+    def get_gate(self, llm_name: str) -> Callable[[], bool]:
+        def func_stream_gate() -> bool:
+            if self.llm_name is None:
+                self.llm_name = llm_name
+                self.claimed.set_result(llm_name)
+            return self.llm_name == llm_name
+
+        return func_stream_gate
+
+    def release(self, llm_name: str):
+        """Let another endpoint stream once *llm_name* failed."""
+        if self.llm_name == llm_name:
+            self.llm_name = None
+            self.claimed = asyncio.get_running_loop().create_future()
+
+
+class RouterLLM(BaseLLM):
+    """LLM that routes requests across several registered LLM Oxys.
+
+    Endpoints are tried in order of health, median latency and in-flight load.
+    If the chosen endpoint has not answered once its observed latency
+    percentile is exceeded, a hedged duplicate is sent to the next endpoint
+    and the first completed answer wins; the other request is cancelled.
+    With streaming endpoints the first one to stream wins instead, so the
+    client and the stream listener of the caller get a single answer.
+    Failed endpoints are failed over immediately and skipped for a cooldown
+    after repeated failures. Endpoints should use a low ``retries`` so that
+    failover is not delayed by their own retry backoff.
+
+    Attributes:
+        llm_names: Names of the LLM Oxys used as endpoints, in preference order.
+        hedge_percentile: Latency percentile after which a hedge is sent.
+        default_hedge_delay: Hedge delay used until enough samples exist.
+        min_hedge_samples: Samples needed before the percentile is trusted.
+        max_hedged_requests: Maximum number of hedged duplicates per request.
+        max_consecutive_failures: Failures before an endpoint is skipped.
+        failure_cooldown: Seconds an unhealthy endpoint is skipped.
+    """
+
+    llm_names: list[str] = Field(
+        default_factory=list, description="Names of the endpoint LLM oxys"
+    )
+    hedge_percentile: float = Field(0.95, description="Latency percentile to hedge")
+    default_hedge_delay: float = Field(10.0, description="Hedge delay without data")
+    min_hedge_samples: int = Field(10, description="Samples to trust the percentile")
+    max_hedged_requests: int = Field(1, description="Maximum hedged duplicates")
+    max_consecutive_failures: int = Field(3, description="Failures before cooldown")
+    failure_cooldown: float = Field(30.0, description="Cooldown in seconds")
+    latency_window: int = Field(100, description="Latency samples kept per endpoint")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._endpoint_stats: dict[str, EndpointStats] = {
+            name: EndpointStats(self.latency_window) for name in self.llm_names
+        }
+
+    async def init(self):
+        await super().init()
+        for name in self.llm_names:
+            if name not in self.mas.oxy_name_to_oxy:
+                raise Exception(f"LLM {name} not exists.")
+
+    def _rank_endpoints(self) -> list[str]:
+        """Return endpoints ordered by health, median latency and load."""
+
+        def sort_key(item):
+            index, name = item
+            stats = self._endpoint_stats[name]
+            p50 = stats.get_percentile(0.5)
+            # Endpoints without samples are explored first
+            return (not stats.is_healthy(), p50 or 0.0, stats.in_flight, index)
+
+        return [name for _, name in sorted(enumerate(self.llm_names), key=sort_key)]
+
+    def _get_hedge_delay(self, llm_name: str) -> float:
+        stats = self._endpoint_stats[llm_name]
+        if len(stats.latencies) < self.min_hedge_samples:
+            return self.default_hedge_delay
+        return stats.get_percentile(self.hedge_percentile)
+
+    async def _call_endpoint(
+        self, oxy_request: OxyRequest, llm_name: str, stream_owner: StreamOwner
+    ) -> OxyResponse:
+        stats = self._endpoint_stats[llm_name]
+        stats.in_flight += 1
+        start_time = time.time()
+        try:
+            oxy_response = await oxy_request.call(
+                callee=llm_name,
+                arguments=oxy_request.arguments,
+                func_stream_listener=oxy_request.on_stream_delta,
+                func_stream_gate=stream_owner.get_gate(llm_name),
+            )
+        finally:
+            stats.in_flight -= 1
+        if oxy_response.state is OxyState.COMPLETED:
+            stats.record_success(time.time() - start_time)
+        else:
+            stats.record_failure(self.max_consecutive_failures, self.failure_cooldown)
+        return oxy_response
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        candidates = self._rank_endpoints()
+        pending: dict[asyncio.Task, str] = {}
+        hedged_count = 0
+        last_response = None
+        stream_owner = StreamOwner()
+
+        def launch():
+            llm_name = candidates.pop(0)
+            task = oxy_request.get_cancel_scope().spawn(
+                self._call_endpoint(oxy_request, llm_name, stream_owner)
+            )
+            pending[task] = llm_name
+            return llm_name
+
+        primary_name = launch()
+        launched_at = time.time()
+        try:
+            while pending:
+                timeout = None
+                if (
+                    candidates
+                    and hedged_count < self.max_hedged_requests
+                    and stream_owner.llm_name is None
+                ):
+                    hedge_delay = self._get_hedge_delay(primary_name)
+                    timeout = max(0.0, launched_at + hedge_delay - time.time())
+                waiters = set(pending)
+                if not stream_owner.claimed.done():
+                    waiters.add(stream_owner.claimed)
+                done, _ = await asyncio.wait(
+                    waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if stream_owner.claimed in done:
+                    # The client is shown this stream, the other requests are moot
+                    for task, llm_name in pending.items():
+                        if llm_name != stream_owner.llm_name:
+                            task.cancel()
+                    continue
+                if not done:
+                    hedged_count += 1
+                    hedge_name = launch()
+                    logger.info(
+                        f"{primary_name} is slow, hedging with {hedge_name}",
+                        extra={
+                            "trace_id": oxy_request.current_trace_id,
+                            "node_id": oxy_request.node_id,
+                        },
+                    )
+                    continue
+                for task in done:
+                    llm_name = pending.pop(task)
+                    if task.cancelled():
+                        continue
+                    oxy_response = task.result()
+                    if oxy_response.state is OxyState.COMPLETED:
+                        return OxyResponse(
+                            state=oxy_response.state,
+                            output=oxy_response.output,
+                            extra={**oxy_response.extra, "endpoint": llm_name},
+                        )
+                    last_response = oxy_response
+                    stream_owner.release(llm_name)
+                    logger.warning(
+                        f"Endpoint {llm_name} failed: {oxy_response.output}",
+                        extra={
+                            "trace_id": oxy_request.current_trace_id,
+                            "node_id": oxy_request.node_id,
+                        },
+                    )
+                    if candidates and not pending:
+                        primary_name = launch()
+                        launched_at = time.time()
+        finally:
+            # Cancel losers so that their HTTP streams are closed
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return OxyResponse(
+            state=OxyState.FAILED,
+            output=last_response.output if last_response else "No endpoint available",
+        )
+
+    async def _after_execute(self, oxy_response: OxyResponse) -> OxyResponse:
+        # Usage is already accounted by the endpoint that answered
+        return oxy_response
+
+    def get_stats(self) -> dict:
+        return {name: s.get_stats() for name, s in self._endpoint_stats.items()}
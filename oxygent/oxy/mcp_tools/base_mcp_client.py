@@ -6,17 +6,21 @@ and tool execution through the Model Context Protocol standard.
 """
 
 import asyncio
+import json
 import logging
+import os
 from contextlib import AsyncExitStack
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-import anyio
-from mcp import ClientSession
+from mcp import ClientSession, Tool
 from pydantic import Field
 
 from ...config import Config
 from ...schemas import OxyRequest, OxyResponse, OxyState
+from ...tool_cache import ToolCachePolicy
+from ...utils.common_utils import get_md5
 from ..base_tool import BaseTool
+from .mcp_session_pool import is_session_broken
 from .mcp_tool import MCPTool
 
 logger = logging.getLogger(__name__)
@@ -31,6 +35,16 @@ class BaseMCPClient(BaseTool):
 
     Attributes:
         included_tool_name_list: List of tool names discovered from the MCP server.
+        tool_cache_policies: Cache policies of individual server tools by name,
+            tools without an entry use ``cache_policy``.
+        max_concurrent_calls: Calls in flight at once over the keep-alive
+            session. MCP matches responses to requests by id, so the tools of
+            a server share one session without waiting for each other.
+        init_timeout: Seconds to wait for the server to start and answer the
+            MCP handshake.
+        is_cache_tools: Whether the tool schemas are persisted under the cache
+            directory. On the next start the tools are registered from the
+            cache at once and the server connects in the background.
     """
 
     included_tool_name_list: list = Field(default_factory=list)
@@ -40,6 +54,18 @@ class BaseMCPClient(BaseTool):
     is_dynamic_headers: bool = Field(False, description="is dynamic headers")
     is_inherit_headers: bool = Field(False, description="is inherit headers")
     is_keep_alive: bool = Field(default_factory=Config.get_tool_mcp_is_keep_alive)
+    tool_cache_policies: Dict[str, ToolCachePolicy] = Field(
+        default_factory=dict, description="Cache policies of the server tools"
+    )
+    max_concurrent_calls: int = Field(
+        16, description="Calls in flight at once over the keep-alive session"
+    )
+    init_timeout: Optional[float] = Field(
+        60.0, description="Seconds to wait for the server handshake"
+    )
+    is_cache_tools: bool = Field(
+        True, description="Register cached tool schemas and connect lazily"
+    )
 
     def __init__(self, **kwargs):
         """Initialize the MCP client with necessary resources.
@@ -52,6 +78,101 @@ class BaseMCPClient(BaseTool):
         self._cleanup_lock: asyncio.Lock = asyncio.Lock()
         self._exit_stack: AsyncExitStack = AsyncExitStack()
         self._stdio_context: Any = Field(None)
+        self._call_semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        self._reconnect_lock = asyncio.Lock()
+        self._session_generation = 0
+        self._connect_task: Optional[asyncio.Task] = None
+        self._restored_tools: Optional[list] = None
+
+    def get_tool_cache_key(self) -> Optional[str]:
+        """Identify the server whose tool schemas are cached, None disables it.
+
+        Subclasses return what determines the tools of the server, e.g. the
+        command, arguments and version of a stdio server.
+        """
+        return None
+
+    def _get_tool_cache_path(self) -> Optional[str]:
+        key = self.get_tool_cache_key() if self.is_cache_tools else None
+        if key is None:
+            return None
+        return os.path.join(
+            Config.get_cache_save_dir(), "mcp_tools", f"{get_md5(key)}.json"
+        )
+
+    def _save_tool_cache(self, tools_response) -> None:
+        path = self._get_tool_cache_path()
+        if path is None:
+            return
+        tools = [
+            {
+                "name": tool.name,
+                "description": tool.description,
+                "inputSchema": tool.inputSchema,
+            }
+            for item in tools_response
+            if isinstance(item, tuple) and item[0] == "tools"
+            for tool in item[1]
+        ]
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"tools": tools}, f, ensure_ascii=False)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not cache the tools of server {self.name}: {e}")
+
+    def restore_tools(self, tools: list[dict]) -> None:
+        """Register *tools*, e.g. from a MAS snapshot, instead of the cache."""
+        self._restored_tools = tools
+
+    def get_tool_schemas(self) -> list[dict]:
+        """Schemas of the registered tools, in the format of the tool cache."""
+        return [
+            {
+                "name": mcp_tool.name,
+                "description": mcp_tool.desc,
+                "inputSchema": mcp_tool.input_schema,
+            }
+            for tool_name in self.included_tool_name_list
+            if isinstance(mcp_tool := self.mas.oxy_name_to_oxy.get(tool_name), MCPTool)
+        ]
+
+    def register_cached_tools(self) -> bool:
+        """Register the cached tools and connect to the server in the background.
+
+        Returns:
+            bool: Whether cached tools were found. If not, the caller connects
+                as usual.
+        """
+        try:
+            if self._restored_tools is not None:
+                tools = [Tool(**tool) for tool in self._restored_tools]
+            else:
+                path = self._get_tool_cache_path()
+                if path is None or not os.path.exists(path):
+                    return False
+                with open(path, "r", encoding="utf-8") as f:
+                    tools = [Tool(**tool) for tool in json.load(f)["tools"]]
+        except Exception as e:
+            logger.warning(f"Ignoring the tool cache of server {self.name}: {e}")
+            return False
+        self.add_tools([("tools", tools)])
+        self._connect_task = asyncio.create_task(self._connect_in_background())
+        return True
+
+    async def _connect_in_background(self) -> None:
+        try:
+            await self.init(is_fetch_tools=False)
+            if self._session:
+                await self.list_tools()  # Picks up tools changed since the cache
+        except Exception as e:
+            # Calls then fail with "not initialized" instead of hanging
+            logger.error(f"Server {self.name} failed to connect: {e}")
+
+    async def wait_connected(self) -> None:
+        """Wait for a background connection started from cached tools."""
+        if self._connect_task is not None and not self._connect_task.done():
+            await asyncio.shield(self._connect_task)
 
     async def list_tools(self) -> None:
         """Discover and register tools from the MCP server.
@@ -63,11 +184,13 @@ class BaseMCPClient(BaseTool):
 
         tools_response = await self._session.list_tools()
         self.add_tools(tools_response)
+        self._save_tool_cache(tools_response)
 
     def add_tools(self, tools_response) -> None:
         """
         dynamically creates MCPTool instances for each discovered tool. These tools are
-        then registered with the MAS for use by agents.
+        then registered with the MAS for use by agents. Tools registered before only
+        get their description and input schema refreshed.
         """
         params = self.model_dump(
             exclude={
@@ -78,6 +201,11 @@ class BaseMCPClient(BaseTool):
                 "included_tool_name_list",
                 "name",
                 "desc",
+                "cache_policy",
+                "tool_cache_policies",
+                "max_concurrent_calls",
+                "init_timeout",
+                "is_cache_tools",
                 "mcp_client",
                 "server_name",
                 "input_schema",
@@ -86,6 +214,13 @@ class BaseMCPClient(BaseTool):
         for item in tools_response:
             if isinstance(item, tuple) and item[0] == "tools":
                 for tool in item[1]:
+                    if tool.name in self.included_tool_name_list:
+                        mcp_tool = self.mas.oxy_name_to_oxy.get(tool.name)
+                        if isinstance(mcp_tool, MCPTool):
+                            mcp_tool.desc = tool.description
+                            mcp_tool.input_schema = tool.inputSchema
+                            mcp_tool._set_desc_for_llm()
+                        continue
                     self.included_tool_name_list.append(tool.name)
 
                     mcp_tool = MCPTool(
@@ -94,6 +229,9 @@ class BaseMCPClient(BaseTool):
                         mcp_client=self,
                         server_name=self.name,
                         input_schema=tool.inputSchema,
+                        cache_policy=self.tool_cache_policies.get(
+                            tool.name, self.cache_policy
+                        ),
                         func_process_input=self.func_process_input,
                         func_process_output=self.func_process_output,
                         func_format_input=self.func_format_input,
@@ -105,6 +243,35 @@ class BaseMCPClient(BaseTool):
                     mcp_tool.set_mas(self.mas)
                     self.mas.add_oxy(mcp_tool)
 
+    async def _call_keep_alive(self, tool_name: str, arguments: dict):
+        """Call a tool over the keep-alive session, reconnecting once if it broke."""
+        await self.wait_connected()
+        for attempt in range(2):
+            session, generation = self._session, self._session_generation
+            if not session:
+                raise RuntimeError(f"Server {self.name} not initialized")
+            try:
+                async with self._call_semaphore:
+                    return await session.call_tool(tool_name, arguments)
+            except Exception as e:
+                if attempt or not is_session_broken(e):
+                    raise
+                await self._reconnect(generation)
+
+    async def _reconnect(self, generation: int) -> None:
+        """Reconnect the keep-alive session and refetch the tools of the server.
+
+        Calls that failed on the same broken session wait here, and only the
+        first one reconnects: the others find the generation already bumped.
+        """
+        async with self._reconnect_lock:
+            if generation != self._session_generation:
+                return
+            logger.warning(f"Session of server {self.name} closed, reconnecting")
+            await self.init(is_fetch_tools=False)
+            await self.list_tools()
+            self._session_generation += 1
+
     async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
         """Execute a tool call through the MCP server.
 
@@ -115,18 +282,7 @@ class BaseMCPClient(BaseTool):
         tool_name = oxy_request.callee
 
         if not self.is_dynamic_headers and self.is_keep_alive:
-            if not self._session:
-                raise RuntimeError(f"Server {self.name} not initialized")
-
-            try:
-                mcp_response = await self._session.call_tool(
-                    tool_name, oxy_request.arguments
-                )
-            except anyio.ClosedResourceError:
-                await self.init(is_fetch_tools=False)  # TODO: refetch tools
-                mcp_response = await self._session.call_tool(
-                    tool_name, oxy_request.arguments
-                )
+            mcp_response = await self._call_keep_alive(tool_name, oxy_request.arguments)
         else:
             if self.is_dynamic_headers:
                 _headers = (
@@ -160,6 +316,9 @@ class BaseMCPClient(BaseTool):
         cleanup lock to prevent concurrent cleanup operations and handles cancellation
         and other exceptions gracefully.
         """
+        if self._connect_task is not None and not self._connect_task.done():
+            self._connect_task.cancel()
+            await asyncio.gather(self._connect_task, return_exceptions=True)
         async with self._cleanup_lock:
             try:
                 await self._exit_stack.aclose()
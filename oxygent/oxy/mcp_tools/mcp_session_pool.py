@@ -0,0 +1,276 @@
+"""mcp_session_pool.py Bounded pool of warm MCP client sessions.
+
+NOTE: Each pooled session lives in a task of its own, because the anyio
+cancel scopes of the MCP transports must be exited by the task that entered
+them. Sessions are grouped by key, so requests that must not share a server
+process (different headers or environment) land on separate sub-pools.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncContextManager, Callable, Optional
+
+import anyio
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED
+
+logger = logging.getLogger(__name__)
+
+
+def is_session_broken(e: BaseException) -> bool:
+    """Whether *e* means the session is unusable rather than the call failed."""
+    if isinstance(e, McpError):
+        return e.error.code == CONNECTION_CLOSED
+    return isinstance(
+        e, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream)
+    )
+
+
+class PooledSession:
+    """An initialized MCP session kept open by a background task."""
+
+    def __init__(
+        self,
+        key: str,
+        func_open_session: Callable[[str], AsyncContextManager[ClientSession]],
+        max_concurrent_calls: int,
+    ):
+        self.key = key
+        self.func_open_session = func_open_session
+        self.max_concurrent_calls = max_concurrent_calls
+        self.semaphore = asyncio.Semaphore(max_concurrent_calls)
+        self.session: Optional[ClientSession] = None
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self.is_closed = False
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    async def _run(self):
+        try:
+            async with self.func_open_session(self.key) as session:
+                self.session = session
+                self._ready.set()
+                await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            if self.session is not None:
+                logger.warning(f"Pooled MCP session {self.key!r} died: {e}")
+        finally:
+            self.is_closed = True
+            self.session = None
+            self._ready.set()
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        try:
+            await self._ready.wait()
+        except asyncio.CancelledError:
+            await self.close()
+            raise
+        if self.session is None:
+            raise RuntimeError(
+                f"Failed to open MCP session {self.key!r}"
+            ) from self._error
+
+    async def call_tool(self, tool_name: str, arguments: dict):
+        self.in_flight += 1
+        try:
+            async with self.semaphore:
+                if self.session is None:
+                    raise anyio.ClosedResourceError()
+                return await self.session.call_tool(tool_name, arguments)
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout)
+            return True
+        except Exception as e:
+            logger.warning(f"Health check of MCP session {self.key!r} failed: {e}")
+            return False
+
+    async def close(self):
+        self._closing.set()
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class MCPSessionPool:
+    """Keyed pool of warm MCP sessions.
+
+    Calls go to the least loaded live session of their key. A new session is
+    opened only while all existing ones are at ``max_concurrent_calls`` and
+    the key has fewer than ``max_sessions``, one at a time, otherwise the call
+    queues on the least loaded one. Sessions idle for ``max_idle_seconds`` are
+    closed by a background reaper, so an idle pool does not keep its server
+    processes alive, and a session idle for ``health_check_seconds`` is
+    pinged before reuse.
+
+    Examples
+    --------
+    >>> pool = MCPSessionPool(open_session, max_sessions=2)
+    >>> result = await pool.call_tool("", "read_file", {"path": "a.txt"})
+    >>> await pool.close()
+    """
+
+    def __init__(
+        self,
+        func_open_session: Callable[[str], AsyncContextManager[ClientSession]],
+        max_sessions: int = 4,
+        max_concurrent_calls: int = 8,
+        max_idle_seconds: float = 300.0,
+        health_check_seconds: float = 60.0,
+        health_check_timeout: float = 5.0,
+    ):
+        self.func_open_session = func_open_session
+        self.max_sessions = max_sessions
+        self.max_concurrent_calls = max_concurrent_calls
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_seconds = health_check_seconds
+        self.health_check_timeout = health_check_timeout
+        self._sessions: dict[str, list[PooledSession]] = {}
+        self._starting: dict[str, int] = {}
+        self._changed = asyncio.Condition()
+        self._reaper: Optional[asyncio.Task] = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def _close_in_background(self, session: PooledSession):
+        task = asyncio.create_task(session.close())
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _evict(self):
+        """Drop dead sessions and close the ones idle for too long."""
+        now = time.monotonic()
+        for key, sessions in self._sessions.items():
+            kept = []
+            for session in sessions:
+                if session.is_closed:
+                    continue
+                if (
+                    session.in_flight == 0
+                    and now - session.last_used > self.max_idle_seconds
+                ):
+                    self._close_in_background(session)
+                    continue
+                kept.append(session)
+            sessions[:] = kept
+
+    async def _reap(self):
+        """Evict idle sessions until none is left, then stop."""
+        while True:
+            await asyncio.sleep(min(self.max_idle_seconds, 60.0))
+            async with self._changed:
+                self._evict()
+                if not any(self._sessions.values()):
+                    self._reaper = None
+                    return
+
+    async def _acquire(self, key: str) -> PooledSession:
+        while True:
+            async with self._changed:
+                while True:
+                    self._evict()
+                    sessions = self._sessions.setdefault(key, [])
+                    free = [s for s in sessions if s.in_flight < s.max_concurrent_calls]
+                    if free:
+                        session = min(free, key=lambda s: s.in_flight)
+                        break
+                    if self._starting.get(key):
+                        # Wait for it rather than opening one session per caller
+                        await self._changed.wait()
+                        continue
+                    if len(sessions) < self.max_sessions:
+                        session = None
+                        self._starting[key] = 1
+                        break
+                    session = min(sessions, key=lambda s: s.in_flight)
+                    break
+
+            if session is None:
+                return await self._open(key)
+            if (
+                session.in_flight == 0
+                and time.monotonic() - session.last_used > self.health_check_seconds
+            ):
+                # Claim the session while pinging so it is not evicted meanwhile
+                session.in_flight += 1
+                try:
+                    is_healthy = await session.ping(self.health_check_timeout)
+                finally:
+                    session.in_flight -= 1
+                session.last_used = time.monotonic()
+                if not is_healthy:
+                    await self.discard(session)
+                    continue
+            return session
+
+    async def _open(self, key: str) -> PooledSession:
+        session = PooledSession(key, self.func_open_session, self.max_concurrent_calls)
+        try:
+            await session.start()
+        finally:
+            async with self._changed:
+                self._starting[key] -= 1
+                if not session.is_closed:
+                    self._sessions.setdefault(key, []).append(session)
+                    if self._reaper is None:
+                        self._reaper = asyncio.create_task(self._reap())
+                self._changed.notify_all()
+        return session
+
+    async def discard(self, session: PooledSession):
+        """Remove a broken *session* from the pool and close it."""
+        async with self._changed:
+            sessions = self._sessions.get(session.key, [])
+            if session in sessions:
+                sessions.remove(session)
+            self._changed.notify_all()
+        await session.close()
+
+    async def call_tool(self, key: str, tool_name: str, arguments: dict):
+        """Call *tool_name* on a session of sub-pool *key*.
+
+        A call failing because its session broke is retried once on another
+        session, tool errors are returned or raised as they are.
+        """
+        for attempt in range(2):
+            session = await self._acquire(key)
+            try:
+                return await session.call_tool(tool_name, arguments)
+            except Exception as e:
+                if attempt or not is_session_broken(e):
+                    raise
+                logger.warning(f"MCP session {key!r} broke, retrying: {e}")
+                await self.discard(session)
+
+    def get_stats(self) -> dict:
+        return {
+            key: {
+                "sessions": len(sessions),
+                "in_flight": sum(s.in_flight for s in sessions),
+            }
+            for key, sessions in self._sessions.items()
+            if sessions
+        }
+
+    async def close(self):
+        """Close every session of the pool."""
+        async with self._changed:
+            sessions = [s for group in self._sessions.values() for s in group]
+            self._sessions.clear()
+            reaper, self._reaper = self._reaper, None
+        if reaper is not None:
+            reaper.cancel()
+        await asyncio.gather(
+            *[session.close() for session in sessions],
+            *list(self._background_tasks),
+            return_exceptions=True,
+        )
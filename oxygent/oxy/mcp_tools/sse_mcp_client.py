@@ -5,6 +5,7 @@ Server-Sent Events (SSE). This allows for real-time, unidirectional communicatio
 MCP servers to clients, ideal for streaming responses and live updates.
 """
 
+import asyncio
 import logging
 from typing import Any, List
 
@@ -38,6 +39,9 @@ class SSEMCPClient(BaseMCPClient):
         session, initializes the MCP protocol, and discovers available tools from the
         server.
         """
+        if is_fetch_tools and self.register_cached_tools():
+            return
+
         try:
             if not self.is_dynamic_headers and self.is_keep_alive:
                 # header
@@ -63,7 +67,7 @@ class SSEMCPClient(BaseMCPClient):
                             mw,
                         )
 
-                await self._session.initialize()
+                await asyncio.wait_for(self._session.initialize(), self.init_timeout)
                 if is_fetch_tools:
                     await self.list_tools()
             else:
@@ -71,7 +75,7 @@ class SSEMCPClient(BaseMCPClient):
                     build_url(self.sse_url), headers=self.headers, timeout=self.timeout
                 ) as streams:
                     async with ClientSession(*streams) as session:
-                        await session.initialize()
+                        await asyncio.wait_for(session.initialize(), self.init_timeout)
                         tools_response = await session.list_tools()
                         self.add_tools(tools_response)
         except Exception as e:
@@ -6,16 +6,20 @@ communication, allowing MCP servers to run as separate processes that communicat
 through stdin/stdout pipes.
 """
 
+import asyncio
+import json
 import logging
 import os
 import shutil
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, Optional
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from pydantic import Field
 
 from .base_mcp_client import BaseMCPClient
+from .mcp_session_pool import MCPSessionPool
 
 logger = logging.getLogger(__name__)
 
@@ -29,9 +33,27 @@ class StdioMCPClient(BaseMCPClient):
 
     Attributes:
         params: Configuration parameters including command, arguments, and environment variables.
+        pool_max_sessions: Server processes kept warm per header set for calls that
+            do not use the keep-alive session, 0 spawns a process per call.
     """
 
     params: dict[str, Any] = Field(default_factory=dict)
+    pool_max_sessions: int = Field(
+        4, description="Warm sessions per header set, 0 spawns one per call"
+    )
+    pool_max_concurrent_calls: int = Field(
+        8, description="In-flight calls per pooled session"
+    )
+    pool_max_idle_seconds: float = Field(
+        300.0, description="Seconds after which an idle pooled session is closed"
+    )
+    pool_health_check_seconds: float = Field(
+        60.0, description="Idle seconds after which a session is pinged before reuse"
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._session_pool: Optional[MCPSessionPool] = None
 
     async def _ensure_directories_exist(self, args: list[str]) -> None:
         """Ensure required directories exist before starting MCP server."""
@@ -61,7 +83,12 @@ class StdioMCPClient(BaseMCPClient):
         2. Validates that required files exist for directory-based commands
         3. Sets up environment variables
         4. Establishes stdio transport and session
+
+        With tools cached by a previous start, the tools are registered at once
+        and the process is spawned in the background.
         """
+        if is_fetch_tools and self.register_cached_tools():
+            return
 
         try:
             server_params = await self.get_server_params()
@@ -72,7 +99,7 @@ class StdioMCPClient(BaseMCPClient):
             self._session = await self._exit_stack.enter_async_context(
                 ClientSession(read, write)
             )
-            await self._session.initialize()
+            await asyncio.wait_for(self._session.initialize(), self.init_timeout)
             if is_fetch_tools:
                 await self.list_tools()
         except FileNotFoundError as e:
@@ -85,13 +112,59 @@ class StdioMCPClient(BaseMCPClient):
             await self.cleanup()
             raise Exception(f"Server {self.name} error")
 
-    async def call_tool(self, tool_name, arguments, headers=None):
+    @asynccontextmanager
+    async def _open_session(self, key: str = ""):
         server_params = await self.get_server_params()
         async with stdio_client(server_params) as streams:
             async with ClientSession(*streams) as session:
                 await session.initialize()
+                yield session
+
+    async def call_tool(self, tool_name, arguments, headers=None):
+        """Call a tool on a pooled server process.
+
+        Stdio servers receive no headers, but calls with different headers are
+        kept on separate sessions so they never share a server process.
+        """
+        if self.pool_max_sessions <= 0:
+            async with self._open_session() as session:
                 return await session.call_tool(tool_name, arguments)
 
+        if self._session_pool is None:
+            self._session_pool = MCPSessionPool(
+                self._open_session,
+                max_sessions=self.pool_max_sessions,
+                max_concurrent_calls=self.pool_max_concurrent_calls,
+                max_idle_seconds=self.pool_max_idle_seconds,
+                health_check_seconds=self.pool_health_check_seconds,
+            )
+        key = json.dumps(headers, sort_keys=True) if headers else ""
+        return await self._session_pool.call_tool(key, tool_name, arguments)
+
+    async def cleanup(self) -> None:
+        """Close the pooled sessions as well as the keep-alive session."""
+        if self._session_pool is not None:
+            session_pool, self._session_pool = self._session_pool, None
+            await session_pool.close()
+        await super().cleanup()
+
+    def get_tool_cache_key(self):
+        """Key the cached tools by command and arguments.
+
+        Pinned package versions are part of the arguments, and local scripts
+        run with ``--directory <dir> run <file>`` add their modification time.
+        """
+        args = self.params.get("args", [])
+        version = None
+        if len(args) >= 4 and args[0] == "--directory" and args[2] == "run":
+            try:
+                version = os.path.getmtime(os.path.join(args[1], args[3]))
+            except OSError:
+                version = None
+        return json.dumps(
+            {"command": self.params.get("command"), "args": args, "version": version}
+        )
+
     async def get_server_params(self):
         command = (
             shutil.which("npx")
@@ -110,8 +183,10 @@ class StdioMCPClient(BaseMCPClient):
         server_params = StdioServerParameters(
             command=command,
             args=args,
-            env={**os.environ, **self.params["env"]}
-            if self.params.get("env")
-            else {**os.environ},
+            env=(
+                {**os.environ, **self.params["env"]}
+                if self.params.get("env")
+                else {**os.environ}
+            ),
         )
         return server_params
@@ -1,5 +1,6 @@
 """Streamable-HTTP MCP client implementation."""
 
+import asyncio
 import logging
 from typing import Any, List
 
@@ -23,6 +24,9 @@ class StreamableMCPClient(BaseMCPClient):
 
     async def init(self, is_fetch_tools=True) -> None:
         """Initialize the HTTP streaming connection to the MCP server."""
+        if is_fetch_tools and self.register_cached_tools():
+            return
+
         try:
             if not self.is_dynamic_headers and self.is_keep_alive:
                 self._http_transport = await self._exit_stack.enter_async_context(
@@ -44,7 +48,7 @@ class StreamableMCPClient(BaseMCPClient):
                     else:
                         logger.warning("middleware %s is ignored", mw)
 
-                await self._session.initialize()
+                await asyncio.wait_for(self._session.initialize(), self.init_timeout)
                 if is_fetch_tools:
                     await self.list_tools()
             else:
@@ -54,7 +58,7 @@ class StreamableMCPClient(BaseMCPClient):
                     timeout=self.timeout,
                 ) as (read, write, _):
                     async with ClientSession(read, write) as session:
-                        await session.initialize()
+                        await asyncio.wait_for(session.initialize(), self.init_timeout)
                         tools_response = await session.list_tools()
                         self.add_tools(tools_response)
         except Exception as e:
@@ -36,6 +36,7 @@ class OxyFactory:
             HttpTool,
             HttpLLM,
             OpenAILLM,
+            RouterLLM,
             MCPTool,
             StdioMCPClient,
             SSEMCPClient,
@@ -50,6 +51,7 @@ class OxyFactory:
             "HttpTool": HttpTool,
             "HttpLLM": HttpLLM,
             "OpenAILLM": OpenAILLM,
+            "RouterLLM": RouterLLM,
             "MCPTool": MCPTool,
             "StdioMCPClient": StdioMCPClient,
             "SSEMCPClient": SSEMCPClient,
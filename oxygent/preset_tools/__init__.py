@@ -1,9 +1,11 @@
 import importlib
 import os
+import sys
+import types
 
-from oxygent.oxy import FunctionHub
-
-# List of tool modules to import
+# List of tool modules, each defining a FunctionHub of the same name. They are
+# imported on first access (PEP 562), so importing the package does not load
+# the dependencies of unused tools.
 tool_modules = [
     "math_tools",
     "file_tools",
@@ -17,12 +19,25 @@ tool_modules = [
     "document_tools",  # 文档处理工具集（PDF、Word、Excel等）
 ]
 
-__all__ = []
+__all__ = list(tool_modules)
 
 # Get the current package directory path
 package_dir = os.path.dirname(__file__)
 
-for module_name in tool_modules:
+
+class _PresetToolsModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing a tool module binds the module on the package, e.g. by
+        # `from oxygent.preset_tools.math_tools import calc_pi`, keep the hub
+        if name in tool_modules and isinstance(value, types.ModuleType):
+            value = getattr(value, name, value)
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _PresetToolsModule
+
+
+def _import_tool(module_name):
     module_path = os.path.join(package_dir, f"{module_name}.py")
 
     # First check if the module file exists
@@ -30,32 +45,11 @@ for module_name in tool_modules:
         print(
             f"Warning: Failed to import tool '{module_name}': Module file does not exist, please check '{module_path}'"
         )
-        globals()[module_name] = None
-        continue
+        return None
 
     try:
         # Dynamically import the module
         module = importlib.import_module(f".{module_name}", __package__)
-
-        # Filter out all non-private attributes that are instances of FunctionHub
-        function_hub_instances = [
-            attr
-            for attr in dir(module)
-            if not attr.startswith("_")  # Exclude private attributes
-            and isinstance(
-                getattr(module, attr), FunctionHub
-            )  # Only keep FunctionHub instances
-        ]
-
-        if function_hub_instances:
-            # Add eligible instances to the current scope and __all__
-            for attr_name in function_hub_instances:
-                attr_value = getattr(module, attr_name)
-                globals()[attr_name] = attr_value
-                __all__.append(attr_name)
-        else:
-            print(f"Warning: No FunctionHub instances found in module '{module_name}'")
-
     except ImportError as e:
         # Catch import errors and extract the missing package name
         error_msg = str(e)
@@ -73,6 +67,22 @@ for module_name in tool_modules:
             )
         else:
             print(f"Warning: Failed to import tool '{module_name}': {error_msg}")
+        return None
+
+    function_hub = getattr(module, module_name, None)
+    if function_hub is None:
+        print(f"Warning: No FunctionHub instances found in module '{module_name}'")
+    return function_hub
+
+
+def __getattr__(name):
+    if name not in tool_modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    function_hub = _import_tool(name)
+    # Set the entry to None on failure to prevent errors in subsequent use
+    globals()[name] = function_hub
+    return function_hub
+
 
-        # Set the module entry to None to prevent errors in subsequent use
-        globals()[module_name] = None
+def __dir__():
+    return sorted(set(globals()) | set(tool_modules))
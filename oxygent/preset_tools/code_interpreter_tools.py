@@ -8,7 +8,7 @@ Key Features:
 - Stateful execution: Variables and imports persist across multiple calls with the same session_id
 - Isolated environment: Each session runs in its own Jupyter kernel for security
 - Rich output handling: Captures stdout, expression results, and error messages
-- Resource management: Explicit session lifecycle with start/stop controls
+- Resource management: Pre-warmed kernel pool, idle sessions are stopped automatically
 
 Setup:
 To use this tool, ensure Jupyter client and ipykernel are installed:
@@ -102,131 +102,279 @@ print(f"Prediction for x=6: {prediction[0]}")
 
 import asyncio
 import logging
-import threading
 import time
+from collections import OrderedDict
 from queue import Empty
+from typing import Optional
 
-from jupyter_client.manager import KernelManager
+from jupyter_client.manager import AsyncKernelManager
 from pydantic import Field
 
 from oxygent.oxy import FunctionHub
 
 logger = logging.getLogger(__name__)
 
-code_interpreter_tools = FunctionHub(name="code_interpreter_tools")
+
+class KernelSession:
+    """A running Jupyter kernel, its client and the lock serializing its cells.
+
+    ``users`` counts the calls running a cell or waiting for the lock, a
+    session is idle only when it has none.
+    """
+
+    def __init__(self, kernel_manager: AsyncKernelManager, client):
+        self.kernel_manager = kernel_manager
+        self.client = client
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self.last_used = time.monotonic()
 
 
 class CodeInterpreter:
-    """Synchronous class to manage Jupyter kernels and execute code.
+    """Pool of Jupyter kernels, one per session, with pre-warmed spares.
 
-    This class handles the lifecycle of Jupyter kernels and provides
-    thread-safe code execution capabilities. Each session gets its own
-    isolated kernel environment.
+    A new session takes a spare kernel started ahead of time, so its first
+    call does not wait for a kernel to boot, and a replacement spare is
+    started in the background. Sessions idle for ``max_idle_seconds`` are
+    stopped, and once ``max_kernels`` kernels run, the least recently used
+    idle session is stopped to make room for a new one.
     """
 
-    def __init__(self):
-        """Initialize the CodeInterpreter with empty sessions dictionary."""
-        self.sessions: dict[str, dict] = {}
-        self._global_lock = threading.RLock()
+    def __init__(
+        self,
+        min_idle_kernels: int = 1,
+        max_kernels: int = 8,
+        max_idle_seconds: float = 600.0,
+        startup_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            min_idle_kernels: Spare kernels kept started for new sessions.
+            max_kernels: Kernels running at most, spares included.
+            max_idle_seconds: Idle time after which a session is stopped.
+            startup_timeout: Seconds to wait for a new kernel to be ready.
+        """
+        self.min_idle_kernels = min_idle_kernels
+        self.max_kernels = max_kernels
+        self.max_idle_seconds = max_idle_seconds
+        self.startup_timeout = startup_timeout
+        # Least recently used first
+        self.sessions: OrderedDict[str, KernelSession] = OrderedDict()
+        self._spares: list[KernelSession] = []
+        self._starting = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reaper: Optional[asyncio.Task] = None
+        self._background_tasks: set[asyncio.Task] = set()
+
+    async def _bind_loop(self):
+        """Kernel clients belong to the event loop that started them."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None:
+            # Tasks of a closed loop can be neither awaited nor cancelled
+            self._reaper = None
+            self._background_tasks = set()
+            await self.close()
+        self._loop = loop
+        self._lock = asyncio.Lock()
+
+    def _get_kernel_count(self) -> int:
+        return len(self.sessions) + len(self._spares) + self._starting
+
+    async def _start_kernel(self) -> KernelSession:
+        kernel_manager = AsyncKernelManager()
+        try:
+            await kernel_manager.start_kernel()
+            client = kernel_manager.client()
+            client.start_channels()
+            await client.wait_for_ready(timeout=self.startup_timeout)
+        except Exception as e:
+            logger.error("Failed to start kernel: %s", e)
+            await self._stop(KernelSession(kernel_manager, None))
+            raise RuntimeError(f"Error starting Jupyter kernel: {e}") from e
+        return KernelSession(kernel_manager, client)
+
+    async def _stop(self, session: KernelSession):
+        if session.client is not None:
+            try:
+                session.client.stop_channels()
+            except Exception as e:
+                logger.debug("stop_channels error: %s", e)
+        try:
+            await session.kernel_manager.shutdown_kernel(now=True)
+        except Exception as e:
+            logger.debug("shutdown_kernel error: %s", e)
+
+    def _run_in_background(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def warm_up(self):
+        """Start spare kernels up to ``min_idle_kernels``."""
+        await self._bind_loop()
+        while True:
+            async with self._lock:
+                if (
+                    len(self._spares) + self._starting >= self.min_idle_kernels
+                    or self._get_kernel_count() >= self.max_kernels
+                ):
+                    return
+                self._starting += 1
+            try:
+                session = await self._start_kernel()
+            except RuntimeError:
+                return
+            finally:
+                async with self._lock:
+                    self._starting -= 1
+            async with self._lock:
+                self._spares.append(session)
+
+    def start_warm_up(self):
+        """Start the spare kernels in the background."""
+        self._run_in_background(self.warm_up())
+
+    async def _reclaim_lru(self):
+        """Stop the least recently used idle session, under ``self._lock``."""
+        for session_id, session in self.sessions.items():
+            if session.users == 0:
+                del self.sessions[session_id]
+                logger.info("Reclaiming the kernel of idle session %s", session_id)
+                self._run_in_background(self._stop(session))
+                return
+        raise RuntimeError(f"All {self.max_kernels} kernels are busy")
+
+    async def _reap(self):
+        while True:
+            await asyncio.sleep(min(self.max_idle_seconds, 60.0))
+            deadline = time.monotonic() - self.max_idle_seconds
+            async with self._lock:
+                expired = [
+                    session_id
+                    for session_id, session in self.sessions.items()
+                    if session.last_used < deadline and session.users == 0
+                ]
+                stopped = [self.sessions.pop(session_id) for session_id in expired]
+            for session_id, session in zip(expired, stopped):
+                logger.info("Stopping the kernel of idle session %s", session_id)
+                await self._stop(session)
+
+    async def start_kernel(self, session_id: str) -> KernelSession:
+        """Return the kernel of *session_id*, assigning one if it has none.
 
-    def start_kernel(self, session_id: str):
-        """Start a new Jupyter kernel for the given session ID.
-        
-        If a kernel already exists for this session_id, returns the existing one.
-        
         Args:
             session_id (str): Unique identifier for the session
-            
+
         Returns:
-            dict: Session dictionary containing kernel manager, client, and lock
-            
+            KernelSession: The kernel of the session
+
         Raises:
-            RuntimeError: If kernel fails to start
+            RuntimeError: If the kernel fails to start, or all kernels are busy
         """
-        with self._global_lock:
+        session = await self._claim_kernel(session_id)
+        session.users -= 1
+        return session
+
+    async def _claim_kernel(self, session_id: str) -> KernelSession:
+        """Like ``start_kernel``, counting the caller as a user of the session.
+
+        The claim is taken under ``self._lock`` together with the lookup, so
+        the session cannot be reclaimed before the caller uses it.
+        """
+        await self._bind_loop()
+        async with self._lock:
             session = self.sessions.get(session_id)
             if session:
+                self.sessions.move_to_end(session_id)
+                session.users += 1
                 return session
-            km = KernelManager()
+            if self._spares:
+                session = self._spares.pop()
+                self.sessions[session_id] = session
+                session.users += 1
+            else:
+                if self._get_kernel_count() >= self.max_kernels:
+                    await self._reclaim_lru()
+                self._starting += 1
+        if session is None:
             try:
-                km.start_kernel()
-                client = km.client()
-                client.start_channels()
-                # Wait for the kernel to be ready to avoid first-call race
-                try:
-                    # Some client impls provide wait_for_ready
-                    wait_for_ready = getattr(client, "wait_for_ready", None)
-                    if callable(wait_for_ready):
-                        wait_for_ready(timeout=30)
-                    else:
-                        # Fallback: small grace period to allow kernel to initialize
-                        time.sleep(0.5)
-                except Exception as e:
-                    logger.debug("Kernel wait_for_ready encountered an issue: %s", e)
-            except Exception as e:
-                logger.error("Failed to start kernel for session %s: %s", session_id, e)
-                raise RuntimeError(f"Error starting Jupyter kernel: {e}") from e
-            session = {
-                "kernel_manager": km,
-                "client": client,
-                "lock": threading.RLock(),
-            }
-            self.sessions[session_id] = session
-            return session
-
-    def stop_kernel(self, session_id: str):
+                session = await self._start_kernel()
+            finally:
+                async with self._lock:
+                    self._starting -= 1
+            async with self._lock:
+                if session_id in self.sessions:
+                    # Another call of the same session got a kernel first
+                    self._spares.append(session)
+                    session = self.sessions[session_id]
+                else:
+                    self.sessions[session_id] = session
+                session.users += 1
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap())
+        self.start_warm_up()
+        return session
+
+    async def stop_kernel(self, session_id: str):
         """Stop and cleanup the Jupyter kernel for the given session ID.
-        
+
         Args:
             session_id (str): Unique identifier for the session to stop
         """
-        with self._global_lock:
-            if session_id in self.sessions:
-                session = self.sessions[session_id]
-                try:
-                    session["client"].stop_channels()
-                except Exception as e:
-                    logger.debug("stop_channels error for %s: %s", session_id, e)
-                try:
-                    session["kernel_manager"].shutdown_kernel()
-                except Exception as e:
-                    logger.debug("shutdown_kernel error for %s: %s", session_id, e)
-                del self.sessions[session_id]
+        await self._bind_loop()
+        async with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session:
+            await self._stop(session)
+
+    async def interrupt_kernel(self, session_id: str):
+        """Interrupt the code currently running in the session's kernel.
 
-    def _collect_outputs(self, client, msg_id: str, total_timeout: float = 30.0) -> str:
+        The session and its state are kept, only the running cell is aborted.
+
+        Args:
+            session_id (str): Unique identifier for the session to interrupt
+        """
+        session = self.sessions.get(session_id)
+        if session:
+            try:
+                await session.kernel_manager.interrupt_kernel()
+            except Exception as e:
+                logger.debug("interrupt_kernel error for %s: %s", session_id, e)
+
+    async def _collect_outputs(
+        self, client, msg_id: str, total_timeout: float = 30.0
+    ) -> str:
         """Collect all output messages from the kernel execution.
-        
+
         Args:
             client: Jupyter client instance
             msg_id (str): Message ID to track
             total_timeout (float): Maximum time to wait for output
-            
+
         Returns:
             str: Combined output from all messages
         """
         outputs: list[str] = []
-        deadline = time.time() + total_timeout
-        saw_idle = False
-        while time.time() < deadline:
+        deadline = time.monotonic() + total_timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                msg = client.get_iopub_msg(timeout=0.5)
+                msg = await client.get_iopub_msg(timeout=remaining)
             except Empty:
-                continue
-            except Exception as e:
-                logger.debug("get_iopub_msg error: %s", e)
-                continue
+                break
 
             msg_type = msg.get("header", {}).get("msg_type")
-            parent_id = msg.get("parent_header", {}).get("msg_id")
-
-            # 'status' messages may not always carry the same parent id
-            if msg_type != "status" and parent_id != msg_id:
+            if msg.get("parent_header", {}).get("msg_id") != msg_id:
                 continue
 
             if msg_type == "status":
-                state = msg.get("content", {}).get("execution_state")
-                if state == "idle":
-                    saw_idle = True
+                if msg.get("content", {}).get("execution_state") == "idle":
                     break
                 continue
 
@@ -242,10 +390,11 @@ class CodeInterpreter:
                 evalue = msg.get("content", {}).get("evalue", "")
                 outputs.append(f"{ename}: {evalue}")
 
-        # Best-effort: ensure we have received execute_reply for our message
+        # Best-effort: consume the execute_reply of our message
         try:
-            while time.time() < deadline:
-                reply = client.get_shell_msg(timeout=0.1)
+            while True:
+                remaining = max(deadline - time.monotonic(), 0.1)
+                reply = await client.get_shell_msg(timeout=remaining)
                 if reply.get("parent_header", {}).get("msg_id") == msg_id:
                     break
         except Exception:
@@ -253,30 +402,67 @@ class CodeInterpreter:
 
         return "\n".join([o for o in outputs if o]).strip()
 
-    def execute_code(self, session_id: str, code: str) -> str:
+    async def execute_code(self, session_id: str, code: str) -> str:
         """Execute Python code in the specified session's kernel.
-        
+
         Args:
             session_id (str): Session identifier
             code (str): Python code to execute
-            
+
         Returns:
             str: Output from code execution
-            
+
         Raises:
             RuntimeError: If kernel fails to start or execute code
         """
-        session = self.start_kernel(session_id)
-        client = session["client"]
-        # Serialize execution per session to prevent concurrent reads on client queues
-        with session["lock"]:
-            msg_id = client.execute(code)
-            return self._collect_outputs(client, msg_id)
+        session = await self._claim_kernel(session_id)
+        try:
+            # Serialize execution per session to prevent concurrent reads on client queues
+            async with session.lock:
+                msg_id = session.client.execute(code)
+                return await self._collect_outputs(session.client, msg_id)
+        finally:
+            session.users -= 1
+            session.last_used = time.monotonic()
+
+    async def close(self):
+        """Stop every kernel of the pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        for task in list(self._background_tasks):
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        sessions = list(self.sessions.values()) + self._spares
+        self.sessions.clear()
+        self._spares = []
+        for session in sessions:
+            await self._stop(session)
 
 
 code_interpreter_instance = CodeInterpreter()
 
 
+class CodeInterpreterToolsHub(FunctionHub):
+    """Code interpreter tools, pre-warming kernels when the MAS starts."""
+
+    min_idle_kernels: int = Field(1, description="Spare kernels for new sessions")
+    max_kernels: int = Field(8, description="Kernels running at most")
+    max_idle_seconds: float = Field(
+        600.0, description="Idle time after which a session is stopped"
+    )
+
+    async def init(self):
+        await super().init()
+        code_interpreter_instance.min_idle_kernels = self.min_idle_kernels
+        code_interpreter_instance.max_kernels = self.max_kernels
+        code_interpreter_instance.max_idle_seconds = self.max_idle_seconds
+        code_interpreter_instance.start_warm_up()
+
+
+code_interpreter_tools = CodeInterpreterToolsHub(name="code_interpreter_tools")
+
+
 @code_interpreter_tools.tool(
     description="Executes Python code in a stateful session. Use the same session_id to maintain state across multiple calls."
 )
@@ -310,22 +496,19 @@ async def execute_code(
     Note:
         - Variables and imports persist within the same session
         - Each session runs in an isolated Jupyter kernel
-        - Remember to call stop_session when finished to free resources
+        - Idle sessions are stopped automatically, stop_session frees resources sooner
         - Errors are returned as formatted strings, not raised as exceptions
     """
-    loop = asyncio.get_running_loop()
     if not session_id or not isinstance(session_id, str):
         return "Error: 'session_id' must be a non-empty string"
     if not code or not isinstance(code, str):
         return "Error: 'code' must be a non-empty string"
     try:
-        result = await loop.run_in_executor(
-            None,
-            code_interpreter_instance.execute_code,
-            session_id,
-            code,
-        )
-        return result
+        return await code_interpreter_instance.execute_code(session_id, code)
+    except asyncio.CancelledError:
+        # Stop the running cell, the kernel would go on executing it
+        await code_interpreter_instance.interrupt_kernel(session_id)
+        raise
     except Exception as e:
         logger.warning("Code execution failed for session %s: %s", session_id, e)
         return f"Error: {e}"
@@ -357,9 +540,8 @@ async def stop_session(
         - Once stopped, the session cannot be resumed
         - Errors are returned as formatted strings, not raised as exceptions
     """
-    loop = asyncio.get_running_loop()
     try:
-        await loop.run_in_executor(None, code_interpreter_instance.stop_kernel, session_id)
+        await code_interpreter_instance.stop_kernel(session_id)
         return f"Session {session_id} stopped."
     except Exception as e:
         logger.warning("Failed to stop session %s: %s", session_id, e)
@@ -31,7 +31,7 @@ from fastapi.responses import RedirectResponse
 from pydantic import BaseModel
 
 from .config import Config
-from .databases.db_es import JesEs, LocalEs
+from .databases import db_es
 from .db_factory import DBFactory
 from .oxy_factory import OxyFactory, SecurityError
 from .schemas import OxyRequest, WebResponse
@@ -102,9 +102,9 @@ async def get_node_info(item_id: str):
         hosts = jes_config["hosts"]
         user = jes_config["user"]
         password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
+        es_client = db_factory.get_instance(db_es.JesEs, hosts, user, password)
     else:
-        es_client = db_factory.get_instance(LocalEs)
+        es_client = db_factory.get_instance(db_es.LocalEs)
     es_response = await es_client.search(
         Config.get_app_name() + "_node", {"query": {"term": {"_id": item_id}}}
     )
@@ -191,9 +191,9 @@ async def get_task_info(item_id: str):
         hosts = jes_config["hosts"]
         user = jes_config["user"]
         password = jes_config["password"]
-        es_client = db_factory.get_instance(JesEs, hosts, user, password)
+        es_client = db_factory.get_instance(db_es.JesEs, hosts, user, password)
     else:
-        es_client = db_factory.get_instance(LocalEs)
+        es_client = db_factory.get_instance(db_es.LocalEs)
 
     # es_client.exists(Config.get_app_name() + "_node", doc_id=item_id)
 
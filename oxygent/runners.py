@@ -0,0 +1,284 @@
+"""runners.py Pooled and sharded MAS instances for batch runs.
+
+NOTE: This module contains the following parts:
+    - MASPool: building a MAS spawns every MCP server, sets up logging and the
+      databases and builds the agent organization, so a batch that builds one
+      MAS per item runs at process-spawn speed. MASPool builds a few MAS once,
+      hands each item to an idle one and resets its session afterwards, so
+      items never share a MAS at the same time but the MAS stays warm.
+    - run_sharded_batch: one MAS runs in one event loop, on one core. The
+      items of a batch are sharded across worker processes, each with a MAS
+      of its own, and the results are merged back in order.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, Union
+
+from .config import Config
+from .mas import MAS
+from .oxy.llms.base_llm import BaseLLM
+from .schemas import OxyResponse
+
+logger = logging.getLogger(__name__)
+
+
+class MASPool:
+    """Fixed-size pool of warm MAS instances.
+
+    Examples
+    --------
+    >>> async with MASPool(create_oxy_space, size=5) as pool:
+    ...     response = await pool.chat_with_agent({"query": "What time is it?"})
+    """
+
+    def __init__(
+        self,
+        func_create_oxy_space: Callable[[], list],
+        size: int = 1,
+        is_reset_usage: bool = False,
+        **mas_kwargs,
+    ):
+        """
+        Args:
+            func_create_oxy_space: Returns a fresh oxy space, called once per MAS
+                since Oxy instances cannot be shared between MAS.
+            size: Number of MAS instances, i.e. of items run at the same time.
+            is_reset_usage: Whether LLM usage is cleared between items.
+            **mas_kwargs: Extra arguments of each MAS.
+        """
+        self.func_create_oxy_space = func_create_oxy_space
+        self.size = size
+        self.is_reset_usage = is_reset_usage
+        self.mas_kwargs = mas_kwargs
+        self.mas_list: list[MAS] = []
+        self._idle: Optional[asyncio.Queue] = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        """Build and initialize the MAS instances one after another."""
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            mas = await MAS.create(
+                oxy_space=self.func_create_oxy_space(), **self.mas_kwargs
+            )
+            self.mas_list.append(mas)
+            self._idle.put_nowait(mas)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow an idle MAS, resetting its session when it is given back."""
+        if self._idle is None:
+            raise RuntimeError("MASPool is not started")
+        mas = await self._idle.get()
+        try:
+            yield mas
+        finally:
+            try:
+                await mas.reset_session(is_reset_usage=self.is_reset_usage)
+            finally:
+                self._idle.put_nowait(mas)
+
+    async def chat_with_agent(self, payload: dict, **kwargs) -> OxyResponse:
+        """Run :meth:`MAS.chat_with_agent` on an idle MAS of the pool."""
+        async with self.acquire() as mas:
+            return await mas.chat_with_agent(payload=payload, **kwargs)
+
+    async def close(self):
+        """Shut down every MAS of the pool."""
+        mas_list, self.mas_list = self.mas_list, []
+        self._idle = None
+        for mas in mas_list:
+            try:
+                await mas.__aexit__(None, None, None)
+            except Exception as e:
+                logger.warning(f"Error closing MAS {mas.name}: {e}")
+
+
+def _split_rate_limits(oxy_space: list, num_workers: int):
+    """Give each worker its share of the RPM / TPM budgets of the LLMs."""
+    for oxy in oxy_space:
+        if not isinstance(oxy, BaseLLM):
+            continue
+        if oxy.rpm_limit:
+            oxy.rpm_limit = max(1, oxy.rpm_limit // num_workers)
+        if oxy.tpm_limit:
+            oxy.tpm_limit = max(1, oxy.tpm_limit // num_workers)
+
+
+async def _run_shard_items(
+    func_create_oxy_space: Callable[[], list],
+    indexed_payloads: list,
+    max_concurrency: int,
+    num_workers: int,
+    mas_kwargs: dict,
+) -> dict:
+    semaphore = asyncio.Semaphore(max_concurrency)
+    oxy_space = func_create_oxy_space()
+    if not Config.get_redis_config():
+        # Without Redis the budgets are per process, not shared by the workers
+        _split_rate_limits(oxy_space, num_workers)
+    async with MAS(oxy_space=oxy_space, **mas_kwargs) as mas:
+
+        async def run_item(index, payload):
+            async with semaphore:
+                try:
+                    oxy_response = await mas.chat_with_agent(payload=payload)
+                except Exception as e:
+                    return index, {"output": None, "error": str(e)}
+                return index, {
+                    "output": oxy_response.output,
+                    "state": oxy_response.state.name,
+                    "trace_id": oxy_response.oxy_request.current_trace_id,
+                }
+
+        results = await asyncio.gather(
+            *[run_item(index, payload) for index, payload in indexed_payloads]
+        )
+        return {"results": results, "metrics": mas.get_metrics()}
+
+
+def _run_shard(
+    config: dict,
+    shard_id: int,
+    func_create_oxy_space: Callable[[], list],
+    indexed_payloads: list,
+    max_concurrency: int,
+    num_workers: int,
+    mas_kwargs: dict,
+) -> dict:
+    """Entry point of a worker process."""
+    Config.set_config(config)  # Spawned workers start from the default config
+    if not Config.get_es_config():
+        # LocalEs rewrites whole files, which processes must not share
+        Config.set_cache_save_dir(
+            os.path.join(Config.get_cache_save_dir(), f"shard_{shard_id}")
+        )
+    return asyncio.run(
+        _run_shard_items(
+            func_create_oxy_space,
+            indexed_payloads,
+            max_concurrency,
+            num_workers,
+            mas_kwargs,
+        )
+    )
+
+
+def _merge_usage(usages: list) -> dict:
+    merged = {}
+    for usage in usages:
+        for llm_name, counters in usage.items():
+            merged_counters = merged.setdefault(llm_name, {})
+            for key, value in counters.items():
+                if isinstance(value, (int, float)):
+                    merged_counters[key] = merged_counters.get(key, 0) + value
+    return merged
+
+
+async def run_sharded_batch(
+    func_create_oxy_space: Callable[[], list],
+    payloads: list[Union[str, dict]],
+    num_workers: Optional[int] = None,
+    max_concurrency: int = 5,
+    **mas_kwargs,
+) -> tuple[list[dict], dict]:
+    """Run a batch across worker processes, each with a MAS of its own.
+
+    Items are dealt round-robin to the workers, which run up to
+    *max_concurrency* items at once. Workers are spawned, so
+    *func_create_oxy_space* must be a module-level function and the calling
+    script needs an ``if __name__ == "__main__"`` guard. Workers inherit the
+    config of the caller and so share its Elasticsearch and Redis. Without
+    Elasticsearch every worker keeps its local stores in a ``shard_<i>``
+    subdirectory of the cache directory. Without Redis the RPM / TPM limits
+    of the LLMs cannot be shared, so each worker gets an equal part of them.
+
+    Examples
+    --------
+    >>> results, metrics = await run_sharded_batch(
+    ...     create_oxy_space, ["What time is it?", "1 + 1 = ?"], num_workers=2
+    ... )
+
+    Args:
+        func_create_oxy_space: Returns the oxy space of a worker MAS.
+        payloads: Queries or :meth:`MAS.chat_with_agent` payloads.
+        num_workers: Number of worker processes, the CPU count by default.
+        max_concurrency: Items run at the same time by each worker.
+        **mas_kwargs: Extra arguments of each MAS.
+
+    Returns:
+        tuple: The results in the order of *payloads*, each with ``output``,
+        ``state`` and ``trace_id``, or ``error`` if the request or its worker
+        failed, and the metrics: the LLM usage summed over the workers, the
+        metrics of every worker and the errors of the failed workers.
+    """
+    if not payloads:
+        return [], {"llm_usage": {}, "workers": []}
+    payloads = [
+        {"query": payload} if isinstance(payload, str) else dict(payload)
+        for payload in payloads
+    ]
+    num_workers = max(1, min(num_workers or os.cpu_count() or 1, len(payloads)))
+    shards = [
+        list(enumerate(payloads))[shard_id::num_workers]
+        for shard_id in range(num_workers)
+    ]
+    config = Config.get_config()
+    if num_workers > 1 and not Config.get_redis_config():
+        logger.warning(
+            f"No Redis configured, each of the {num_workers} workers gets "
+            f"1/{num_workers} of the LLM rate limits."
+        )
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        max_workers=num_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        shard_outputs = await asyncio.gather(
+            *[
+                loop.run_in_executor(
+                    executor,
+                    _run_shard,
+                    config,
+                    shard_id,
+                    func_create_oxy_space,
+                    shard,
+                    max_concurrency,
+                    num_workers,
+                    mas_kwargs,
+                )
+                for shard_id, shard in enumerate(shards)
+            ],
+            return_exceptions=True,
+        )
+
+    results = [None] * len(payloads)
+    worker_metrics, worker_errors = [], {}
+    for shard_id, shard_output in enumerate(shard_outputs):
+        if isinstance(shard_output, BaseException):
+            # A crashed worker fails its own items, not the whole batch
+            error = f"Worker {shard_id} failed: {shard_output!r}"
+            logger.error(error)
+            worker_errors[shard_id] = error
+            for index, _ in shards[shard_id]:
+                results[index] = {"output": None, "error": error}
+            continue
+        for index, result in shard_output["results"]:
+            results[index] = result
+        worker_metrics.append(shard_output["metrics"])
+    metrics = {
+        "llm_usage": _merge_usage([m["llm_usage"] for m in worker_metrics]),
+        "workers": worker_metrics,
+        "worker_errors": worker_errors,
+    }
+    return results, metrics
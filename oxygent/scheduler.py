@@ -0,0 +1,188 @@
+"""scheduler.py MAS-level admission control and weighted fair scheduling.
+
+NOTE: This module contains the following parts:
+    - FairQueue: a counting semaphore whose waiters are granted by priority
+      class first and by weighted-fair virtual finish time per tenant second
+    - MASScheduler: the single queueing policy shared by a MAS. It bounds the
+      number of concurrently running top-level requests, sheds overload and
+      replaces the per-Oxy ``asyncio.Semaphore`` waits with fair queues.
+    The tenant of a request is ``OxyRequest.tenant_id`` (falling back to
+    ``group_id``) and its priority class is ``OxyRequest.priority``. Both are
+    inherited by every descendant call of the request.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class OverloadError(Exception):
+    """Raised when a request is shed because the admission queue is full."""
+
+
+class FairQueue:
+    """Capacity-limited queue granting slots with weighted fair queuing.
+
+    Waiters are ordered by ``(priority rank, virtual finish tag)``. A tenant
+    with weight ``w`` advances its finish tag by ``1 / w`` per request, so
+    within one priority class tenants share the capacity proportionally to
+    their weights no matter how many requests each of them has queued.
+    """
+
+    def __init__(self, capacity: int, max_waiting: int = 0):
+        self.capacity = max(1, int(capacity))
+        self.max_waiting = max_waiting  # 0 means unbounded
+        self.in_flight = 0
+        self.waiting = 0
+        self._heap = []
+        self._seq = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: dict[str, float] = {}
+
+    def set_capacity(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._dispatch()
+
+    def is_full(self) -> bool:
+        return bool(self.max_waiting) and self.waiting >= self.max_waiting
+
+    async def acquire(self, tenant: str = "", rank: int = 0, weight: float = 1.0):
+        if self.in_flight < self.capacity and not self.waiting:
+            self.in_flight += 1
+            return
+        if self.is_full():
+            raise OverloadError(
+                f"Server is overloaded: {self.waiting} requests are already waiting."
+            )
+        start = max(self._virtual_time, self._last_finish.get(tenant, 0.0))
+        finish = start + 1.0 / max(weight, 1e-6)
+        self._last_finish[tenant] = finish
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (rank, finish, next(self._seq), future))
+        self.waiting += 1
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted right before the cancellation arrived
+                self.release()
+            else:
+                self.waiting -= 1
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        while self.in_flight < self.capacity and self._heap:
+            _, finish, _, future = heapq.heappop(self._heap)
+            if future.done():  # cancelled waiter, already uncounted
+                continue
+            self.waiting -= 1
+            self.in_flight += 1
+            self._virtual_time = max(self._virtual_time, finish)
+            future.set_result(None)
+        if len(self._last_finish) > 1024:
+            self._last_finish = {
+                k: v for k, v in self._last_finish.items() if v > self._virtual_time
+            }
+
+    @asynccontextmanager
+    async def slot(self, tenant: str = "", rank: int = 0, weight: float = 1.0):
+        await self.acquire(tenant, rank, weight)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+class MASScheduler:
+    """The queueing policy shared by all requests and Oxy of one MAS.
+
+    Attributes:
+        max_concurrency (int): Maximum number of top-level requests running
+            at the same time.
+        max_queue_size (int): Maximum number of top-level requests waiting
+            for admission; beyond it requests are shed with ``OverloadError``.
+        priority_classes (list[str]): Priority class names, highest first.
+        default_priority (str): Class used when a request does not name one.
+        tenant_weights (dict[str, float]): Weight per tenant, default ``1.0``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        max_queue_size: int = 256,
+        priority_classes: Optional[list] = None,
+        default_priority: str = "interactive",
+        tenant_weights: Optional[dict] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.priority_classes = priority_classes or ["interactive", "batch"]
+        self.default_priority = default_priority
+        self.tenant_weights = tenant_weights or {}
+        self._admission_queue = FairQueue(max_concurrency, max_queue_size)
+        self._oxy_queues: dict[str, FairQueue] = {}
+
+    @classmethod
+    def from_config(cls) -> "MASScheduler":
+        return cls(
+            max_concurrency=Config.get_scheduler_max_concurrency(),
+            max_queue_size=Config.get_scheduler_max_queue_size(),
+            priority_classes=Config.get_scheduler_priority_classes(),
+            default_priority=Config.get_scheduler_default_priority(),
+            tenant_weights=Config.get_scheduler_tenant_weights(),
+        )
+
+    def get_ticket(self, oxy_request) -> tuple:
+        """Return the ``(tenant, rank, weight)`` used to queue a request."""
+        tenant = oxy_request.tenant_id or oxy_request.group_id
+        priority = oxy_request.priority or self.default_priority
+        if priority in self.priority_classes:
+            rank = self.priority_classes.index(priority)
+        else:
+            rank = len(self.priority_classes)
+        weight = float(self.tenant_weights.get(tenant, 1.0))
+        return tenant, rank, weight
+
+    def is_overloaded(self) -> bool:
+        return self._admission_queue.is_full()
+
+    @asynccontextmanager
+    async def admit(self, oxy_request):
+        """Admit a top-level request, raising ``OverloadError`` when shed."""
+        async with self._admission_queue.slot(*self.get_ticket(oxy_request)):
+            yield
+
+    @asynccontextmanager
+    async def slot(self, oxy_name: str, capacity: int, oxy_request):
+        """Occupy one of the ``capacity`` concurrent slots of an Oxy."""
+        queue = self._oxy_queues.get(oxy_name)
+        if queue is None:
+            queue = self._oxy_queues[oxy_name] = FairQueue(capacity)
+        elif queue.capacity != capacity:
+            queue.set_capacity(capacity)
+        async with queue.slot(*self.get_ticket(oxy_request)):
+            yield
+
+    def get_stats(self) -> dict:
+        return {
+            "admission": self._admission_queue.get_stats(),
+            "oxy": {name: q.get_stats() for name, q in self._oxy_queues.items()},
+        }
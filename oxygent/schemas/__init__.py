@@ -1,6 +1,6 @@
 from .color import Color
 from .llm import LLMResponse, LLMState
-from .memory import Memory, Message
+from .memory import ConversationBuilder, Memory, Message
 from .message import SSEMessage
 from .observation import ExecResult, Observation
 from .oxy import OxyOutput, OxyRequest, OxyResponse, OxyState
@@ -12,6 +12,7 @@ __all__ = [
     "LLMResponse",
     "Message",
     "Memory",
+    "ConversationBuilder",
     "Observation",
     "ExecResult",
     "OxyState",
@@ -181,3 +181,50 @@ class Memory(BaseModel):
                 messages.insert(0, self.messages[0])
             return [msg.to_dict() for msg in messages]
         return [msg.to_dict() for msg in self.messages]
+
+
+# --------------------------------------------------------------------
+# Incremental prompt builder
+# --------------------------------------------------------------------
+
+
+class ConversationBuilder(BaseModel):
+    """Chat payload assembled incrementally across agent rounds.
+
+    The prefix (system instruction, history and current query) is rendered to
+    dicts once, and each round only renders the messages it appends. Payloads
+    share the rendered dicts and always start with the same prefix, so
+    provider-side prompt caching can reuse it from one round to the next.
+    """
+
+    prefix: List[dict] = Field(default_factory=list)
+    messages: List[dict] = Field(default_factory=list)
+    max_messages: int = Field(default=50)
+
+    @classmethod
+    def from_messages(cls, messages: List[Message], **kwargs) -> "ConversationBuilder":
+        """Render the prefix of the conversation once."""
+        return cls(prefix=[message.to_dict() for message in messages], **kwargs)
+
+    def add_message(self, message: Message) -> None:
+        """Append a message to the conversation."""
+        self.messages.append(message.to_dict())
+
+    def add_messages(self, messages: List[Message]) -> None:
+        """Append multiple messages to the conversation."""
+        self.messages.extend(message.to_dict() for message in messages)
+
+    def to_dict_list(self, short_memory_size=None) -> List[dict]:
+        """Return the payload, trimmed the same way as ``Memory.to_dict_list``."""
+        if short_memory_size is None:
+            short_memory_size = self.max_messages // 2
+        dict_list = self.prefix + self.messages
+        if len(dict_list) > short_memory_size * 2 + 2:
+            trimmed = dict_list[0 - (short_memory_size * 2 + 1) :]
+            # Tool results must follow the assistant message that called them
+            while trimmed and trimmed[0]["role"] == "tool":
+                trimmed.pop(0)
+            if dict_list[0]["role"] == "system":
+                trimmed.insert(0, dict_list[0])
+            return trimmed
+        return dict_list
@@ -15,11 +15,13 @@ import logging
 import traceback
 from enum import Enum, auto
 from functools import partial
-from typing import Any, List, Optional, Union
+from typing import Any, Callable, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
+from ..cancellation import CancelScope
 from ..config import Config
+from ..limiters import get_backoff_delay
 from ..utils.common_utils import generate_uuid, is_image
 from .message import SSEMessage
 
@@ -64,6 +66,12 @@ class OxyRequest(BaseModel):
         default_factory=generate_uuid,
         description="Static group identifier for trace trees.",
     )
+    tenant_id: Optional[str] = Field(
+        "", description="Tenant for fair scheduling, defaults to group_id."
+    )
+    priority: Optional[str] = Field(
+        "", description="Scheduling priority class, e.g. interactive or batch."
+    )
     from_trace_id: Optional[str] = Field("", description="")
     current_trace_id: Optional[str] = Field(
         default_factory=generate_uuid, description=""
@@ -110,10 +118,25 @@ class OxyRequest(BaseModel):
     group_data: dict = Field(
         default_factory=dict, description="public data in the scope of a session group"
     )
+    func_stream_listener: Optional[Callable[[str], None]] = Field(
+        None,
+        exclude=True,
+        description="Receives the streamed deltas of this call, not inherited",
+    )
+    func_stream_gate: Optional[Callable[[], bool]] = Field(
+        None,
+        exclude=True,
+        description="Whether the stream of this call is forwarded, not inherited",
+    )
 
     @property
     def session_name(self) -> str:  # We use a easy method to create session name
-        return self.caller + "__" + self.callee
+        session_name = self.caller + "__" + self.callee
+        # The members of a team are one agent, each keeps a history of its own
+        team_member_id = self.arguments.get("team_member_id")
+        if team_member_id:
+            session_name += f"__{team_member_id}"
+        return session_name
 
     def set_mas(self, mas):
         self.mas = mas
@@ -180,7 +203,7 @@ class OxyRequest(BaseModel):
 
         Retries
         -------
-        Controlled by `oxy.retries` and `oxy.delay`.
+        Controlled by `oxy.retries` and the backoff settings of `oxy`.
 
         Returns:
             OxyResponse: Completed or FAILED after exhausting retries.
@@ -201,7 +224,15 @@ class OxyRequest(BaseModel):
                     },
                 )
                 if attempt < oxy.retries:
-                    await asyncio.sleep(oxy.delay)
+                    await asyncio.sleep(
+                        get_backoff_delay(
+                            attempt,
+                            oxy.delay,
+                            getattr(oxy, "max_delay", oxy.delay),
+                            getattr(oxy, "backoff_factor", 1.0),
+                            e,
+                        )
+                    )
                 else:
                     error_msg = traceback.format_exc()
                     logger.warning(
@@ -350,10 +381,56 @@ class OxyRequest(BaseModel):
             )
         # return await self.retry_execute(oxy, oxy_request)
 
+    def get_cancel_scope(self) -> CancelScope:
+        """Return the cancel scope of the current trace."""
+        get_cancel_scope = getattr(self.mas, "get_cancel_scope", None)
+        if get_cancel_scope is None:
+            return CancelScope(self.current_trace_id)
+        return get_cancel_scope(self.current_trace_id)
+
+    async def gather(self, *coros, return_exceptions=False) -> list:
+        """Run calls concurrently inside the cancel scope of the trace.
+
+        Examples
+        --------
+        >>> oxy_responses = await req.gather(
+        ...     req.call(callee="tool_a", arguments={}),
+        ...     req.call(callee="tool_b", arguments={}),
+        ... )
+        """
+        return await self.get_cancel_scope().gather(
+            *coros, return_exceptions=return_exceptions
+        )
+
+    def as_completed(self, *coros, timeout: Optional[float] = None):
+        """Iterate over concurrent calls as they complete, see ``CancelScope``.
+
+        Examples
+        --------
+        >>> async with aclosing(req.as_completed(*calls, timeout=30)) as results:
+        ...     async for index, oxy_response in results:
+        ...         print(index, oxy_response.output)
+        """
+        return self.get_cancel_scope().as_completed(*coros, timeout=timeout)
+
+    def _is_stream_open(self) -> bool:
+        return self.func_stream_gate is None or self.func_stream_gate()
+
+    def on_stream_delta(self, delta: str):
+        """Forward a streamed LLM delta to the listener of this call, if any."""
+        if self.func_stream_listener and self._is_stream_open():
+            self.func_stream_listener(delta)
+
     async def start(self) -> "OxyResponse":
         return await self.get_oxy(self.callee).execute(self)
 
     async def send_message(self, message=None, event=None, id=None):
+        if (
+            isinstance(message, dict)
+            and message.get("type") in ("stream", "stream_end")
+            and not self._is_stream_open()
+        ):
+            return
         if self.mas:
             args = {"id": id, "event": event, "data": message}
             filtered_args = {k: v for k, v in args.items() if v is not None}
@@ -458,8 +535,9 @@ class OxyRequest(BaseModel):
         self.mas.global_data[key] = value
 
     async def break_task(self):
+        """Stop the whole trace: every running call of it is cancelled."""
         await self.send_message(message="done", event="close")
-        self.mas.active_tasks[self.current_trace_id].cancel()
+        self.mas.cancel_trace(self.current_trace_id, reason="break_task")
 
 
 class OxyResponse(BaseModel):
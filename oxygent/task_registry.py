@@ -0,0 +1,111 @@
+"""task_registry.py Cross-worker registry of running traces.
+
+NOTE: With several web workers a trace runs in the process that received its
+request, while a cancel request may reach any of them. Each worker records
+the traces it runs under ``{prefix}:task_owner:{trace_id}`` in the shared
+Redis and listens on its own command list ``{prefix}:worker_cmd:{worker_id}``,
+so a cancel request is forwarded to the worker that owns the trace.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Callable, Optional
+
+from .utils.common_utils import generate_uuid
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRegistry:
+    """Owner lookup and cancel forwarding for traces, backed by Redis.
+
+    Examples
+    --------
+    >>> registry = TaskRegistry(redis_client, "oxygent:app")
+    >>> registry.start(mas.cancel_trace)
+    >>> await registry.request_cancel(trace_id)  # From any worker
+    """
+
+    def __init__(
+        self,
+        redis_client,
+        prefix: str,
+        worker_id: Optional[str] = None,
+        poll_interval: float = 0.1,
+        expire_seconds: int = 86400,
+    ):
+        self.redis_client = redis_client
+        self.prefix = prefix
+        self.worker_id = worker_id or generate_uuid()
+        self.poll_interval = poll_interval
+        self.expire_seconds = expire_seconds
+        self._listener: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def is_supported(redis_client) -> bool:
+        """Whether *redis_client* is shared between processes.
+
+        LocalRedis keeps its data in process and has no ``get``.
+        """
+        return hasattr(redis_client, "get") and hasattr(redis_client, "delete")
+
+    def _get_owner_key(self, trace_id: str) -> str:
+        return f"{self.prefix}:task_owner:{trace_id}"
+
+    def _get_command_key(self, worker_id: str) -> str:
+        return f"{self.prefix}:worker_cmd:{worker_id}"
+
+    async def register(self, trace_id: str):
+        await self.redis_client.set(
+            self._get_owner_key(trace_id), self.worker_id, ex=self.expire_seconds
+        )
+
+    async def unregister(self, trace_id: str):
+        await self.redis_client.delete(self._get_owner_key(trace_id))
+
+    async def get_owner(self, trace_id: str) -> Optional[str]:
+        owner = await self.redis_client.get(self._get_owner_key(trace_id))
+        return owner.decode() if isinstance(owner, bytes) else owner
+
+    async def request_cancel(self, trace_id: str, reason: str = "cancelled") -> bool:
+        """Forward a cancel request to the worker running *trace_id*.
+
+        Returns:
+            bool: Whether some worker is running the trace.
+        """
+        owner = await self.get_owner(trace_id)
+        if not owner:
+            return False
+        await self.redis_client.lpush(
+            self._get_command_key(owner),
+            json.dumps({"action": "cancel", "trace_id": trace_id, "reason": reason}),
+            ex=self.expire_seconds,
+        )
+        return True
+
+    async def _listen(self, func_cancel: Callable[[str, str], bool]):
+        key = self._get_command_key(self.worker_id)
+        while True:
+            try:
+                command = await self.redis_client.rpop(key)
+                command = json.loads(command) if command is not None else None
+            except Exception as e:
+                logger.warning(f"Reading worker commands failed: {e}")
+                command = None
+            if command is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if command.get("action") == "cancel":
+                func_cancel(command["trace_id"], command.get("reason", "cancelled"))
+
+    def start(self, func_cancel: Callable[[str, str], bool]):
+        """Serve the cancel requests sent to this worker with *func_cancel*."""
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen(func_cancel))
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
@@ -0,0 +1,162 @@
+"""tool_cache.py Memoization of deterministic tool results.
+
+NOTE: This module contains the following parts:
+    - ToolCachePolicy: the declarative policy of a tool (TTL, key function,
+      path arguments whose file modification time invalidates the entry and
+      whether the Redis tier is used)
+    - ToolResultCache: the process-wide in-memory LRU backing every tool,
+      optionally backed by a Redis tier shared across workers
+    Policies are declared with ``BaseTool.cache_policy``, the ``cache_policy``
+    argument of ``FunctionHub.tool`` or ``BaseMCPClient.tool_cache_policies``.
+"""
+
+import copy
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from .config import Config
+from .utils.common_utils import get_md5
+
+logger = logging.getLogger(__name__)
+
+
+class ToolCachePolicy(BaseModel):
+    """How the results of a tool are memoized.
+
+    Examples
+    --------
+    >>> @fh.tool(
+    ...     description="Read an excel file",
+    ...     cache_policy=ToolCachePolicy(ttl=600, path_arguments=["file_path"]),
+    ... )
+    ... def read_excel(file_path: str) -> str: ...
+    """
+
+    ttl: float = Field(300.0, description="Seconds a result stays valid")
+    func_key: Optional[Callable[[dict], Any]] = Field(
+        None, exclude=True, description="Maps arguments to the cache key"
+    )
+    path_arguments: list[str] = Field(
+        default_factory=list,
+        description="Arguments holding file paths, a new mtime invalidates the entry",
+    )
+    is_shared: bool = Field(
+        False, description="Whether the MAS Redis is used as a shared second tier"
+    )
+
+    def get_key(self, tool_name: str, arguments: dict) -> str:
+        key_obj = self.func_key(arguments) if self.func_key else arguments
+        mtimes = {}
+        for path_argument in self.path_arguments:
+            path = arguments.get(path_argument)
+            try:
+                mtimes[path_argument] = os.path.getmtime(path)
+            except (OSError, TypeError):
+                mtimes[path_argument] = None
+        key_str = json.dumps(
+            [key_obj, mtimes], sort_keys=True, ensure_ascii=False, default=str
+        )
+        return f"{tool_name}:{get_md5(key_str)}"
+
+
+class ToolResultCache:
+    """In-memory LRU of tool results with an optional Redis tier.
+
+    Entries are ``(expire_at, output, extra)``. Values are deep-copied on
+    both store and hit, so callers may mutate what they get back.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_redis_key(prefix: str, key: str) -> str:
+        return f"{prefix}:tool_cache:{key}"
+
+    async def get(self, key: str, redis_client=None, prefix: str = "oxygent"):
+        """Return ``(output, extra)`` cached under *key*, or None."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expire_at, output, extra = entry
+            if expire_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(output), copy.deepcopy(extra)
+            del self._entries[key]
+        if redis_client is not None:
+            try:
+                value = await redis_client.get(self._get_redis_key(prefix, key))
+            except Exception as e:
+                logger.warning(f"Tool cache Redis read failed: {e}")
+                value = None
+            data = json.loads(value) if value else None
+            if data and data["expire_at"] > time.time():
+                self._put(key, data["expire_at"], data["output"], data["extra"])
+                self.hits += 1
+                return data["output"], data["extra"]
+        self.misses += 1
+        return None
+
+    def _put(self, key: str, expire_at: float, output, extra: dict):
+        self._entries[key] = (expire_at, copy.deepcopy(output), copy.deepcopy(extra))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def set(
+        self,
+        key: str,
+        output,
+        extra: dict,
+        ttl: float,
+        redis_client=None,
+        prefix: str = "oxygent",
+    ):
+        expire_at = time.time() + ttl
+        self._put(key, expire_at, output, extra)
+        if redis_client is None:
+            return
+        try:
+            value = json.dumps(
+                {"expire_at": expire_at, "output": output, "extra": extra},
+                ensure_ascii=False,
+            )
+        except (TypeError, ValueError):
+            return  # Only JSON results are shared across workers
+        try:
+            await redis_client.set(
+                self._get_redis_key(prefix, key), value, ex=max(1, int(ttl))
+            )
+        except Exception as e:
+            logger.warning(f"Tool cache Redis write failed: {e}")
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_tool_result_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_result_cache() -> ToolResultCache:
+    """Return the process-wide tool result cache."""
+    global _tool_result_cache
+    if _tool_result_cache is None:
+        _tool_result_cache = ToolResultCache(Config.get_tool_cache_max_size() or 1024)
+    return _tool_result_cache
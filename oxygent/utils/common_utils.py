@@ -18,11 +18,9 @@ from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 import aiofiles
 import httpx
 import shortuuid
-from PIL import Image
 from pydantic import AnyUrl
 
 logger = logging.getLogger(__name__)
-Image.MAX_IMAGE_PIXELS = 400000000
 
 
 def is_linux():
@@ -100,6 +98,9 @@ async def image_to_base64(source: str, max_image_pixels: int = 10000000) -> str:
     image_bytes = await source_to_bytes(source)
 
     def process_image(image_bytes):
+        from PIL import Image  # Imported here to keep PIL out of startup
+
+        Image.MAX_IMAGE_PIXELS = 400000000
         with Image.open(BytesIO(image_bytes)) as img:
             width, height = img.size
             current_pixels = width * height
@@ -282,6 +283,28 @@ def to_json(obj):
     return json.dumps(obj, ensure_ascii=False, default=str)
 
 
+def estimate_tokens(obj) -> int:
+    """Roughly estimate the number of tokens of a text or of chat messages.
+
+    Latin text averages about four characters per token while CJK characters
+    take about one token each; media parts are counted as a fixed 765 tokens.
+    """
+    if obj is None:
+        return 0
+    if isinstance(obj, str):
+        cjk_count = len(re.findall(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]", obj))
+        return cjk_count + (len(obj) - cjk_count + 3) // 4
+    if isinstance(obj, dict):
+        if obj.get("type") in ("image_url", "video_url"):
+            return 765
+        if "content" in obj:  # chat message with role overhead
+            return 4 + estimate_tokens(obj["content"])
+        return estimate_tokens(obj.get("text", to_json(obj)))
+    if isinstance(obj, (list, tuple)):
+        return sum(estimate_tokens(item) for item in obj)
+    return estimate_tokens(str(obj))
+
+
 def generate_uuid(length=16):
     return shortuuid.ShortUUID().random(length=length)
 
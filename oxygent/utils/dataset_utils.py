@@ -0,0 +1,100 @@
+"""Reading datasets and appending results for resumable evaluation runs.
+
+Datasets are JSONL or CSV files of items. Results are appended to a JSONL or
+CSV file as soon as each item finishes, so an interrupted run resumes from
+the items it has not completed yet.
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+RESULT_FIELDS = ["output", "state", "trace_id", "error", "latency"]
+
+
+def _is_csv(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() == ".csv"
+
+
+def iter_dataset(path: str, skip_invalid: bool = False) -> Iterator[dict]:
+    """Yield the items of a JSONL or CSV file one at a time.
+
+    Args:
+        path: JSONL or CSV file.
+        skip_invalid: Skip JSONL lines that are not valid JSON instead of
+            raising.
+    """
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        if _is_csv(path):
+            yield from csv.DictReader(f)
+            return
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                if not skip_invalid:
+                    raise
+                logger.warning(f"Skipping invalid JSON at {path}:{line_number}")
+
+
+def read_completed_ids(path: str, id_key: str) -> set:
+    """Return the ids of the items that completed without error in *path*."""
+    if not os.path.exists(path):
+        return set()
+    completed_ids = set()
+    # A line of a crashed run may be cut off, the rows after it still count
+    for row in iter_dataset(path, skip_invalid=True):
+        if row.get("error") or row.get("state") not in (None, "", "COMPLETED"):
+            continue
+        if row.get(id_key) not in (None, ""):
+            completed_ids.add(str(row[id_key]))
+    return completed_ids
+
+
+class ResultWriter:
+    """Append result rows to a JSONL or CSV file, flushing after each row."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fieldnames = None
+        if _is_csv(path) and os.path.exists(path) and os.path.getsize(path):
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                self.fieldnames = next(csv.reader(f), None)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(self, row: dict):
+        if not _is_csv(self.path):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            return
+        is_new = self.fieldnames is None
+        if is_new:
+            self.fieldnames = list(row) + [k for k in RESULT_FIELDS if k not in row]
+        with open(
+            self.path, "a", encoding="utf-8-sig" if is_new else "utf-8", newline=""
+        ) as f:
+            writer = csv.DictWriter(
+                f, fieldnames=self.fieldnames, restval="", extrasaction="ignore"
+            )
+            if is_new:
+                writer.writeheader()
+            writer.writerow(row)
+
+
+def get_percentiles(values: list, percentiles=(50, 90, 99)) -> dict:
+    """Nearest-rank percentiles of *values*, e.g. ``{"p50": 1.2, ...}``."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        f"p{p}": ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+        for p in percentiles
+    }
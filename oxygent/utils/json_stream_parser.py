@@ -0,0 +1,92 @@
+"""json_stream_parser.py Incremental detection of JSON objects in streamed text.
+
+NOTE: LLM deltas are fed as they arrive and every top-level JSON object is
+returned as soon as its closing brace has streamed in, so that tool calls can
+be started while the model keeps generating. Objects inside a top-level array
+are returned one by one, and text between ``<think>`` tags is skipped.
+"""
+
+import json
+
+THINK_START = "<think>"
+THINK_END = "</think>"
+
+
+class JSONStreamParser:
+    """Find complete JSON objects in incrementally received text.
+
+    Each character is scanned once, so feeding a whole response costs
+    O(len(text)) regardless of how it was split into deltas.
+
+    Examples
+    --------
+    >>> parser = JSONStreamParser()
+    >>> parser.feed('{"tool_name": "search", "argu')
+    []
+    >>> parser.feed('ments": {"query": "oxygent"}}')
+    [{'tool_name': 'search', 'arguments': {'query': 'oxygent'}}]
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._start = -1
+        self._depth = 0
+        self._in_string = False
+        self._is_escaped = False
+        self._in_think = False
+
+    def _match_tag(self, tag: str):
+        """Whether *tag* starts at the cursor: True, False or None if unknown yet."""
+        rest = self.text[self._pos : self._pos + len(tag)]
+        if rest == tag:
+            return True
+        if tag.startswith(rest):
+            return None
+        return False
+
+    def feed(self, delta: str) -> list[dict]:
+        """Consume *delta* and return the objects completed by it."""
+        self.text += delta
+        objects = []
+        while self._pos < len(self.text):
+            char = self.text[self._pos]
+            if self._depth == 0:
+                if char == "<":
+                    tag = THINK_END if self._in_think else THINK_START
+                    is_tag = self._match_tag(tag)
+                    if is_tag is None:
+                        # Wait for the rest of a possibly split tag
+                        break
+                    if is_tag:
+                        self._in_think = not self._in_think
+                        self._pos += len(tag)
+                        continue
+                elif char == "{" and not self._in_think:
+                    self._start = self._pos
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._is_escaped:
+                    self._is_escaped = False
+                elif char == "\\":
+                    self._is_escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        obj = json.loads(self.text[self._start : self._pos + 1])
+                    except json.JSONDecodeError:
+                        obj = None
+                    if isinstance(obj, dict):
+                        objects.append(obj)
+            self._pos += 1
+        return objects
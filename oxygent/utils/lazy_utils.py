@@ -0,0 +1,36 @@
+"""Module-level lazy attributes (PEP 562).
+
+A package lists which submodule defines each of its public names, and the
+submodule is imported the first time one of them is accessed, so importing
+the package does not load optional heavy dependencies.
+"""
+
+import importlib
+import sys
+from typing import Callable
+
+
+def lazy_attrs(package: str, attr_to_module: dict) -> tuple[Callable, Callable]:
+    """Build the ``__getattr__`` and ``__dir__`` of *package*.
+
+    Examples
+    --------
+    >>> __getattr__, __dir__ = lazy_attrs(__name__, {"JesEs": ".jes_es"})
+
+    Args:
+        package: ``__name__`` of the package.
+        attr_to_module: Public name to the relative name of its submodule.
+    """
+
+    def __getattr__(name: str):
+        if name not in attr_to_module:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module = importlib.import_module(attr_to_module[name], package)
+        value = getattr(module, name)
+        setattr(sys.modules[package], name, value)  # Later lookups skip this hook
+        return value
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(attr_to_module))
+
+    return __getattr__, __dir__
@@ -0,0 +1,92 @@
+"""web_workers.py Serve one MAS app from several uvicorn worker processes.
+
+NOTE: ``MAS.start_web_service`` runs uvicorn inside the event loop of the
+MAS, which limits the service to a single process. Here uvicorn spawns the
+workers itself and every worker builds a MAS of its own from an importable
+oxy space factory. A chat and its SSE stream are served by the worker that
+received the request, and cancel requests reaching another worker are
+forwarded through the shared Redis (see ``task_registry.py``).
+"""
+
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from .config import Config
+from .mas import MAS
+
+logger = logging.getLogger(__name__)
+
+CONFIG_ENV = "OXYGENT_CONFIG"
+OXY_SPACE_FACTORY_ENV = "OXYGENT_OXY_SPACE_FACTORY"
+MAS_KWARGS_ENV = "OXYGENT_MAS_KWARGS"
+
+
+def create_app():
+    """App factory run by uvicorn in every worker process."""
+    from uvicorn.importer import import_from_string
+
+    if os.environ.get(CONFIG_ENV):
+        Config.set_config(json.loads(os.environ[CONFIG_ENV]))
+    func_create_oxy_space = import_from_string(os.environ[OXY_SPACE_FACTORY_ENV])
+    mas_kwargs = json.loads(os.environ.get(MAS_KWARGS_ENV) or "{}")
+    mas = MAS(oxy_space=func_create_oxy_space(), is_multi_worker=True, **mas_kwargs)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await mas.init()
+        try:
+            yield
+        finally:
+            await mas.__aexit__(None, None, None)
+
+    return mas.create_app(lifespan=lifespan)
+
+
+def run_web_workers(
+    oxy_space_factory: str,
+    workers: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    **mas_kwargs,
+):
+    """Serve the MAS web app from several worker processes.
+
+    Workers share the Elasticsearch and Redis of the config. Without them
+    every worker keeps its own local stores, so history and cross-worker
+    cancel only work within the worker that ran the trace.
+
+    Examples
+    --------
+    >>> run_web_workers("examples.demo:create_oxy_space", workers=4)
+
+    Args:
+        oxy_space_factory: ``"module:function"`` returning the oxy space of a
+            worker MAS, imported again in every worker.
+        workers: Number of worker processes, ``Config.get_server_workers()``
+            by default.
+        host: Host to bind, ``Config.get_server_host()`` by default.
+        port: Port to bind, ``Config.get_server_port()`` by default.
+        **mas_kwargs: Extra JSON-serializable arguments of each MAS.
+    """
+    import uvicorn
+
+    if not Config.get_es_config() or not Config.get_redis_config():
+        logger.warning(
+            "Workers do not share history or cancel requests without "
+            "Elasticsearch and Redis configured."
+        )
+    os.environ[CONFIG_ENV] = json.dumps(Config.get_config())
+    os.environ[OXY_SPACE_FACTORY_ENV] = oxy_space_factory
+    os.environ[MAS_KWARGS_ENV] = json.dumps(mas_kwargs)
+    uvicorn.run(
+        "oxygent.web_workers:create_app",
+        factory=True,
+        host=host or Config.get_server_host(),
+        port=port or Config.get_server_port(),
+        workers=workers or Config.get_server_workers(),
+        log_level=Config.get_server_log_level().lower(),
+        log_config=None,
+    )
@@ -4,7 +4,8 @@ import sys
 import pandas as pd
 import json
 from dotenv import load_dotenv
-from oxygent import MAS, Config, oxy, preset_tools
+from oxygent import Config, oxy, preset_tools
+from oxygent.runners import MASPool
 from oxygent.preset_tools.metaso_tools import metaso_tools, reset_metaso_usage
 import my_first_tools
 
@@ -174,12 +175,14 @@ def create_oxy_space():
             sub_agents=["browser_interact_agent","mysterious_agent",'terminal_agent','search_agent','logic_agent','Image_audio_agent','reflection_agent'], # ,"my_file_agent"
             #prompt=MASTER_PROMPT
             max_react_rounds=5, # Limit the number of reasoning steps
+            speculative_top_k=2, # Start the 2 most likely sub-agents during the first round
+            speculative_agent_names=['search_agent','logic_agent'], # Only side-effect-free agents may start speculatively
         )
     ]
 
-async def process_task(sem, task_id, query, file_name=None, level='unknown', answer=''):
+async def process_task(pool, task_id, query, file_name=None, level='unknown', answer=''):
     """处理单个任务"""
-    async with sem:
+    async with pool.acquire() as mas:
         # Reset usage for this specific task context
         reset_metaso_usage()
         
@@ -190,26 +193,19 @@ async def process_task(sem, task_id, query, file_name=None, level='unknown', ans
             if file_name and isinstance(file_name, str) and file_name.strip():
                  full_query = f"{query}\n\n(Referenced file: {file_name})"
 
-            # Create a fresh MAS environment for each task to ensure no memory leakage
-            oxy_space = create_oxy_space()
+            # The pooled MAS is reset after each task, so no memory leaks across tasks
+            # 发送请求给 Agent
+            payload = {"query": full_query}
+            response = await mas.chat_with_agent(payload=payload)
             
-            # Use try-finally to ensure proper cleanup if MAS doesn't handle it perfectly
-            try:
-                async with MAS(oxy_space=oxy_space) as mas:
-                    # 发送请求给 Agent
-                    payload = {"query": full_query}
-                    response = await mas.chat_with_agent(payload=payload)
-                    
-                    result = {
-                        "task_id": task_id,
-                        "query": query,
-                        "file_name": file_name,
-                        "model_answer": response.output,
-                        "level": level,
-                        "ground_truth": answer
-                    }
-            except Exception as e:
-                raise e
+            result = {
+                "task_id": task_id,
+                "query": query,
+                "file_name": file_name,
+                "model_answer": response.output,
+                "level": level,
+                "ground_truth": answer
+            }
         except Exception as e:
             print(f"Error processing task {task_id}: {e}")
             result = {
@@ -251,22 +247,22 @@ async def main():
     print(f"Loaded {len(df)} tasks from {problem_file}")
 
     # 2. 并发处理所有任务
-    # Limit concurrency to 5 to avoid rate limits
-    sem = asyncio.Semaphore(5)
-    tasks = []
-    
-    for _, row in df.iterrows():
-        task_id = row.get('task_id', 'unknown')
-        query = row.get('query', '')
-        file_name = row.get('file_name')
-        level = row.get('level', 'unknown')
-        answer = row.get('answer', '')
+    # 5 warm MAS run 5 tasks at a time to avoid rate limits, MCP servers start only once
+    async with MASPool(create_oxy_space, size=5) as pool:
+        tasks = []
         
-        task = asyncio.create_task(process_task(sem, task_id, query, file_name, level, answer))
-        tasks.append(task)
+        for _, row in df.iterrows():
+            task_id = row.get('task_id', 'unknown')
+            query = row.get('query', '')
+            file_name = row.get('file_name')
+            level = row.get('level', 'unknown')
+            answer = row.get('answer', '')
+            
+            task = asyncio.create_task(process_task(pool, task_id, query, file_name, level, answer))
+            tasks.append(task)
 
-    # Wait for all tasks to complete
-    results = await asyncio.gather(*tasks)
+        # Wait for all tasks to complete
+        results = await asyncio.gather(*tasks)
 
     # 3. 保存结果
     result_df = pd.DataFrame(results)
@@ -65,3 +65,71 @@ async def test_execute_and_think(llm, oxy_request):
     oxy_request.send_message.assert_any_await(
         {"type": "think", "content": "internal", "agent": "user"}
     )
+
+
+@pytest.mark.asyncio
+async def test_usage_is_recorded_and_rate_limited(oxy_request):
+    llm = DummyLLM(name="quota_llm", desc="UT LLM", rpm_limit=60, tpm_limit=100000)
+    resp = await llm.execute(oxy_request)
+    usage = resp.extra["usage"]
+    assert usage["is_estimated"] is True
+    assert usage["total_tokens"] == usage["prompt_tokens"] + usage["completion_tokens"]
+    assert oxy_request.shared_data["_llm_usage"]["requests"] == 1
+    assert llm._get_rate_limiter().total_requests >= 1
+
+
+@pytest.mark.asyncio
+async def test_each_retry_is_rate_limited(oxy_request):
+    class FlakyLLM(DummyLLM):
+        calls: int = 0
+
+        async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("transient")
+            return await super()._execute(oxy_request)
+
+    llm = FlakyLLM(name="flaky_quota_llm", desc="UT LLM", rpm_limit=60, delay=0)
+    resp = await llm.execute(oxy_request)
+    assert resp.state is OxyState.COMPLETED
+    assert llm._get_rate_limiter().total_requests == 2
+
+
+def test_parse_usage_formats():
+    usage = BaseLLM._parse_usage(
+        {"usage": {"prompt_tokens": 3, "completion_tokens": 2}}
+    )
+    assert usage["total_tokens"] == 5
+    assert BaseLLM._parse_usage({"prompt_eval_count": 4, "eval_count": 1}) == {
+        "prompt_tokens": 4,
+        "completion_tokens": 1,
+        "total_tokens": 5,
+    }
+    assert BaseLLM._parse_usage({"choices": []}) == {}
+
+
+@pytest.mark.asyncio
+async def test_merge_system_prompt_keeps_caller_messages(oxy_request):
+    llm = DummyLLM(name="no_system_llm", desc="UT LLM", is_disable_system_prompt=True)
+    messages = oxy_request.arguments["messages"]
+    merged = await llm._get_messages(oxy_request)
+    assert merged == [{"role": "user", "content": "You are tester.\nUser Input: Hello"}]
+    assert messages[1] == {"role": "user", "content": "Hello"}
+
+
+def test_merge_tool_call_deltas():
+    tool_calls = []
+    for delta in [
+        {"index": 0, "id": "call_1", "function": {"name": "search", "arguments": ""}},
+        {"index": 1, "id": "call_2", "function": {"name": "time", "arguments": "{}"}},
+        {"index": 0, "function": {"arguments": '{"q": '}},
+        {"index": 0, "function": {"arguments": '"oxy"}'}},
+    ]:
+        BaseLLM._merge_tool_call_deltas(tool_calls, [delta])
+    assert [tc["id"] for tc in tool_calls] == ["call_1", "call_2"]
+    assert tool_calls[0]["function"] == {"name": "search", "arguments": '{"q": "oxy"}'}
+    # Ollama returns complete tool calls with dict arguments
+    tool_calls = BaseLLM._merge_tool_call_deltas(
+        [], [{"function": {"name": "time", "arguments": {"tz": "UTC"}}}]
+    )
+    assert tool_calls[0]["function"]["arguments"] == '{"tz": "UTC"}'
@@ -2,9 +2,11 @@
 Unit tests for BaseMCPClient
 """
 
+import asyncio
 import types
 from unittest.mock import AsyncMock
 
+import anyio
 import pytest
 
 from oxygent.oxy.mcp_tools.base_mcp_client import BaseMCPClient
@@ -50,6 +52,19 @@ class MockSession:
         )
 
 
+class ReconnectingClient(BaseMCPClient):
+    """Client whose init opens a fresh MockSession."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._init_count = 0
+
+    async def init(self, is_fetch_tools=True):
+        self._init_count += 1
+        await asyncio.sleep(0.01)
+        self._session = MockSession()
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # Fixtures
 # ──────────────────────────────────────────────────────────────────────────────
@@ -115,3 +130,41 @@ async def test_cleanup_resets_session(client):
     await client.cleanup()
     assert client._session is None
     assert client._stdio_context is None
+
+
+@pytest.mark.asyncio
+async def test_calls_share_the_session_concurrently(mas_env):
+    c = BaseMCPClient(name="remote_server", desc="UT", max_concurrent_calls=2)
+    c.set_mas(mas_env)
+    c._session = MockSession()
+    in_flight, peak = [], []
+
+    async def _call_tool(tool_name, arguments):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return types.SimpleNamespace(content=[MockContent("hello-world")])
+
+    c._session.call_tool.side_effect = _call_tool
+    await asyncio.gather(*[c._call_keep_alive("dummy_tool", {}) for _ in range(5)])
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_single_reconnect_refetches_tools(mas_env, oxy_request):
+    c = ReconnectingClient(name="remote_server", desc="UT")
+    c.set_mas(mas_env)
+    c._session = MockSession()
+    await c.list_tools()
+    c._session.call_tool.side_effect = anyio.ClosedResourceError()
+
+    oxy_request.callee = "dummy_tool"
+    responses = await asyncio.gather(*[c._execute(oxy_request) for _ in range(3)])
+
+    assert [r.output for r in responses] == ["hello-world"] * 3
+    assert c._init_count == 1
+    c._session.list_tools.assert_awaited_once()
+    # Refetched tools are refreshed, not registered twice
+    assert mas_env.add_oxy_calls == ["dummy_tool"]
+    assert c.included_tool_name_list == ["dummy_tool"]
@@ -0,0 +1,47 @@
+"""
+Unit tests for request budgets
+"""
+
+import time
+
+from oxygent.budget import Budget
+from oxygent.schemas import OxyRequest
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_no_budget():
+    assert Budget.from_request(OxyRequest(arguments={})) is None
+
+
+def test_limits_are_shared_by_the_call_tree():
+    oxy_request = OxyRequest(
+        arguments={},
+        shared_data={"budget": {"max_tokens": 100, "max_tool_calls": 2}},
+    )
+    budget = Budget.from_request(oxy_request)
+    assert budget.get_exceeded_reason() is None
+    assert budget.get_remaining_seconds() is None
+    assert budget.get_remaining_tool_calls() == 2
+
+    # Usage of a sub-agent, recorded on a cloned request
+    child_request = oxy_request.clone_with(callee="sub_agent")
+    child_request.shared_data["_llm_usage"] = {"total_tokens": 100}
+    assert "token budget" in budget.get_exceeded_reason()
+
+    child_request.shared_data["_llm_usage"]["total_tokens"] = 0
+    Budget.from_request(child_request).add_tool_calls(2)
+    assert budget.tool_calls == 2
+    assert budget.get_remaining_tool_calls() == 0
+    assert "tool call budget" in budget.get_exceeded_reason()
+
+
+def test_time_limit():
+    oxy_request = OxyRequest(
+        arguments={},
+        shared_data={"budget": {"max_seconds": 1, "start_time": time.time() - 2}},
+    )
+    budget = Budget.from_request(oxy_request)
+    assert budget.get_remaining_seconds() < 0
+    assert "time budget" in budget.get_exceeded_reason()
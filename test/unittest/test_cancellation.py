@@ -0,0 +1,153 @@
+"""
+Unit tests for CancelScope and trace cancellation
+"""
+
+import asyncio
+
+import pytest
+
+from oxygent import MAS
+from oxygent.cancellation import CancelScope
+from oxygent.oxy.base_tool import BaseTool
+from oxygent.oxy.function_tools.function_tool import FunctionTool
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────────────────────
+async def _sleeper(events, name, seconds=5):
+    try:
+        await asyncio.sleep(seconds)
+    except asyncio.CancelledError:
+        events.append(name)
+        raise
+    return name
+
+
+async def _failer():
+    await asyncio.sleep(0.01)
+    raise RuntimeError("boom")
+
+
+class FanOutTool(BaseTool):
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        oxy_responses = await oxy_request.gather(
+            oxy_request.call(callee="echo_tool", arguments={"name": "a"}),
+            oxy_request.call(callee="echo_tool", arguments={"name": "b"}),
+        )
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=[r.output for r in oxy_responses]
+        )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_gather_aborts_siblings_on_failure():
+    events = []
+    scope = CancelScope("trace123")
+    with pytest.raises(RuntimeError):
+        await scope.gather(_sleeper(events, "a"), _sleeper(events, "b"), _failer())
+    assert sorted(events) == ["a", "b"]
+    assert not scope.tasks
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_spawned_tasks():
+    events = []
+    scope = CancelScope("trace123")
+    task = scope.spawn(_sleeper(events, "child"))
+    await asyncio.sleep(0)
+    assert scope.cancel("client disconnected") == 1
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert events == ["child"]
+    assert scope.cancel_reason == "client disconnected"
+
+    # Tasks joining a cancelled scope are cancelled at once
+    late = scope.spawn(_sleeper(events, "late"))
+    with pytest.raises(asyncio.CancelledError):
+        await late
+
+
+@pytest.mark.asyncio
+async def test_cancel_trace_stops_parallel_tool_calls():
+    events = []
+    mas = MAS(name="ut_mas")
+
+    async def slow_tool(name: str) -> str:
+        return await _sleeper(events, name)
+
+    mas.oxy_name_to_oxy["slow_tool"] = FunctionTool(
+        name="slow_tool",
+        func_process=slow_tool,
+        is_permission_required=False,
+        is_send_tool_call=False,
+        is_send_observation=False,
+    )
+    mas.oxy_name_to_oxy["slow_tool"].set_mas(mas)
+    oxy_request = OxyRequest(
+        arguments={},
+        caller="user",
+        callee="slow_tool",
+        current_trace_id="trace123",
+        mas=mas,
+    )
+
+    gather_task = asyncio.create_task(
+        oxy_request.gather(
+            oxy_request.call(callee="slow_tool", arguments={"name": "x"}),
+            oxy_request.call(callee="slow_tool", arguments={"name": "y"}),
+        )
+    )
+    await asyncio.sleep(0.05)
+    assert mas.cancel_trace("trace123", reason="break_task") is True
+    with pytest.raises(asyncio.CancelledError):
+        await gather_task
+    assert sorted(events) == ["x", "y"]
+    assert mas.cancel_trace("unknown") is False
+
+
+@pytest.mark.asyncio
+async def test_as_completed_order_and_deadline():
+    events = []
+    scope = CancelScope("trace123")
+
+    async def _sleep_then_return(seconds, name):
+        await asyncio.sleep(seconds)
+        return name
+
+    results = []
+    async for index, result in scope.as_completed(
+        _sleep_then_return(0.02, "slow"),
+        _sleep_then_return(0.01, "fast"),
+        _sleeper(events, "straggler"),
+        timeout=0.1,
+    ):
+        results.append((index, result))
+    assert results == [(1, "fast"), (0, "slow")]
+    assert events == ["straggler"]
+    assert not scope.tasks
+
+
+@pytest.mark.asyncio
+async def test_scope_released_when_root_request_ends():
+    mas = MAS(name="ut_mas")
+
+    async def echo(name: str) -> str:
+        return name
+
+    for oxy in [
+        FanOutTool(name="fan_out"),
+        FunctionTool(name="echo_tool", func_process=echo, is_permission_required=False),
+    ]:
+        oxy.is_send_tool_call = oxy.is_send_observation = oxy.is_send_answer = False
+        oxy.set_mas(mas)
+        mas.oxy_name_to_oxy[oxy.name] = oxy
+
+    assert await mas.call("fan_out", {}) == ["a", "b"]
+    oxy_request = OxyRequest(arguments={}, current_trace_id="trace123", mas=mas)
+    await mas.oxy_name_to_oxy["fan_out"].execute(oxy_request)
+    assert mas.cancel_scopes == {}
@@ -0,0 +1,98 @@
+"""
+Unit tests for the kernel pool of the code interpreter tools
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("jupyter_client")
+
+from oxygent.preset_tools.code_interpreter_tools import CodeInterpreter  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_new_session_takes_prewarmed_kernel():
+    interpreter = CodeInterpreter(min_idle_kernels=1, max_kernels=4)
+    try:
+        await interpreter.warm_up()
+        spare = interpreter._spares[0]
+
+        result = await interpreter.execute_code("warm", "print('ready')")
+        assert result == "ready"
+        assert interpreter.sessions["warm"] is spare
+        # A replacement spare is started in the background
+        await asyncio.gather(*interpreter._background_tasks)
+        assert len(interpreter._spares) == 1
+    finally:
+        await interpreter.close()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_session_is_reclaimed():
+    interpreter = CodeInterpreter(min_idle_kernels=0, max_kernels=2)
+    try:
+        await interpreter.execute_code("a", "x = 1")
+        await interpreter.execute_code("b", "x = 2")
+        await interpreter.execute_code("a", "x += 1")
+
+        assert await interpreter.execute_code("c", "print(3)") == "3"
+        assert list(interpreter.sessions) == ["a", "c"]
+        assert await interpreter.execute_code("a", "print(x)") == "2"
+    finally:
+        await interpreter.close()
+
+
+@pytest.mark.asyncio
+async def test_busy_kernels_are_not_reclaimed():
+    interpreter = CodeInterpreter(min_idle_kernels=0, max_kernels=1)
+    try:
+        running = asyncio.create_task(
+            interpreter.execute_code("a", "import time; time.sleep(1)")
+        )
+        await asyncio.sleep(0.3)
+        with pytest.raises(RuntimeError, match="busy"):
+            await interpreter.execute_code("b", "print(1)")
+        await running
+    finally:
+        await interpreter.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_stopped():
+    interpreter = CodeInterpreter(min_idle_kernels=0, max_idle_seconds=0.2)
+    try:
+        await interpreter.execute_code("idle", "x = 1")
+        await asyncio.sleep(0.6)
+        assert "idle" not in interpreter.sessions
+    finally:
+        await interpreter.close()
+
+
+@pytest.mark.asyncio
+async def test_claimed_kernels_are_not_reclaimed():
+    interpreter = CodeInterpreter(min_idle_kernels=0, max_kernels=1)
+    try:
+        # A caller waiting for the session lock holds a claim, not the lock
+        session = await interpreter._claim_kernel("a")
+        assert not session.lock.locked()
+        with pytest.raises(RuntimeError, match="busy"):
+            await interpreter.execute_code("b", "print(1)")
+        session.users -= 1
+        assert await interpreter.execute_code("b", "print(1)") == "1"
+    finally:
+        await interpreter.close()
+
+
+@pytest.mark.asyncio
+async def test_claimed_sessions_are_not_stopped():
+    interpreter = CodeInterpreter(min_idle_kernels=0, max_idle_seconds=0.2)
+    try:
+        session = await interpreter._claim_kernel("waiting")
+        await asyncio.sleep(0.6)
+        assert "waiting" in interpreter.sessions
+        session.users -= 1
+        await asyncio.sleep(0.6)
+        assert "waiting" not in interpreter.sessions
+    finally:
+        await interpreter.close()
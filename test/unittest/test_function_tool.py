@@ -56,6 +56,14 @@ def test_input_schema(add_tool):
     assert schema["properties"]["b"]["description"] == "second"
 
 
+def test_llm_tool_schema(add_tool):
+    tool_schema = add_tool.get_llm_tool_schema()
+    assert tool_schema["function"]["name"] == "add_tool"
+    parameters = tool_schema["function"]["parameters"]
+    assert parameters["properties"]["a"] == {"description": "first", "type": "integer"}
+    assert parameters["required"] == ["a", "b"]
+
+
 @pytest.mark.asyncio
 async def test_execute_success(add_tool, oxy_request):
     resp = await add_tool._execute(oxy_request)
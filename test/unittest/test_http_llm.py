@@ -2,6 +2,8 @@
 Unit tests for HttpLLM
 """
 
+from contextlib import asynccontextmanager
+
 import pytest
 
 from oxygent.oxy.llms.http_llm import HttpLLM
@@ -131,3 +133,46 @@ async def test_execute_http_error(monkeypatch, llm, oxy_request):
 
     with pytest.raises(FakeErrResponse):
         await llm._execute(oxy_request)
+
+
+@pytest.mark.asyncio
+async def test_stream_usage_corrects_rate_limiter(monkeypatch, llm, oxy_request):
+    captured = {}
+    lines = [
+        'data: {"choices": [{"delta": {"content": "Hi"}}]}',
+        'data: {"choices": [], "usage": {"prompt_tokens": 40, "completion_tokens": 2}}',
+        "data: [DONE]",
+    ]
+
+    class FakeStreamResponse:
+        status_code = 200
+
+        async def aiter_lines(self):
+            for line in lines:
+                yield line
+
+    class FakeClient:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        @asynccontextmanager
+        async def stream(self, method, url, headers=None, json=None):
+            captured["payload"] = json
+            yield FakeStreamResponse()
+
+    monkeypatch.setattr(
+        "oxygent.oxy.llms.http_llm.httpx.AsyncClient", lambda *a, **k: FakeClient()
+    )
+    llm.tpm_limit = 100000
+    llm.rate_limit_key = "ut-stream-usage"
+
+    resp = await llm.execute(oxy_request)
+
+    assert resp.output == "Hi"
+    assert captured["payload"]["stream_options"] == {"include_usage": True}
+    assert resp.extra["usage"]["total_tokens"] == 42
+    # The pre-dispatch estimate is replaced by the reported usage
+    assert llm._get_rate_limiter().total_tokens == 42
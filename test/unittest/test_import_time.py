@@ -0,0 +1,92 @@
+"""
+Unit tests for the import time of oxygent
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Optional dependencies that must only load when a backend or tool is used
+HEAVY_MODULES = [
+    "elasticsearch",
+    "aioredis",
+    "pandas",
+    "numpy",
+    "PIL",
+    "openai",
+    "fastapi",
+    "oxygent.databases.db_vector.vearch_db",
+    "oxygent.preset_tools.document_tools",
+    "oxygent.preset_tools.image_gen_tools",
+    "oxygent.preset_tools.shell_tools",
+]
+
+MAX_IMPORT_SECONDS = 10.0
+
+
+def run_python(code: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_import_skips_unused_backends():
+    result = run_python(
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        "import oxygent\n"
+        "from oxygent import preset_tools\n"
+        "seconds = time.perf_counter() - start\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'seconds': seconds, 'loaded': loaded}))"
+    )
+    assert result["loaded"] == []
+    assert result["seconds"] < MAX_IMPORT_SECONDS
+
+
+def test_preset_tools_load_on_access():
+    result = run_python(
+        "import json, sys\n"
+        "from oxygent import preset_tools\n"
+        "from oxygent.preset_tools.math_tools import calc_pi\n"
+        "print(json.dumps({\n"
+        "    'math_tools': type(preset_tools.math_tools).__name__,\n"
+        "    'time_tools': type(preset_tools.time_tools).__name__,\n"
+        "    'file_tools': 'oxygent.preset_tools.file_tools' in sys.modules,\n"
+        "}))"
+    )
+    assert result == {
+        "math_tools": "FunctionHub",
+        "time_tools": "FunctionHub",
+        "file_tools": False,
+    }
+
+
+def test_db_backends_load_on_access():
+    result = run_python(
+        "import json, sys\n"
+        "from oxygent.databases import db_es\n"
+        "before = 'elasticsearch' in sys.modules\n"
+        "name = db_es.JesEs.__name__\n"
+        "print(json.dumps([before, name, 'elasticsearch' in sys.modules]))"
+    )
+    assert result == [False, "JesEs", True]
+
+
+def test_unknown_attribute():
+    from oxygent import preset_tools
+    from oxygent.databases import db_es
+
+    with pytest.raises(AttributeError):
+        preset_tools.missing_tools
+    with pytest.raises(AttributeError):
+        db_es.MissingEs
@@ -0,0 +1,31 @@
+"""
+Unit tests for JSONStreamParser
+"""
+
+from oxygent.utils.json_stream_parser import JSONStreamParser
+
+
+def _feed_chars(parser, text):
+    objects = []
+    for char in text:
+        objects.extend(parser.feed(char))
+    return objects
+
+
+def test_objects_are_returned_once_complete():
+    parser = JSONStreamParser()
+    assert parser.feed('Sure. {"tool_name": "search", "arguments": {"q": "}') == []
+    assert parser.feed('{\\\\"}}') == [
+        {"tool_name": "search", "arguments": {"q": "}{\\"}}
+    ]
+
+
+def test_arrays_think_and_invalid_objects():
+    text = (
+        '<think>{"tool_name": "draft"}</think>'
+        '{not json} [{"tool_name": "a"}, {"tool_name": "b", "arguments": {}}]'
+    )
+    assert _feed_chars(JSONStreamParser(), text) == [
+        {"tool_name": "a"},
+        {"tool_name": "b", "arguments": {}},
+    ]
@@ -0,0 +1,141 @@
+"""
+Unit tests for limiters.py (AdaptiveLimiter and retry backoff)
+"""
+
+import httpx
+import pytest
+
+from oxygent.limiters import (
+    AdaptiveLimiter,
+    RateLimiter,
+    get_backoff_delay,
+    get_rate_limiter,
+    get_retry_after,
+    is_overload_error,
+)
+from oxygent.oxy.base_oxy import Oxy
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────────────────────────────────────
+def _http_error(status_code, headers=None):
+    request = httpx.Request("POST", "https://api.fake.com/v1/chat/completions")
+    response = httpx.Response(status_code, headers=headers or {}, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class FlakyOxy(Oxy):
+    calls: int = 0
+
+    async def _execute(self, oxy_request: OxyRequest) -> OxyResponse:
+        self.calls += 1
+        if self.calls == 1:
+            raise _http_error(429, {"Retry-After": "0"})
+        return OxyResponse(state=OxyState.COMPLETED, output="ok")
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_retry_after_is_honored():
+    assert get_retry_after(_http_error(429, {"Retry-After": "7"})) == 7.0
+    assert get_retry_after(_http_error(429, {"retry-after-ms": "1500"})) == 1.5
+    assert get_retry_after(_http_error(500)) is None
+    assert (
+        get_backoff_delay(3, 1.0, 30.0, exc=_http_error(429, {"Retry-After": "2"}))
+        == 2.0
+    )
+    # A server asking for an hour does not stall the caller for an hour
+    assert (
+        get_backoff_delay(1, 1.0, 30.0, exc=_http_error(429, {"Retry-After": "3600"}))
+        == 30.0
+    )
+
+
+def test_backoff_is_bounded_with_jitter():
+    for attempt in range(1, 10):
+        delay = get_backoff_delay(attempt, 1.0, 8.0)
+        assert 0 <= delay <= min(8.0, 2 ** (attempt - 1))
+
+
+def test_overload_detection():
+    assert is_overload_error(_http_error(429))
+    assert is_overload_error(_http_error(503))
+    assert is_overload_error(httpx.ReadTimeout("slow"))
+    assert not is_overload_error(_http_error(400))
+    assert not is_overload_error(ValueError("bad"))
+
+
+def test_aimd_limit_moves_with_latency_and_errors():
+    limiter = AdaptiveLimiter(8, min_limit=2, max_limit=16)
+    for _ in range(50):
+        limiter.on_success(0.1)
+    assert limiter.current > 8
+
+    grown = limiter.limit
+    limiter.on_error(_http_error(429))
+    assert limiter.limit == pytest.approx(max(grown * 0.5, 2))
+
+    for _ in range(100):
+        limiter.on_error(_http_error(503))
+    assert limiter.current >= 2
+
+
+@pytest.mark.asyncio
+async def test_oxy_retries_with_adaptive_limit():
+    oxy = FlakyOxy(name="flaky", semaphore=4, is_adaptive_semaphore=True)
+    response = await oxy.execute(OxyRequest(arguments={}, caller="test"))
+    assert response.state is OxyState.COMPLETED
+    assert oxy.calls == 2
+    assert oxy.get_concurrency_limit() <= 4
+
+
+class FakeSharedRedis:
+    def __init__(self):
+        self.counters = {}
+
+    async def incrby(self, key, amount=1, ex=None):
+        self.counters[key] = self.counters.get(key, 0) + amount
+        return self.counters[key]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_queues_instead_of_failing(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        limiter._request_bucket.tokens = limiter._request_bucket.capacity
+
+    monkeypatch.setattr("oxygent.limiters.asyncio.sleep", fake_sleep)
+    limiter = RateLimiter("ut-local", rpm=2)
+    for _ in range(3):
+        await limiter.acquire(10)
+    assert limiter.total_requests == 3
+    assert len(sleeps) == 1 and sleeps[0] > 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_shares_budget_through_redis():
+    redis_client = FakeSharedRedis()
+    first = RateLimiter("ut-shared", rpm=5, tpm=100, redis_client=redis_client)
+    second = RateLimiter("ut-shared", rpm=5, tpm=100, redis_client=redis_client)
+    await first.acquire(40)
+    await second.acquire(40)
+    assert await first._try_acquire_shared(40) > 0  # 120 tokens > tpm
+    await second.adjust(-30)  # usage was lower than estimated
+    assert await first._try_acquire_shared(40) == 0
+    assert get_rate_limiter("ut-key", rpm=1) is get_rate_limiter("ut-key", rpm=1)
+
+
+def test_cached_rate_limiter_rebinds_redis_client():
+    local = get_rate_limiter("ut-rebind", rpm=1)
+    assert local.redis_client is None
+
+    redis_client = FakeSharedRedis()
+    shared = get_rate_limiter("ut-rebind", rpm=1, redis_client=redis_client)
+    assert shared is local and shared.redis_client is redis_client
+    assert get_rate_limiter("ut-rebind", rpm=1, prefix="app").prefix == "app"
+    assert get_rate_limiter("ut-rebind", rpm=1).redis_client is None
@@ -141,3 +141,47 @@ async def test_full_execute_cycle(dummy_local_agent, oxy_request):
     resp = await dummy_local_agent.execute(copy.deepcopy(oxy_request))
     assert resp.state == OxyState.COMPLETED
     assert resp.output == "hello"
+
+
+@pytest.mark.asyncio
+async def test_team_members_share_one_agent(dummy_local_agent, mas_env, monkeypatch):
+    from oxygent.oxy.agents.parallel_agent import ParallelAgent
+
+    dummy_local_agent.team_size = 3
+    await dummy_local_agent.init()
+
+    team = mas_env.oxy_name_to_oxy["agent_tester"]
+    assert isinstance(team, ParallelAgent)
+    assert mas_env.oxy_name_to_oxy["agent_tester_member"] is dummy_local_agent
+    assert set(mas_env.oxy_name_to_oxy) == {
+        "dummy_tool",
+        "mock_llm",
+        "agent_tester",
+        "agent_tester_member",
+    }
+    assert dummy_local_agent.get_concurrency_limit() == 16 * 3
+
+    member_ids, session_names = [], []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "agent_tester_member":
+            member_ids.append(arguments["team_member_id"])
+            session_names.append(
+                OxyRequest(
+                    caller="agent_tester", callee=callee, arguments=arguments
+                ).session_name
+            )
+        return OxyResponse(state=OxyState.COMPLETED, output="ok", oxy_request=self)
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    mas_env.message_prefix = "msg"
+    mas_env.name = "test_mas"
+    mas_env.send_message = AsyncMock()
+    req = OxyRequest(arguments={"query": "hello"}, current_trace_id="trace123")
+    req.mas = mas_env
+    await team.execute(req)
+    assert sorted(member_ids) == [1, 2, 3]
+    # Each member keeps a history of its own
+    assert sorted(session_names) == [
+        f"agent_tester__agent_tester_member__{i}" for i in [1, 2, 3]
+    ]
@@ -0,0 +1,158 @@
+"""
+Unit tests for MASSnapshot and MAS snapshot restore
+"""
+
+import json
+import os
+import types
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent import oxy
+from oxygent.config import Config
+from oxygent.mas import MAS
+from oxygent.mas_snapshot import MASSnapshot, get_oxy_space_key
+from oxygent.oxy.mcp_tools.base_mcp_client import BaseMCPClient
+from oxygent.oxy.mcp_tools.mcp_tool import MCPTool
+
+INIT_CALLS = []
+TOOL_NAMES = ["lookup"]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dummy MCP client
+# ──────────────────────────────────────────────────────────────────────────────
+class DiscoveringClient(BaseMCPClient):
+    """Client that records whether init discovered its tools."""
+
+    async def init(self, is_fetch_tools=True):
+        if is_fetch_tools and self.register_cached_tools():
+            return
+        INIT_CALLS.append(is_fetch_tools)
+        self._session = types.SimpleNamespace(
+            list_tools=AsyncMock(
+                return_value=[
+                    (
+                        "tools",
+                        [
+                            types.SimpleNamespace(
+                                name=name,
+                                description="Look a word up",
+                                inputSchema={"type": "object"},
+                            )
+                            for name in TOOL_NAMES
+                        ],
+                    )
+                ]
+            )
+        )
+        if is_fetch_tools:
+            await self.list_tools()
+
+
+async def upper(text: str) -> str:
+    """Upper-case the text."""
+    return text.upper()
+
+
+def create_oxy_space(desc="Upper-case the text"):
+    return [
+        DiscoveringClient(name="dictionary"),
+        oxy.FunctionTool(
+            name="upper", desc=desc, func_process=upper, is_permission_required=False
+        ),
+        oxy.ReActAgent(
+            name="master_agent",
+            llm_name="default_llm",
+            tools=["dictionary", "upper"],
+            is_master=True,
+        ),
+        oxy.HttpLLM(
+            name="default_llm", api_key="k", base_url="http://llm", model_name="m"
+        ),
+    ]
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    save_dir = Config.get_cache_save_dir()
+    Config.set_cache_save_dir(str(tmp_path))
+    INIT_CALLS.clear()
+    TOOL_NAMES[:] = ["lookup"]
+    yield tmp_path
+    Config.set_cache_save_dir(save_dir)
+
+
+async def start_mas(oxy_space):
+    mas = MAS(name="snapshot_app", oxy_space=oxy_space, is_snapshot=True)
+    await mas.init()
+    return mas
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_key_is_stable_and_tracks_definitions():
+    key = get_oxy_space_key(create_oxy_space())
+    assert get_oxy_space_key(create_oxy_space()) == key
+    assert get_oxy_space_key(create_oxy_space(desc="Shout")) != key
+
+
+def test_load_rejects_missing_stale_and_corrupt(tmp_path):
+    path = str(tmp_path / "snapshot.json")
+    assert MASSnapshot.load(path, "k1") is None
+
+    MASSnapshot("k1", remote_orgs={"remote": {"name": "a"}}).save(path)
+    assert MASSnapshot.load(path, "k1").remote_orgs == {"remote": {"name": "a"}}
+    assert MASSnapshot.load(path, "k2") is None
+
+    with open(path, "w") as f:
+        f.write("{")
+    assert MASSnapshot.load(path, "k1") is None
+
+
+@pytest.mark.asyncio
+async def test_restart_restores_without_discovery():
+    mas = await start_mas(create_oxy_space())
+    await mas.__aexit__(None, None, None)
+    assert INIT_CALLS == [True]
+    with open(mas.get_snapshot_path()) as f:
+        assert json.load(f)["mcp_tools"]["dictionary"][0]["name"] == "lookup"
+
+    INIT_CALLS.clear()
+    TOOL_NAMES.append("define")  # The server gained a tool meanwhile
+    mas = await start_mas(create_oxy_space())
+    try:
+        assert isinstance(mas.oxy_name_to_oxy["lookup"], MCPTool)
+        # The organization is rebuilt, not restored
+        tool_names = [tool["name"] for tool in mas.agent_organization["children"]]
+        assert {"upper", "lookup"} <= set(tool_names)
+        # The server still connects, in the background
+        await mas.oxy_name_to_oxy["dictionary"].wait_connected()
+        assert INIT_CALLS == [False]
+    finally:
+        await mas.__aexit__(None, None, None)
+    # The snapshot is refreshed with the tools listed in the background
+    with open(mas.get_snapshot_path()) as f:
+        tools = json.load(f)["mcp_tools"]["dictionary"]
+    assert [tool["name"] for tool in tools] == ["lookup", "define"]
+
+
+@pytest.mark.asyncio
+async def test_changed_oxy_space_rebuilds():
+    mas = await start_mas(create_oxy_space())
+    await mas.__aexit__(None, None, None)
+
+    mas = await start_mas(create_oxy_space(desc="Shout"))
+    await mas.__aexit__(None, None, None)
+    assert INIT_CALLS == [True, True]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_disabled_by_default():
+    async with MAS(name="snapshot_app", oxy_space=create_oxy_space()) as mas:
+        assert not os.path.exists(mas.get_snapshot_path())
@@ -4,7 +4,13 @@ Unit tests for Message & Memory classes
 
 import pytest
 
-from oxygent.schemas.memory import Function, Memory, Message, ToolCall
+from oxygent.schemas.memory import (
+    ConversationBuilder,
+    Function,
+    Memory,
+    Message,
+    ToolCall,
+)
 
 
 # ───────────────────────────────────────────────────────────────────────────────
@@ -84,3 +90,25 @@ def test_memory_get_recent_n():
     mem.add_messages([Message.user_message(str(i)) for i in range(4)])
     latest_two = mem.get_recent_messages(2)
     assert [m.content for m in latest_two] == ["2", "3"]
+
+
+# ───────────────────────────────────────────────────────────────────────────────
+# ConversationBuilder tests
+# ───────────────────────────────────────────────────────────────────────────────
+def test_conversation_builder_matches_memory():
+    prefix = [Message.system_message("sys"), Message.user_message("query")]
+    conversation = ConversationBuilder.from_messages(prefix, max_messages=6)
+    mem = Memory(max_messages=6)
+    mem.add_messages(prefix)
+    for i in range(6):
+        round_messages = [
+            Message.assistant_message(f"a{i}"),
+            Message.user_message(f"o{i}"),
+        ]
+        conversation.add_messages(round_messages)
+        mem.add_messages(round_messages)
+        assert conversation.to_dict_list() == mem.to_dict_list()
+
+    # The rendered prefix is reused, not rebuilt
+    first, second = conversation.to_dict_list(), conversation.to_dict_list()
+    assert first[0] is second[0] is conversation.prefix[0]
@@ -2,6 +2,7 @@
 Unit tests for ParallelAgent
 """
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -164,3 +165,58 @@ async def test_execute_parallel_flow(parallel_agent, oxy_request):
     resp = await parallel_agent.execute(oxy_request)
     assert resp.state is OxyState.COMPLETED
     assert "result_a" in resp.output and "result_b" in resp.output
+
+
+@pytest.mark.asyncio
+async def test_incremental_summary(parallel_agent, mas_env, monkeypatch):
+    llm_inputs = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "mock_llm":
+            content = arguments["messages"][-1]["content"]
+            llm_inputs.append(content)
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output=f"summary#{len(llm_inputs)}",
+                oxy_request=self,
+            )
+        await asyncio.sleep(0.01 if callee == "tool_a" else 0.1)
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=f"result_{callee}", oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    await parallel_agent.init()
+    parallel_agent.is_incremental_summary = True
+    req = OxyRequest(arguments={"query": "question"}, current_trace_id="trace123")
+    req.mas = mas_env
+    resp = await parallel_agent.execute(req)
+
+    # The fast result was summarized while the slow one was still running
+    assert resp.output == "summary#2"
+    assert "result_tool_a" in llm_inputs[0] and "result_tool_b" not in llm_inputs[0]
+    assert "summary#1" in llm_inputs[1] and "result_tool_a" not in llm_inputs[1]
+
+
+@pytest.mark.asyncio
+async def test_deadline_without_results_fails(parallel_agent, mas_env, monkeypatch):
+    callees = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        callees.append(callee)
+        await asyncio.sleep(1)
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=f"result_{callee}", oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    await parallel_agent.init()
+    parallel_agent.deadline = 0.05
+    req = OxyRequest(arguments={"query": "question"}, current_trace_id="trace123")
+    req.mas = mas_env
+    resp = await parallel_agent.execute(req)
+
+    assert resp.state is OxyState.FAILED
+    assert "0.05 seconds" in resp.output
+    # Nothing is left to summarize, so the LLM is not called
+    assert "mock_llm" not in callees
@@ -2,6 +2,7 @@
 Unit tests for ParallelFlow
 """
 
+import asyncio
 from unittest.mock import AsyncMock
 
 import pytest
@@ -83,3 +84,61 @@ async def test_execute_no_tools(monkeypatch, mas_env, oxy_request):
     call_spy.assert_not_awaited()
     assert resp.state is OxyState.COMPLETED
     assert resp.output.endswith(":")
+
+
+@pytest.mark.asyncio
+async def test_quorum_and_deadline_cancel_stragglers(monkeypatch, flow, oxy_request):
+    cancelled = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        try:
+            await asyncio.sleep(0.01 if callee != "tool_slow" else 5)
+        except asyncio.CancelledError:
+            cancelled.append(callee)
+            raise
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=f"{callee}-ok", oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    flow.add_permitted_tools(["tool_slow"])
+
+    flow.quorum = 2
+    resp = await flow.execute(oxy_request)
+    assert "tool_a-ok" in resp.output and "tool_b-ok" in resp.output
+    assert "tool_slow-ok" not in resp.output
+    assert cancelled == ["tool_slow"]
+
+    flow.quorum = None
+    flow.deadline = 0.1
+    resp = await flow.execute(oxy_request)
+    assert "tool_a-ok" in resp.output and "tool_slow-ok" not in resp.output
+    assert cancelled == ["tool_slow", "tool_slow"]
+
+
+@pytest.mark.asyncio
+async def test_deadline_without_results_fails(monkeypatch, flow, oxy_request):
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        await asyncio.sleep(5)
+        return OxyResponse(
+            state=OxyState.COMPLETED, output=f"{callee}-ok", oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    flow.deadline = 0.05
+    resp = await flow.execute(oxy_request)
+    assert resp.state is OxyState.FAILED
+    assert "0.05 seconds" in resp.output
+
+
+@pytest.mark.asyncio
+async def test_non_string_outputs_are_joined(monkeypatch, flow, oxy_request):
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        return OxyResponse(
+            state=OxyState.FAILED, output={"error": callee}, oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    resp = await flow.execute(oxy_request)
+    assert resp.state is OxyState.COMPLETED
+    assert "{'error': 'tool_a'}" in resp.output
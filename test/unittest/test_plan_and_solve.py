@@ -2,6 +2,7 @@
 Unit tests for PlanAndSolve Flow
 """
 
+import asyncio
 import json
 from unittest.mock import AsyncMock
 
@@ -156,3 +157,116 @@ async def test_execute_with_planner(flow_full, oxy_request):
     resp = await flow_full.execute(oxy_request)
     assert resp.state is OxyState.COMPLETED
     assert "step2" in resp.output
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# DAG mode
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def dag_events(monkeypatch):
+    events = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "planner_agent":
+            steps = [
+                {"id": 1, "task": "stepA", "depends_on": []},
+                {"id": 2, "task": "stepB", "depends_on": []},
+                {"id": 3, "task": "stepC", "depends_on": [1, 2]},
+            ]
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output=json.dumps({"steps": steps}),
+                oxy_request=self,
+            )
+        task = arguments["query"].split("The current step to execute is:")[1][:5]
+        events.append(f"start:{task}")
+        await asyncio.sleep(0.01)
+        events.append(f"end:{task}")
+        return OxyResponse(
+            state=OxyState.COMPLETED,
+            output=f"result of {task} given [{arguments['query'].split('execute is:')[0]}]",
+            oxy_request=self,
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    return events
+
+
+def _make_dag_request(mas_env):
+    req = OxyRequest(
+        arguments={"query": "What is the plan?"},
+        caller="user",
+        caller_category="user",
+        current_trace_id="trace123",
+    )
+    req.mas = mas_env
+    return req
+
+
+@pytest.mark.asyncio
+async def test_dag_runs_independent_steps_concurrently(mas_env, dag_events):
+    flow = PlanAndSolve(
+        name="ps_flow",
+        desc="UT DAG",
+        is_dag_plan=True,
+        executor_agent_name="executor_agent",
+        planner_agent_name="planner_agent",
+        llm_model="mock_llm",
+    )
+    flow.set_mas(mas_env)
+    resp = await flow.execute(_make_dag_request(mas_env))
+
+    assert resp.state is OxyState.COMPLETED
+    assert dag_events[:2] == ["start:stepA", "start:stepB"]
+    assert dag_events[-2:] == ["start:stepC", "end:stepC"]
+    # The last step only sees the results of its own dependencies
+    assert resp.output.startswith("result of stepC")
+    assert "result of stepA" in resp.output and "result of stepB" in resp.output
+
+
+@pytest.mark.asyncio
+async def test_dag_concurrency_limit_and_string_steps(mas_env, dag_events):
+    flow = PlanAndSolve(
+        name="ps_flow",
+        desc="UT DAG",
+        is_dag_plan=True,
+        max_concurrent_steps=1,
+        pre_plan_steps=[
+            {"id": 1, "task": "stepA"},
+            {"id": 2, "task": "stepB"},
+        ],
+        executor_agent_name="executor_agent",
+        llm_model="mock_llm",
+    )
+    flow.set_mas(mas_env)
+    resp = await flow.execute(_make_dag_request(mas_env))
+
+    assert dag_events == ["start:stepA", "end:stepA", "start:stepB", "end:stepB"]
+    # Two final steps, both results are returned
+    assert "task:stepA" in resp.output and "task:stepB" in resp.output
+
+
+def test_dag_steps_normalization():
+    chained = PlanAndSolve._to_dag_steps(["a", "b", "c"])
+    assert [step.depends_on for step in chained] == [[], [1], [2]]
+
+    cyclic = PlanAndSolve._to_dag_steps(
+        [
+            {"id": 1, "task": "a", "depends_on": [2]},
+            {"id": 2, "task": "b", "depends_on": [1, 9]},
+        ]
+    )
+    assert [step.depends_on for step in cyclic] == [[], [1]]
+
+    duplicated = PlanAndSolve._to_dag_steps(
+        [
+            {"id": 1, "task": "a"},
+            {"id": 1, "task": "b"},
+            {"id": 2, "task": "c", "depends_on": [1]},
+        ]
+    )
+    assert [(step.id, step.depends_on) for step in duplicated] == [
+        (1, []),
+        (2, [1]),
+        (3, [2]),
+    ]
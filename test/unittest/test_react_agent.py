@@ -2,6 +2,7 @@
 Unit tests for ReActAgent
 """
 
+import asyncio
 import json
 from unittest.mock import AsyncMock
 
@@ -11,10 +12,12 @@ from oxygent.oxy.agents.react_agent import LLMState, ReActAgent
 from oxygent.oxy.base_tool import BaseTool
 from oxygent.oxy.function_tools.function_tool import FunctionTool
 from oxygent.schemas import (
+    LLMResponse,
     OxyRequest,
     OxyResponse,
     OxyState,
 )
+from oxygent.tool_cache import ToolCachePolicy
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -150,3 +153,310 @@ async def test_execute_trust_mode(react_agent, oxy_request):
 async def test_permitted_tool_list(react_agent):
     await react_agent.init()
     assert "dummy_tool" in react_agent.permitted_tool_name_list
+
+
+async def run_stream_tool_call(react_agent, monkeypatch):
+    events = []
+
+    async def _fake_call(
+        self, *, callee: str, arguments: dict, func_stream_listener=None, **kwargs
+    ):
+        if callee == "mock_llm":
+            llm_output = (
+                '<think>{"tool_name": "dummy_tool", "arguments": {}}</think>'
+                + json.dumps({"tool_name": "dummy_tool", "arguments": {"q": "x"}})
+            )
+            for i in range(0, len(llm_output), 7):
+                func_stream_listener(llm_output[i : i + 7])
+            await asyncio.sleep(0.05)  # the model keeps generating
+            events.append("llm_end")
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=llm_output, oxy_request=self
+            )
+        events.append(f"{callee}_start:{json.dumps(arguments)}")
+        return OxyResponse(
+            state=OxyState.COMPLETED, output="tool-exec-ok", oxy_request=self
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    react_agent.is_stream_tool_call = True
+    result = await react_agent.execute(
+        OxyRequest(arguments={"query": "hello"}, current_trace_id="trace123")
+    )
+    assert result.state is OxyState.COMPLETED
+    assert "tool-exec-ok" in result.output
+    return events
+
+
+@pytest.mark.asyncio
+async def test_stream_tool_call_starts_before_llm_finishes(
+    react_agent, mas_env, monkeypatch
+):
+    mas_env.oxy_name_to_oxy["dummy_tool"].cache_policy = ToolCachePolicy()
+    events = await run_stream_tool_call(react_agent, monkeypatch)
+    # Started once, while the LLM was still generating, thinking skipped
+    assert events == ['dummy_tool_start:{"q": "x"}', "llm_end"]
+
+
+@pytest.mark.asyncio
+async def test_stream_tool_call_waits_for_uncached_tools(react_agent, monkeypatch):
+    events = await run_stream_tool_call(react_agent, monkeypatch)
+    # Without a cache policy the tool may have side effects, it is not started early
+    assert events == ["llm_end", 'dummy_tool_start:{"q": "x"}']
+
+
+@pytest.mark.asyncio
+async def test_native_tool_calls_run_in_parallel(react_agent, monkeypatch):
+    llm_calls = []
+    tool_calls = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "mock_llm":
+            llm_calls.append(arguments)
+            if len(llm_calls) == 1:
+                return OxyResponse(
+                    state=OxyState.COMPLETED,
+                    output="",
+                    extra={
+                        "tool_calls": [
+                            {
+                                "id": f"call_{i}",
+                                "type": "function",
+                                "function": {
+                                    "name": "dummy_tool",
+                                    "arguments": json.dumps({"i": i}),
+                                },
+                            }
+                            for i in range(2)
+                        ]
+                    },
+                    oxy_request=self,
+                )
+            return OxyResponse(
+                state=OxyState.COMPLETED, output="final answer", oxy_request=self
+            )
+        tool_calls.append(arguments)
+        return OxyResponse(
+            state=OxyState.COMPLETED,
+            output=f"result {arguments['i']}",
+            oxy_request=self,
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    react_agent.is_native_tool_call = True
+    react_agent.trust_mode = False
+    react_agent.permitted_tool_name_list = ["dummy_tool"]
+    monkeypatch.setattr(
+        "oxygent.schemas.OxyRequest.get_oxy",
+        lambda self, name: DummyFunctionTool(),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "oxygent.schemas.OxyRequest.has_oxy", lambda self, name: True, raising=True
+    )
+    result = await react_agent.execute(
+        OxyRequest(arguments={"query": "hello"}, current_trace_id="trace123")
+    )
+
+    assert result.output == "final answer"
+    assert tool_calls == [{"i": 0}, {"i": 1}]
+    assert llm_calls[0]["tools"][0]["function"]["name"] == "dummy_tool"
+    messages = llm_calls[1]["messages"]
+    assert [tc["id"] for tc in messages[-3]["tool_calls"]] == ["call_0", "call_1"]
+    assert [m["role"] for m in messages[-2:]] == ["tool", "tool"]
+    assert messages[-1]["tool_call_id"] == "call_1"
+
+
+def test_rank_sub_agents_by_keywords():
+    ranked = ReActAgent._rank_sub_agents_by_keywords(
+        "What is the weather in Paris tomorrow?",
+        {
+            "math_agent": "An agent that solves math problems.",
+            "weather_agent": "An agent that looks up the weather forecast.",
+            "search_agent": "An agent that searches the web.",
+        },
+    )
+    assert ranked == ["weather_agent"]
+
+
+def run_speculation(react_agent, monkeypatch, master_query):
+    events = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "router_llm":
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output='["weather_agent", "math_agent"]',
+                oxy_request=self,
+            )
+        if callee == "mock_llm":
+            if "Paris" in str(arguments["messages"][-1]["content"]):
+                await asyncio.sleep(0.05)  # the master is still reasoning
+                events.append("llm_end")
+                llm_output = json.dumps(
+                    {
+                        "tool_name": "weather_agent",
+                        "arguments": {"query": master_query},
+                    }
+                )
+            else:
+                llm_output = "final answer"
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=llm_output, oxy_request=self
+            )
+        events.append(f"{callee}_start:{arguments['query']}")
+        try:
+            await asyncio.sleep(0.01 if callee == "weather_agent" else 5)
+        except asyncio.CancelledError:
+            events.append(f"{callee}_cancelled")
+            raise
+        return OxyResponse(state=OxyState.COMPLETED, output="sunny", oxy_request=self)
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    monkeypatch.setattr(
+        "oxygent.schemas.OxyRequest.get_oxy",
+        lambda self, name: DummyFunctionTool(name=name),
+        raising=True,
+    )
+    monkeypatch.setattr(
+        "oxygent.schemas.OxyRequest.has_oxy", lambda self, name: True, raising=True
+    )
+    react_agent.trust_mode = False
+    react_agent.sub_agents = ["math_agent", "weather_agent"]
+    react_agent.speculative_top_k = 2
+    react_agent.speculative_router_llm = "router_llm"
+    react_agent.speculative_agent_names = ["math_agent", "weather_agent"]
+
+    async def _run():
+        result = await react_agent.execute(
+            OxyRequest(
+                arguments={"query": "Weather in Paris?"}, current_trace_id="trace123"
+            )
+        )
+        await asyncio.sleep(0)
+        assert result.output == "final answer"
+        return events
+
+    return _run
+
+
+@pytest.mark.asyncio
+async def test_speculative_sub_agent_adopted_and_rest_cancelled(
+    react_agent, monkeypatch
+):
+    events = await run_speculation(react_agent, monkeypatch, "Weather in Paris?")()
+
+    # Both started before the master decided, the picked one ran only once
+    assert events == [
+        "weather_agent_start:Weather in Paris?",
+        "math_agent_start:Weather in Paris?",
+        "llm_end",
+        "math_agent_cancelled",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_speculative_sub_agent_with_other_arguments_rerun(
+    react_agent, monkeypatch
+):
+    events = await run_speculation(react_agent, monkeypatch, "Paris")()
+
+    # The speculative call ran with the user query, the master's call is made
+    assert events[:3] == [
+        "weather_agent_start:Weather in Paris?",
+        "math_agent_start:Weather in Paris?",
+        "llm_end",
+    ]
+    assert sorted(events[3:]) == ["math_agent_cancelled", "weather_agent_start:Paris"]
+
+
+@pytest.mark.asyncio
+async def test_speculation_limited_to_allowed_agents(react_agent, monkeypatch):
+    run = run_speculation(react_agent, monkeypatch, "Weather in Paris?")
+    react_agent.speculative_agent_names = ["weather_agent"]
+    events = await run()
+
+    assert events == ["weather_agent_start:Weather in Paris?", "llm_end"]
+
+
+@pytest.mark.asyncio
+async def test_budget_stops_loop_early(react_agent, monkeypatch):
+    llm_calls = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "mock_llm":
+            llm_calls.append(arguments["messages"])
+            output = json.dumps({"tool_name": "dummy_tool", "arguments": {}})
+            if "Tool execution results" in arguments["messages"][-1]["content"]:
+                output = "summary answer"
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=output, oxy_request=self
+            )
+        return OxyResponse(state=OxyState.COMPLETED, output="tool-ok", oxy_request=self)
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    react_agent.trust_mode = False
+
+    # The tool call budget is spent by the first round
+    result = await react_agent.execute(
+        OxyRequest(
+            arguments={"query": "hello"},
+            shared_data={"budget": {"max_tool_calls": 1}},
+            current_trace_id="trace123",
+        )
+    )
+    assert result.output == "summary answer"
+    assert "tool call budget" in result.extra["budget_stop_reason"]
+    assert len(llm_calls) == 2
+
+    # Rounds are known to take longer than the time left
+    llm_calls.clear()
+    react_agent._round_seconds = 10
+    result = await react_agent.execute(
+        OxyRequest(
+            arguments={"query": "hello"},
+            shared_data={"budget": {"max_seconds": 5}},
+            current_trace_id="trace123",
+        )
+    )
+    assert "cannot fit another round" in result.extra["budget_stop_reason"]
+    assert len(llm_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_call_batch_truncated_to_budget(react_agent, monkeypatch):
+    tool_calls = []
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "mock_llm":
+            output = "parallel calls"
+            if "Tool execution results" in arguments["messages"][-1]["content"]:
+                output = "summary answer"
+            return OxyResponse(
+                state=OxyState.COMPLETED, output=output, oxy_request=self
+            )
+        tool_calls.append(arguments["i"])
+        return OxyResponse(state=OxyState.COMPLETED, output="tool-ok", oxy_request=self)
+
+    def _parse_parallel_calls(ori_response, oxy_request=None):
+        return LLMResponse(
+            state=LLMState.TOOL_CALL,
+            output=[
+                {"tool_name": "dummy_tool", "arguments": {"i": i}} for i in range(3)
+            ],
+            ori_response=ori_response,
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    react_agent.trust_mode = False
+    react_agent.func_parse_llm_response = _parse_parallel_calls
+    oxy_request = OxyRequest(
+        arguments={"query": "hello"},
+        shared_data={"budget": {"max_tool_calls": 2}},
+        current_trace_id="trace123",
+    )
+    result = await react_agent.execute(oxy_request)
+
+    assert result.output == "summary answer"
+    assert tool_calls == [0, 1]
+    assert oxy_request.shared_data["budget"]["tool_calls"] == 2
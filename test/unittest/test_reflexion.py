@@ -0,0 +1,133 @@
+"""
+Unit tests for Reflexion Flow
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent.oxy.flows.reflexion import Reflexion
+from oxygent.schemas import OxyRequest, OxyResponse, OxyState
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dummy MAS
+# ──────────────────────────────────────────────────────────────────────────────
+class DummyMAS:
+    def __init__(self):
+        self.oxy_name_to_oxy = {}
+        self.background_tasks = set()
+        self.message_prefix = "msg"
+        self.name = "test_mas"
+        self.send_message = AsyncMock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def mas_env():
+    return DummyMAS()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Worker answers "slow good", "bad", "fast good" with the given delays."""
+    events = {"worker": 0, "evaluated": [], "cancelled": 0}
+    answers = [(0.2, "slow good"), (0.01, "bad"), (0.05, "fast good")]
+
+    async def _fake_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "worker_agent":
+            delay, answer = answers[events["worker"] % len(answers)]
+            events["worker"] += 1
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                events["cancelled"] += 1
+                raise
+            return OxyResponse(state=OxyState.COMPLETED, output=answer)
+        if callee == "reflexion_agent":
+            answer = arguments["query"].split("Answer: ")[1].split("\n")[0]
+            events["evaluated"].append(answer)
+            return OxyResponse(
+                state=OxyState.COMPLETED,
+                output=json.dumps(
+                    {
+                        "is_satisfactory": "good" in answer,
+                        "evaluation_reason": "reason",
+                        "improvement_suggestions": "be good",
+                    }
+                ),
+            )
+        return OxyResponse(state=OxyState.COMPLETED, output="llm-fallback")
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _fake_call, raising=True)
+    return events
+
+
+def _make_request(mas_env):
+    req = OxyRequest(
+        arguments={"query": "question"},
+        caller="user",
+        caller_category="user",
+        current_trace_id="trace123",
+    )
+    req.mas = mas_env
+    return req
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_parallel_candidates_exit_early(mas_env, events):
+    flow = Reflexion(name="reflexion", desc="UT reflexion", num_candidates=3)
+    flow.set_mas(mas_env)
+    resp = await flow.execute(_make_request(mas_env))
+
+    assert resp.state is OxyState.COMPLETED
+    assert resp.output.endswith("fast good")
+    assert resp.extra["reflexion_rounds"] == 1
+    # The slow candidate was cancelled as soon as one passed
+    assert events["evaluated"] == ["bad", "fast good"]
+    assert events["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_verdicts_are_cached(mas_env, events):
+    flow = Reflexion(name="reflexion", desc="UT reflexion", max_reflexion_rounds=1)
+    flow.set_mas(mas_env)
+
+    resp = await flow.execute(_make_request(mas_env))
+    assert resp.output.endswith("slow good")
+    events["worker"] = 0
+    await flow.execute(_make_request(mas_env))
+    assert events["evaluated"] == ["slow good"]
+
+
+@pytest.mark.asyncio
+async def test_failed_verdicts_are_not_cached(mas_env, events, monkeypatch):
+    evaluated = []
+
+    async def _failing_call(self, *, callee: str, arguments: dict, **kwargs):
+        if callee == "worker_agent":
+            return OxyResponse(state=OxyState.COMPLETED, output="answer")
+        evaluated.append(arguments["query"])
+        # e.g. a verdict cut off by a timeout of the reflexion agent
+        return OxyResponse(
+            state=OxyState.FAILED,
+            output=json.dumps(
+                {"is_satisfactory": True, "evaluation_reason": "cut off"}
+            ),
+        )
+
+    monkeypatch.setattr("oxygent.schemas.OxyRequest.call", _failing_call, raising=True)
+    flow = Reflexion(name="reflexion", desc="UT reflexion", max_reflexion_rounds=0)
+    flow.set_mas(mas_env)
+
+    await flow.execute(_make_request(mas_env))
+    await flow.execute(_make_request(mas_env))
+    assert len(evaluated) == 2
+    assert not flow._evaluation_cache
@@ -0,0 +1,166 @@
+"""
+Unit tests for RouterLLM
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from oxygent.oxy.llms.mock_llm import MockLLM
+from oxygent.oxy.llms.router_llm import RouterLLM
+from oxygent.schemas import OxyRequest, OxyState
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dummy MAS
+# ──────────────────────────────────────────────────────────────────────────────
+class DummyMAS:
+    def __init__(self):
+        self.oxy_name_to_oxy = {}
+        self.background_tasks = set()
+        self.message_prefix = "msg"
+        self.name = "test_mas"
+        self.es_client = None
+        self.send_message = AsyncMock()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def events():
+    return {"slow_cancelled": False}
+
+
+@pytest.fixture
+def mas_env(events):
+    async def slow_process(oxy_request):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            events["slow_cancelled"] = True
+            raise
+        return "slow answer"
+
+    async def fast_process(oxy_request):
+        await asyncio.sleep(0.01)
+        return "fast answer"
+
+    async def broken_process(oxy_request):
+        raise ConnectionError("connection refused")
+
+    mas = DummyMAS()
+    for name, func in [
+        ("slow_llm", slow_process),
+        ("fast_llm", fast_process),
+        ("broken_llm", broken_process),
+    ]:
+        mas.oxy_name_to_oxy[name] = MockLLM(
+            name=name, func_mock_process=func, retries=1, is_send_think=False
+        )
+    return mas
+
+
+def _make_router(mas_env, llm_names):
+    router = RouterLLM(
+        name="router_llm",
+        llm_names=llm_names,
+        default_hedge_delay=0.05,
+        is_send_think=False,
+    )
+    router.set_mas(mas_env)
+    mas_env.oxy_name_to_oxy[router.name] = router
+    return router
+
+
+def _make_request(mas_env):
+    return OxyRequest(
+        arguments={"messages": [{"role": "user", "content": "hi"}]},
+        caller="agent",
+        caller_category="agent",
+        current_trace_id="trace123",
+        mas=mas_env,
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_hedged_request_wins_and_loser_is_cancelled(mas_env, events):
+    router = _make_router(mas_env, ["slow_llm", "fast_llm"])
+    resp = await router.execute(_make_request(mas_env))
+
+    assert resp.state is OxyState.COMPLETED
+    assert resp.output == "fast answer"
+    assert resp.extra["endpoint"] == "fast_llm"
+    assert events["slow_cancelled"] is True
+    assert router.get_stats()["fast_llm"]["samples"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failover_on_connection_error(mas_env):
+    router = _make_router(mas_env, ["broken_llm", "fast_llm"])
+    router.max_consecutive_failures = 1
+    resp = await router.execute(_make_request(mas_env))
+
+    assert resp.state is OxyState.COMPLETED
+    assert resp.output == "fast answer"
+    assert router.get_stats()["broken_llm"]["is_healthy"] is False
+    assert router._rank_endpoints()[0] == "fast_llm"
+
+
+@pytest.mark.asyncio
+async def test_all_endpoints_failing(mas_env):
+    router = _make_router(mas_env, ["broken_llm"])
+    resp = await router.execute(_make_request(mas_env))
+
+    assert resp.state is OxyState.FAILED
+
+
+def _make_streaming_llm(name, first_delay, deltas, events):
+    async def stream_process(oxy_request):
+        try:
+            await asyncio.sleep(first_delay)
+            for delta in deltas:
+                oxy_request.on_stream_delta(delta)
+                await oxy_request.send_message(
+                    {"type": "stream", "content": {"delta": delta}}
+                )
+                await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            events[f"{name}_cancelled"] = True
+            raise
+        return "".join(deltas)
+
+    return MockLLM(
+        name=name, func_mock_process=stream_process, retries=1, is_send_think=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_the_first_endpoint_to_stream_streams(mas_env, events):
+    for llm in [
+        _make_streaming_llm("late_llm", 0.2, ["l1", "l2"], events),
+        _make_streaming_llm("quick_llm", 0.01, ["q1", "q2", "q3"], events),
+    ]:
+        mas_env.oxy_name_to_oxy[llm.name] = llm
+    router = _make_router(mas_env, ["late_llm", "quick_llm"])
+    deltas = []
+    oxy_request = _make_request(mas_env)
+    oxy_request.func_stream_listener = deltas.append
+
+    resp = await router.execute(oxy_request)
+
+    assert resp.output == "q1q2q3"
+    assert resp.extra["endpoint"] == "quick_llm"
+    assert events["late_llm_cancelled"] is True
+    # The caller listener and the client only get the stream of the winner
+    assert deltas == ["q1", "q2", "q3"]
+    sent = [
+        call.args[0].data["content"]["delta"]
+        for call in mas_env.send_message.call_args_list
+        if call.args[0].data.get("type") == "stream"
+    ]
+    assert sent == ["q1", "q2", "q3"]
@@ -0,0 +1,269 @@
+"""
+Unit tests for MASPool and MAS.reset_session
+"""
+
+import asyncio
+import csv
+import json
+import os
+
+import pytest
+
+from oxygent.config import Config
+from oxygent.mas import MAS
+from oxygent.oxy.function_tools.function_tool import FunctionTool
+from oxygent.oxy.llms.http_llm import HttpLLM
+from oxygent.runners import MASPool, _split_rate_limits, run_sharded_batch
+from oxygent.utils.dataset_utils import get_percentiles
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Oxy space of the worker processes (module level so it can be pickled)
+# ──────────────────────────────────────────────────────────────────────────────
+async def pid_echo(query: str) -> str:
+    if query == "fail":
+        raise ValueError("bad query")
+    return f"{os.getpid()}:{query}"
+
+
+def create_pid_echo_space():
+    return [
+        FunctionTool(
+            name="pid_echo",
+            desc="Echo the query with the worker pid",
+            func_process=pid_echo,
+            is_permission_required=False,
+        )
+    ]
+
+
+def create_crashing_space():
+    if Config.get_cache_save_dir().endswith("shard_1"):
+        raise RuntimeError("worker crashed")
+    return create_pid_echo_space()
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def events():
+    return {"running": 0, "peak": 0, "spaces": 0}
+
+
+@pytest.fixture
+def create_oxy_space(events):
+    async def slow_echo(query: str) -> str:
+        events["running"] += 1
+        events["peak"] = max(events["peak"], events["running"])
+        await asyncio.sleep(0.02)
+        events["running"] -= 1
+        return f"echo {query}"
+
+    def _create_oxy_space():
+        events["spaces"] += 1
+        return [
+            FunctionTool(
+                name="echo",
+                desc="Echo the query",
+                func_process=slow_echo,
+                is_permission_required=False,
+            )
+        ]
+
+    return _create_oxy_space
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_pool_reuses_warm_mas(create_oxy_space, events):
+    async with MASPool(create_oxy_space, size=2) as pool:
+        responses = await asyncio.gather(
+            *[
+                pool.chat_with_agent({"query": str(i), "callee": "echo"})
+                for i in range(5)
+            ]
+        )
+        assert [r.output for r in responses] == [f"echo {i}" for i in range(5)]
+        # Built once per MAS, each MAS serving one item at a time
+        assert events["spaces"] == 2
+        assert events["peak"] == 2
+        assert all(not mas.cancel_scopes for mas in pool.mas_list)
+    assert pool.mas_list == []
+
+
+@pytest.mark.asyncio
+async def test_reset_session_cancels_unfinished_traces():
+    mas = MAS(name="ut_mas")
+    task = asyncio.create_task(asyncio.sleep(10))
+    mas.active_tasks["trace"] = task
+    mas.stream_dict["node"] = ["partial"]
+    mas.llm_usage["default_llm"] = {"total_tokens": 10}
+
+    await mas.reset_session()
+    await asyncio.sleep(0)
+
+    assert task.cancelled()
+    assert mas.active_tasks == {} and mas.stream_dict == {}
+    assert mas.llm_usage["default_llm"]["total_tokens"] == 10
+    await mas.reset_session(is_reset_usage=True)
+    assert mas.llm_usage == {}
+
+
+@pytest.mark.asyncio
+async def test_run_dataset_resumes_and_times_out(create_oxy_space, events, tmp_path):
+    input_path = tmp_path / "data.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    items = [{"task_id": str(i), "query": f"q{i}"} for i in range(4)]
+    input_path.write_text("\n".join(json.dumps(item) for item in items))
+    # A previous run failed item 1, crashed mid-line and completed item 0
+    output_path.write_text(
+        json.dumps({"task_id": "1", "error": "boom"})
+        + "\n"
+        + '{"task_id": "2", "out'
+        + "\n"
+        + json.dumps({"task_id": "0", "output": "echo q0"})
+        + "\n"
+    )
+
+    async def slow(query: str) -> str:
+        await asyncio.sleep(10)
+
+    mas = await MAS.create(
+        oxy_space=create_oxy_space()
+        + [FunctionTool(name="slow", desc="", func_process=slow)]
+    )
+    try:
+        stats = await mas.run_dataset(
+            str(input_path),
+            str(output_path),
+            max_concurrency=2,
+            item_timeout=0.5,
+            func_build_payload=lambda item: {
+                "query": item["query"],
+                "callee": "slow" if item["task_id"] == "3" else "echo",
+            },
+        )
+    finally:
+        await mas.__aexit__(None, None, None)
+
+    assert (stats["completed"], stats["failed"], stats["skipped"]) == (2, 1, 1)
+    assert events["peak"] <= 2
+    assert set(stats["latency"]) == {"p50", "p90", "p99"}
+    lines = output_path.read_text().splitlines()
+    new_rows = {row["task_id"]: row for row in map(json.loads, lines[3:])}
+    assert new_rows["1"]["output"] == "echo q1"
+    assert new_rows["2"]["state"] == "COMPLETED"
+    assert "timed out" in new_rows["3"]["error"]
+
+
+@pytest.mark.asyncio
+async def test_run_dataset_csv(create_oxy_space, tmp_path):
+    input_path = tmp_path / "data.csv"
+    output_path = tmp_path / "results.csv"
+    input_path.write_text("task_id,query,answer\n1,q1,a1\n2,q2,a2\n")
+
+    def build_payload(item):
+        return {"query": item["query"], "callee": "echo"}
+
+    mas = await MAS.create(oxy_space=create_oxy_space())
+    try:
+        await mas.run_dataset(
+            str(input_path), str(output_path), func_build_payload=build_payload
+        )
+        stats = await mas.run_dataset(
+            str(input_path), str(output_path), func_build_payload=build_payload
+        )
+    finally:
+        await mas.__aexit__(None, None, None)
+
+    assert stats["skipped"] == 2
+    with open(output_path, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert sorted((r["task_id"], r["answer"], r["output"]) for r in rows) == [
+        ("1", "a1", "echo q1"),
+        ("2", "a2", "echo q2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_dataset_retries_failed_state(tmp_path):
+    input_path = tmp_path / "data.jsonl"
+    output_path = tmp_path / "results.jsonl"
+    items = [{"task_id": "1", "query": "ok"}, {"task_id": "2", "query": "fail"}]
+    input_path.write_text("\n".join(json.dumps(item) for item in items))
+
+    mas = await MAS.create(oxy_space=create_pid_echo_space())
+    try:
+        kwargs = {"func_build_payload": lambda item: dict(item, callee="pid_echo")}
+        stats = await mas.run_dataset(str(input_path), str(output_path), **kwargs)
+        assert (stats["completed"], stats["failed"]) == (1, 1)
+        stats = await mas.run_dataset(str(input_path), str(output_path), **kwargs)
+    finally:
+        await mas.__aexit__(None, None, None)
+
+    # The FAILED item is recorded with an error and retried by the rerun
+    assert (stats["completed"], stats["failed"], stats["skipped"]) == (0, 1, 1)
+    rows = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert [(r["task_id"], r["state"]) for r in rows if r.get("error")] == [
+        ("2", "FAILED"),
+        ("2", "FAILED"),
+    ]
+
+
+def test_get_percentiles():
+    assert get_percentiles([]) == {}
+    assert get_percentiles(list(range(1, 101))) == {"p50": 50, "p90": 90, "p99": 99}
+
+
+@pytest.mark.asyncio
+async def test_run_sharded_batch(tmp_path):
+    save_dir = Config.get_module_config("cache", "save_dir")
+    Config.set_cache_save_dir(str(tmp_path))
+    try:
+        queries = ["a", "b", "fail", "c"]
+        results, metrics = await run_sharded_batch(
+            create_pid_echo_space,
+            [{"query": q, "callee": "pid_echo"} for q in queries],
+            num_workers=2,
+        )
+    finally:
+        Config.set_cache_save_dir(save_dir)
+
+    states = [r["state"] for r in results]
+    assert states == ["COMPLETED", "COMPLETED", "FAILED", "COMPLETED"]
+    outputs = [r["output"].split(":") for r in results if r["state"] == "COMPLETED"]
+    assert [query for _, query in outputs] == ["a", "b", "c"]
+    # Round-robin: a and fail on one worker, b and c on the other
+    pids = {pid for pid, _ in outputs}
+    assert len(pids) == 2 and str(os.getpid()) not in pids
+    assert len(metrics["workers"]) == 2
+    assert {p.name for p in tmp_path.iterdir()} >= {"shard_0", "shard_1"}
+
+
+@pytest.mark.asyncio
+async def test_run_sharded_batch_survives_a_crashed_worker(tmp_path):
+    save_dir = Config.get_module_config("cache", "save_dir")
+    Config.set_cache_save_dir(str(tmp_path))
+    try:
+        results, metrics = await run_sharded_batch(
+            create_crashing_space,
+            [{"query": q, "callee": "pid_echo"} for q in ["a", "b", "c"]],
+            num_workers=2,
+        )
+    finally:
+        Config.set_cache_save_dir(save_dir)
+
+    assert [r["output"].split(":")[1] for r in results[::2]] == ["a", "c"]
+    assert "worker crashed" in results[1]["error"]
+    assert len(metrics["workers"]) == 1 and list(metrics["worker_errors"]) == [1]
+
+
+def test_split_rate_limits():
+    llm = HttpLLM(name="llm", rpm_limit=10, tpm_limit=1000)
+    unlimited = HttpLLM(name="unlimited")
+    _split_rate_limits([llm, unlimited], 3)
+    assert (llm.rpm_limit, llm.tpm_limit) == (3, 333)
+    assert (unlimited.rpm_limit, unlimited.tpm_limit) == (None, None)
@@ -2,6 +2,7 @@
 Unit tests for SSEMCPClient
 """
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -117,3 +118,15 @@ async def test_init_failure_cleanup(mas_env, sse_client_patch):
     with pytest.raises(Exception):
         await bad.init()
     assert bad._session is None
+
+
+@pytest.mark.asyncio
+async def test_init_timeout(client, session_patch):
+    async def _slow_initialize():
+        await asyncio.sleep(1)
+
+    session_patch.initialize.side_effect = _slow_initialize
+    client.init_timeout = 0.05
+    with pytest.raises(Exception, match="Server remote_server error"):
+        await client.init()
+    assert client._session is None
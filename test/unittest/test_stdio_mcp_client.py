@@ -2,11 +2,14 @@
 Unit tests for StdioMCPClient
 """
 
+import asyncio
 import types
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import anyio
 import pytest
 
+from oxygent.config import Config
 from oxygent.oxy.mcp_tools.stdio_mcp_client import StdioMCPClient
 from oxygent.schemas import OxyRequest, OxyResponse, OxyState
 
@@ -25,6 +28,14 @@ class DummyMAS:
 # ──────────────────────────────────────────────────────────────────────────────
 # Fixtures
 # ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path):
+    save_dir = Config.get_module_config("cache", "save_dir")
+    Config.set_cache_save_dir(str(tmp_path))
+    yield tmp_path
+    Config.set_cache_save_dir(save_dir)
+
+
 @pytest.fixture
 def mas_env():
     return DummyMAS()
@@ -84,6 +95,14 @@ def which_patch():
         yield
 
 
+@pytest.fixture
+def exists_patch():
+    with patch(
+        "oxygent.oxy.mcp_tools.stdio_mcp_client.os.path.exists", return_value=True
+    ):
+        yield
+
+
 @pytest.fixture
 def stdio_client(mas_env, stdio_patch, session_patch, which_patch):
     client = StdioMCPClient(
@@ -158,3 +177,118 @@ async def test_init_missing_file_raises(which_patch, mas_env):
     ):
         with pytest.raises(FileNotFoundError):
             await bad.init()
+
+
+@pytest.mark.asyncio
+async def test_pooled_sessions_are_reused(
+    stdio_client, stdio_patch, session_patch, exists_patch
+):
+    results = await asyncio.gather(
+        *[stdio_client.call_tool("stdio_tool", {}, headers={}) for _ in range(3)]
+    )
+    await stdio_client.call_tool("stdio_tool", {}, headers={})
+
+    assert [r.content[0].text for r in results] == ["pong"] * 3
+    assert stdio_patch.call_count == 1
+    assert session_patch.initialize.await_count == 1
+
+    await stdio_client.cleanup()
+    session_patch.__aexit__.assert_awaited_once()
+    assert stdio_client._session_pool is None
+
+
+@pytest.mark.asyncio
+async def test_headers_map_to_sub_pools(stdio_client, stdio_patch, exists_patch):
+    await stdio_client.call_tool("stdio_tool", {}, headers={"user": "a"})
+    await stdio_client.call_tool("stdio_tool", {}, headers={"user": "b"})
+    await stdio_client.call_tool("stdio_tool", {}, headers={"user": "a"})
+
+    assert stdio_patch.call_count == 2
+    assert len(stdio_client._session_pool.get_stats()) == 2
+    await stdio_client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_evicted(
+    stdio_client, stdio_patch, session_patch, exists_patch
+):
+    stdio_client.pool_max_idle_seconds = 0
+    await stdio_client.call_tool("stdio_tool", {})
+    await stdio_client.call_tool("stdio_tool", {})
+
+    assert stdio_patch.call_count == 2
+    await stdio_client.cleanup()
+    assert session_patch.__aexit__.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_reaped_without_calls(
+    stdio_client, stdio_patch, session_patch, exists_patch
+):
+    stdio_client.pool_max_idle_seconds = 0.01
+    await stdio_client.call_tool("stdio_tool", {})
+    await asyncio.sleep(0.1)
+
+    assert stdio_client._session_pool.get_stats() == {}
+    session_patch.__aexit__.assert_awaited_once()
+    await stdio_client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_broken_session_is_replaced(
+    stdio_client, stdio_patch, session_patch, exists_patch
+):
+    pong = session_patch.call_tool.return_value
+    session_patch.call_tool.side_effect = [anyio.ClosedResourceError(), pong]
+
+    result = await stdio_client.call_tool("stdio_tool", {})
+
+    assert result is pong
+    assert stdio_patch.call_count == 2
+    await stdio_client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_pool_disabled_spawns_per_call(stdio_client, stdio_patch, exists_patch):
+    stdio_client.pool_max_sessions = 0
+    await stdio_client.call_tool("stdio_tool", {})
+    await stdio_client.call_tool("stdio_tool", {})
+
+    assert stdio_patch.call_count == 2
+    assert stdio_client._session_pool is None
+
+
+@pytest.mark.asyncio
+async def test_cached_tools_register_before_connect(
+    stdio_client, session_patch, exists_patch
+):
+    await stdio_client.init()  # Caches the tool schemas
+    await stdio_client.cleanup()
+
+    mas = DummyMAS()
+    client = StdioMCPClient(
+        name="stdio_server", desc="UT Stdio MCP", params=stdio_client.params
+    )
+    client.set_mas(mas)
+    await client.init()
+
+    # Registered from the cache while the server is still starting
+    assert client.included_tool_name_list == ["stdio_tool"]
+    assert mas.add_oxy.call_args.args[0].name == "stdio_tool"
+    assert client._session is None
+
+    await client.wait_connected()
+    assert client._session is session_patch
+    assert mas.add_oxy.call_count == 1
+    await client.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_init_timeout(stdio_client, session_patch, exists_patch):
+    async def _slow_initialize():
+        await asyncio.sleep(1)
+
+    session_patch.initialize.side_effect = _slow_initialize
+    stdio_client.init_timeout = 0.05
+    with pytest.raises(Exception, match="Server stdio_server error"):
+        await stdio_client.init()
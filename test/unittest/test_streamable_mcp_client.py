@@ -0,0 +1,74 @@
+"""
+Unit tests for StreamableMCPClient
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from oxygent.oxy.mcp_tools.streamable_mcp_client import StreamableMCPClient
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def http_client_patch():
+    with patch(
+        "oxygent.oxy.mcp_tools.streamable_mcp_client.streamablehttp_client"
+    ) as mock_cli:
+
+        def _acm(*args, **kwargs):
+            class _Ctx:
+                async def __aenter__(self_inner):
+                    return ("read", "write", None)
+
+                async def __aexit__(self_inner, exc_type, exc, tb):
+                    return False
+
+            return _Ctx()
+
+        mock_cli.side_effect = _acm
+        yield mock_cli
+
+
+@pytest.fixture
+def session_patch():
+    with patch(
+        "oxygent.oxy.mcp_tools.streamable_mcp_client.ClientSession"
+    ) as mock_session_cls:
+        mock_session = AsyncMock()
+        mock_session.__aenter__.return_value = mock_session
+        mock_session_cls.return_value = mock_session
+        yield mock_session
+
+
+@pytest.fixture
+def client(http_client_patch, session_patch):
+    return StreamableMCPClient(
+        name="http_server",
+        desc="UT Streamable MCP",
+        server_url="https://foo.com/mcp",
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_init_success(client, session_patch):
+    await client.init(is_fetch_tools=False)
+    assert client._session is session_patch
+
+
+@pytest.mark.asyncio
+async def test_init_timeout(client, session_patch):
+    async def _slow_initialize():
+        await asyncio.sleep(1)
+
+    session_patch.initialize.side_effect = _slow_initialize
+    client.init_timeout = 0.05
+    with pytest.raises(Exception, match="Server http_server error"):
+        await client.init()
+    assert client._session is None
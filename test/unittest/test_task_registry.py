@@ -0,0 +1,151 @@
+"""
+Unit tests for TaskRegistry and MAS.request_cancel
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from oxygent.mas import MAS
+from oxygent.task_registry import TaskRegistry
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dummy shared Redis
+# ──────────────────────────────────────────────────────────────────────────────
+class DummyRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def lpush(self, key, *values, ex=None):
+        self.data.setdefault(key, []).extend(values)
+
+    async def rpop(self, key):
+        values = self.data.get(key)
+        return values.pop(0) if values else None
+
+
+class DummyLocalRedis:
+    async def lpush(self, key, *values):
+        pass
+
+    async def rpop(self, key):
+        return None
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture
+def redis_client():
+    return DummyRedis()
+
+
+@pytest.fixture
+def cancelled():
+    return []
+
+
+@pytest.fixture
+def workers(redis_client, cancelled):
+    def make_cancel(worker_id):
+        def func_cancel(trace_id, reason):
+            cancelled.append((worker_id, trace_id, reason))
+            return True
+
+        return func_cancel
+
+    @asynccontextmanager
+    async def _workers():
+        registries = [
+            TaskRegistry(redis_client, "app", worker_id=f"w{i}", poll_interval=0.01)
+            for i in range(2)
+        ]
+        for registry in registries:
+            registry.start(make_cancel(registry.worker_id))
+        try:
+            yield registries
+        finally:
+            for registry in registries:
+                await registry.stop()
+
+    return _workers
+
+
+async def wait_for(cancelled):
+    for _ in range(50):
+        if cancelled:
+            break
+        await asyncio.sleep(0.01)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+def test_is_supported(redis_client):
+    assert TaskRegistry.is_supported(redis_client)
+    assert not TaskRegistry.is_supported(DummyLocalRedis())
+
+
+@pytest.mark.asyncio
+async def test_register_and_unregister(workers):
+    async with workers() as (owner, other):
+        await owner.register("t1")
+        assert await other.get_owner("t1") == "w0"
+
+        await owner.unregister("t1")
+        assert await other.get_owner("t1") is None
+
+
+@pytest.mark.asyncio
+async def test_cancel_forwarded_to_owner(workers, cancelled):
+    async with workers() as (owner, other):
+        await owner.register("t1")
+
+        assert await other.request_cancel("t1", "stop") is True
+        await wait_for(cancelled)
+    assert cancelled == [("w0", "t1", "stop")]
+
+
+@pytest.mark.asyncio
+async def test_cancel_unknown_trace(workers, cancelled):
+    async with workers() as (_, other):
+        assert await other.request_cancel("missing") is False
+        await asyncio.sleep(0.05)
+    assert cancelled == []
+
+
+@pytest.mark.asyncio
+async def test_listener_skips_malformed_commands(workers, redis_client, cancelled):
+    async with workers() as (owner, other):
+        await redis_client.lpush("app:worker_cmd:w0", "not json")
+        await owner.register("t1")
+        await other.request_cancel("t1")
+        await wait_for(cancelled)
+    assert cancelled == [("w0", "t1", "cancelled")]
+
+
+@pytest.mark.asyncio
+async def test_mas_request_cancel(redis_client):
+    mas = MAS(name="app")
+    mas.task_registry = TaskRegistry(redis_client, "app", worker_id="w1")
+    await redis_client.set("app:task_owner:t1", "w0")
+
+    assert await mas.request_cancel("t1") is True
+    assert await redis_client.rpop("app:worker_cmd:w0") is not None
+    assert await mas.request_cancel("t2") is False
+
+
+def test_create_app_has_cancel_route():
+    app = MAS(name="app").create_app()
+    assert "/cancel" in {route.path for route in app.routes}
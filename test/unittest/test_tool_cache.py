@@ -0,0 +1,173 @@
+"""
+Unit tests for the tool result cache
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from oxygent.oxy.function_tools.function_hub import FunctionHub
+from oxygent.oxy.function_tools.function_tool import FunctionTool
+from oxygent.schemas import OxyRequest, OxyState
+from oxygent.tool_cache import ToolCachePolicy, ToolResultCache, get_tool_result_cache
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Dummy MAS / Redis
+# ──────────────────────────────────────────────────────────────────────────────
+class DummyRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+class DummyMAS:
+    def __init__(self):
+        self.oxy_name_to_oxy = {}
+        self.message_prefix = "msg"
+        self.redis_client = DummyRedis()
+
+    def add_oxy(self, oxy):
+        self.oxy_name_to_oxy[oxy.name] = oxy
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Fixtures
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.fixture(autouse=True)
+def clear_cache():
+    get_tool_result_cache().clear()
+    yield
+    get_tool_result_cache().clear()
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def _make_tool(calls, **kwargs):
+    async def lookup(file_path: str) -> str:
+        calls.append(file_path)
+        return f"content of {file_path}"
+
+    tool = FunctionTool(name="lookup", func_process=lookup, **kwargs)
+    return tool
+
+
+def _make_request(arguments):
+    return OxyRequest(
+        arguments=arguments,
+        caller="agent",
+        caller_category="agent",
+        current_trace_id="trace123",
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+# Tests
+# ──────────────────────────────────────────────────────────────────────────────
+@pytest.mark.asyncio
+async def test_hit_skips_execution(calls):
+    tool = _make_tool(calls, cache_policy=ToolCachePolicy(ttl=60))
+    first = await tool._run_execute(_make_request({"file_path": "a.txt"}))
+    second = await tool._run_execute(_make_request({"file_path": "a.txt"}))
+
+    assert first.output == second.output == "content of a.txt"
+    assert second.state is OxyState.COMPLETED
+    assert second.extra["is_cached"] is True
+    assert "is_cached" not in first.extra
+    assert calls == ["a.txt"]
+
+
+@pytest.mark.asyncio
+async def test_no_policy_disables_cache(calls):
+    tool = _make_tool(calls)
+    await tool._run_execute(_make_request({"file_path": "a.txt"}))
+    await tool._run_execute(_make_request({"file_path": "a.txt"}))
+    assert calls == ["a.txt", "a.txt"]
+
+
+@pytest.mark.asyncio
+async def test_file_mtime_invalidates(calls, tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("v1")
+    policy = ToolCachePolicy(path_arguments=["file_path"])
+    tool = _make_tool(calls, cache_policy=policy)
+    request = _make_request({"file_path": str(path)})
+
+    await tool._run_execute(request)
+    await tool._run_execute(request)
+    assert len(calls) == 1
+
+    mtime = os.path.getmtime(path) + 10
+    os.utime(path, (mtime, mtime))
+    await tool._run_execute(request)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_lru_eviction():
+    cache = ToolResultCache(max_size=2)
+    await cache.set("a", "A", {}, ttl=60)
+    await cache.set("b", "B", {}, ttl=60)
+    assert await cache.get("a") == ("A", {})
+    await cache.set("c", "C", {}, ttl=60)  # Evicts "b", the least recently used
+    assert await cache.get("b") is None
+    assert await cache.get("a") == ("A", {})
+
+    await cache.set("d", "D", {}, ttl=-1)
+    assert await cache.get("d") is None
+    assert cache.get_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_across_processes(calls):
+    mas = DummyMAS()
+    tool = _make_tool(calls, cache_policy=ToolCachePolicy(ttl=60, is_shared=True))
+    tool.set_mas(mas)
+    await tool._run_execute(_make_request({"file_path": "a.txt"}))
+
+    (redis_key,) = mas.redis_client.data
+    assert redis_key.startswith("msg:tool_cache:lookup:")
+    assert json.loads(mas.redis_client.data[redis_key])["expire_at"] > time.time()
+
+    # A fresh process only has the Redis tier
+    get_tool_result_cache().clear()
+    resp = await tool._run_execute(_make_request({"file_path": "a.txt"}))
+    assert resp.extra["is_cached"] is True
+    assert calls == ["a.txt"]
+
+
+@pytest.mark.asyncio
+async def test_function_hub_cache_policy(calls):
+    mas = DummyMAS()
+    hub = FunctionHub(name="hub")
+    hub.set_mas(mas)
+
+    @hub.tool("cached add", cache_policy=ToolCachePolicy(ttl=60))
+    def add(a: int, b: int):
+        calls.append((a, b))
+        return a + b
+
+    @hub.tool("uncached sub")
+    def sub(a: int, b: int):
+        return a - b
+
+    await hub.init()
+    assert mas.oxy_name_to_oxy["add"].cache_policy.ttl == 60
+    assert mas.oxy_name_to_oxy["sub"].cache_policy is None
+
+    for _ in range(2):
+        resp = await mas.oxy_name_to_oxy["add"]._run_execute(
+            _make_request({"a": 1, "b": 2})
+        )
+        assert resp.output == 3
+    assert calls == [(1, 2)]